@@ -0,0 +1,87 @@
+import subprocess
+import numpy as np
+import soundfile as sf
+
+SAMPLE_RATE = 16000  # Fréquence attendue par Whisper et utilisée par librosa
+
+
+def decode_audio(video_path, sr=SAMPLE_RATE):
+    """
+    Décode la piste audio d'une vidéo directement en mémoire avec FFmpeg
+
+    Le flux vidéo est ignoré au démultiplexage (-vn) : seule la piste audio est
+    décodée, convertie en mono et rééchantillonnée, sans fichier WAV temporaire.
+
+    Args:
+        video_path: Chemin vers la vidéo
+        sr: Fréquence d'échantillonnage de sortie
+
+    Returns:
+        np.ndarray float32 mono (vide si la vidéo n'a pas de piste audio)
+    """
+    cmd = [
+        "ffmpeg", "-nostdin", "-v", "error",
+        "-i", str(video_path),
+        "-vn", "-ac", "1", "-ar", str(sr),
+        "-f", "f32le", "-"
+    ]
+    result = subprocess.run(cmd, capture_output=True)
+
+    if result.returncode != 0:
+        message = result.stderr.decode(errors="ignore").strip()
+        if "does not contain any stream" in message:
+            return np.zeros(0, dtype=np.float32)
+        raise RuntimeError(f"FFmpeg n'a pas pu décoder l'audio : {message}")
+
+    return np.frombuffer(result.stdout, dtype=np.float32)
+
+
+def iter_audio_blocks(path, block_size, sr=SAMPLE_RATE):
+    """
+    Lit l'audio d'un fichier par blocs, sans jamais charger le fichier entier
+
+    Les fichiers lisibles par soundfile (WAV, FLAC...) déjà à la bonne fréquence
+    sont lus directement ; les autres (vidéos, autres fréquences) passent par
+    un pipe FFmpeg qui décode et rééchantillonne au fil de l'eau.
+
+    Args:
+        path: Chemin d'un fichier audio ou vidéo
+        block_size: Nombre d'échantillons par bloc
+        sr: Fréquence d'échantillonnage de sortie
+
+    Yields:
+        np.ndarray float32 mono d'au plus `block_size` échantillons
+    """
+    try:
+        info = sf.info(str(path))
+    except RuntimeError:
+        info = None
+
+    if info is not None and info.samplerate == sr:
+        for block in sf.blocks(str(path), blocksize=block_size, dtype="float32", always_2d=True):
+            yield block.mean(axis=1)
+        return
+
+    cmd = [
+        "ffmpeg", "-nostdin", "-v", "error",
+        "-i", str(path),
+        "-vn", "-ac", "1", "-ar", str(sr),
+        "-f", "f32le", "-"
+    ]
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        while True:
+            data = process.stdout.read(block_size * 4)
+            if not data:
+                break
+            yield np.frombuffer(data, dtype=np.float32)
+
+        if process.wait() != 0:
+            message = process.stderr.read().decode(errors="ignore").strip()
+            raise RuntimeError(f"FFmpeg n'a pas pu décoder l'audio : {message}")
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        process.stdout.close()
+        process.stderr.close()
@@ -1,25 +1,73 @@
-import whisper
 import librosa
 import numpy as np
 import soundfile as sf
 import json
-import re
+import threading
+from contextlib import contextmanager
 from pathlib import Path
+from audio.audio_decoding import SAMPLE_RATE, decode_audio, iter_audio_blocks
+from audio.audio_features import StreamingFeatureExtractor, frame_pitch, iter_blocks, summarize_features
+from audio.fillers import FillerMatcher, locate_occurrences, word_char_spans
+from audio.scratch import remove, scratch_file
+from audio.streaming_transcription import IncrementalSpeechStats, shift_segments, window_bounds
+from audio.transcription_engines import TranscriptionEngine, create_engine
+from audio.vad import SpeechTimeMap
+from audio.word_timing import timing_metrics
 import warnings
 warnings.filterwarnings('ignore')
 
 
 class AudioExtractor:
-    def __init__(self, model_size="base"):
+    def __init__(self, model_size="base", pitch_method="piptrack", stream_block_seconds=None,
+                 load_model=True, transcription_window_seconds=None, transcription_overlap_seconds=2.0,
+                 skip_silence=True, engine="whisper", engine_options=None, pause_source="words"):
         """
         Initialise l'extracteur audio
         
         Args:
             model_size: Taille du modèle Whisper (tiny, base, small, medium, large)
+            pitch_method: Estimateur de F0 ("piptrack" ou "yin", plus rapide)
+            stream_block_seconds: Si défini, les caractéristiques audio sont
+                calculées par blocs de cette durée (mémoire bornée)
+            load_model: Charger le modèle de transcription tout de suite ; sinon à la
+                première transcription (les analyses sans transcription n'en ont pas besoin)
+            transcription_window_seconds: Si défini, la transcription est faite par
+                fenêtres de cette durée et les segments arrivent au fil de l'eau
+            transcription_overlap_seconds: Chevauchement entre deux fenêtres
+            skip_silence: Ne transcrire que les zones de parole trouvées par
+                l'analyse audio (extract_all_metrics)
+            engine: Moteur de transcription, nom ("whisper", "faster-whisper",
+                "fixture", "none") ou instance de TranscriptionEngine
+            engine_options: Options du moteur nommé (voir create_engine)
+            pause_source: "words" pour mesurer les pauses entre les mots horodatés
+                de la transcription (l'analyse RMS sert si aucun mot n'est
+                horodaté), "rms" pour garder les pauses de l'enveloppe RMS
         """
-        print(f" Chargement du modèle Whisper '{model_size}'...")
-        self.whisper_model = whisper.load_model(model_size)
-        print(" Modèle chargé\n")
+        self.model_size = model_size
+        self.pitch_method = pitch_method
+        self.stream_block_seconds = stream_block_seconds
+        if pause_source not in ("words", "rms"):
+            raise ValueError(f"Source de pauses inconnue : {pause_source} (attendu : words, rms)")
+        self.pause_source = pause_source
+        if isinstance(engine, TranscriptionEngine):
+            self.engine = engine
+        else:
+            self.engine = create_engine(engine, model_size, **(engine_options or {}))
+
+        self.transcription_overlap_seconds = transcription_overlap_seconds
+        if self.engine.single_call:
+            # Moteur lié à l'enregistrement entier (fixture) : un appel, silences compris
+            transcription_window_seconds, skip_silence = None, False
+        self.transcription_window_seconds = transcription_window_seconds
+        self.skip_silence = skip_silence
+
+        # Le modèle peut être partagé entre plusieurs requêtes : Whisper installe
+        # des hooks de cache sur le décodeur pendant transcribe(), donc un seul
+        # appel à la fois
+        self._model_lock = threading.Lock()
+
+        if load_model:
+            self.engine.load()
         
         # Liste des fillers selon la langue
         self.fillers_fr = [
@@ -34,14 +82,26 @@ class AudioExtractor:
 
         # Par défaut français
         self.fillers = self.fillers_fr
+
+        # Une expression compilée par langue, construite une seule fois
+        self.filler_matchers = {
+            "fr": FillerMatcher(self.fillers_fr),
+            "en": FillerMatcher(self.fillers_en)
+        }
     
-    def extract_audio_from_video(self, video_path, output_audio="temp_audio.wav"):
+    def load_whisper(self):
+        """Charge le modèle de transcription une seule fois"""
+        return self.engine.load()
+
+    def extract_audio_from_video(self, video_path, output_audio=None):
         """
         Extrait l'audio d'une vidéo en utilisant pydub (simple et fiable)
 
         Args:
             video_path: Chemin vers la vidéo
-            output_audio: Nom du fichier audio de sortie
+            output_audio: Fichier audio de sortie ; par défaut un fichier au nom
+                unique dans le répertoire temporaire (audio.scratch), à supprimer
+                par l'appelant (voir temporary_audio)
 
         Returns:
             Chemin du fichier audio extrait
@@ -49,6 +109,9 @@ class AudioExtractor:
         from pydub import AudioSegment
 
         print(f" Extraction audio de {video_path}...")
+        temporary = output_audio is None
+        if temporary:
+            output_audio = scratch_file(suffix=".wav")
 
         try:
             # Charge la vidéo avec pydub (supporte MP4)
@@ -56,6 +119,8 @@ class AudioExtractor:
 
             if len(audio) == 0:
                 print("❌ Aucune piste audio trouvée dans la vidéo")
+                if temporary:
+                    remove(output_audio)
                 return None
 
             # Convertit en mono et définit le sample rate
@@ -70,25 +135,79 @@ class AudioExtractor:
 
         except Exception as e:
             print(f"Erreur lors de l'extraction audio avec pydub: {e}")
+            if temporary:
+                remove(output_audio)
             return None
+
+    @contextmanager
+    def temporary_audio(self, video_path):
+        """
+        Audio extrait dans un fichier temporaire unique, supprimé à la sortie
+        du bloc même en cas d'erreur
+
+        Yields:
+            Chemin du fichier WAV (None si l'extraction a échoué)
+        """
+        audio_path = self.extract_audio_from_video(video_path)
+        try:
+            yield audio_path
+        finally:
+            remove(audio_path)
     
-    def transcribe(self, audio_path):
+    def load_audio(self, audio):
+        """
+        Retourne le signal et sa fréquence sans relire un buffer déjà décodé
+
+        Args:
+            audio: Chemin d'un fichier audio ou signal float32 mono à 16 kHz
+
+        Returns:
+            (y, sr)
+        """
+        if isinstance(audio, np.ndarray):
+            return audio, SAMPLE_RATE
+        return librosa.load(audio, sr=SAMPLE_RATE)
+
+    def transcribe(self, audio_path, on_update=None, speech_regions=None):
         """
-        Transcrit l'audio avec Whisper
+        Transcrit l'audio avec le moteur de transcription (Whisper par défaut)
 
         Args:
-            audio_path: Chemin du fichier audio
+            audio_path: Chemin du fichier audio ou signal float32 mono à 16 kHz
+            on_update: Fonction appelée après chaque fenêtre avec le nombre de
+                mots, le débit et les fillers déjà transcrits (mode par fenêtres)
+            speech_regions: Zones {"debut", "fin"} à transcrire (les silences
+                entre elles sont ignorés, les horodatages restent ceux d'origine)
 
         Returns:
             dict avec transcription complète, segments temporels et langue détectée
         """
         print("Transcription en cours...")
 
-        result = self.whisper_model.transcribe(
-            audio_path,
-            language=None,  # Détection automatique de la langue
-            word_timestamps=True
-        )
+        if self.transcription_window_seconds:
+            segments, language = [], None
+            for window_segments, language, stats in self.transcribe_stream(audio_path,
+                                                                           speech_regions=speech_regions):
+                segments.extend(window_segments)
+                if on_update is not None:
+                    on_update(stats)
+            result = {
+                "text": "".join(segment["text"] for segment in segments),
+                "segments": segments,
+                "language": language
+            }
+        elif speech_regions is not None:
+            y, sr = self.load_audio(audio_path)
+            time_map = SpeechTimeMap(speech_regions, sr, len(y))
+            print(f" Parole : {time_map.speech_seconds:.1f}s transcrites sur {len(y) / sr:.1f}s")
+            result = {"text": "", "segments": [], "language": None}
+            if time_map.bounds:
+                with self._model_lock:
+                    result = self.engine.transcribe(time_map.compact(y))
+                result["segments"] = time_map.remap_segments(result["segments"])
+        else:
+            with self._model_lock:
+                result = self.engine.transcribe(audio_path)  # Détection automatique de la langue
 
         print(f"Transcription terminée ({len(result['text'].split())} mots)")
         print(f"Langue détectée : {result.get('language', 'unknown')}\n")
@@ -96,9 +215,71 @@ class AudioExtractor:
         return {
             "texte_complet": result["text"],
             "segments": result["segments"],
-            "language": result.get("language", "fr")  # Langue détectée par Whisper
+            "language": result.get("language") or "fr"  # Langue détectée par Whisper
         }
-    
+
+    def transcribe_stream(self, audio, window_seconds=None, overlap_seconds=None, speech_regions=None):
+        """
+        Transcrit l'audio fenêtre par fenêtre et produit les segments dès
+        qu'une fenêtre est décodée
+
+        La langue est détectée sur la première fenêtre puis imposée aux
+        suivantes ; la fin du texte déjà transcrit sert de contexte (prompt).
+        Le modèle n'est verrouillé que pendant le décodage d'une fenêtre.
+
+        Args:
+            audio: Chemin du fichier audio ou signal float32 mono à 16 kHz
+            window_seconds: Durée des fenêtres (par défaut celle de l'extracteur, sinon 30 s)
+            overlap_seconds: Chevauchement entre fenêtres
+            speech_regions: Zones {"debut", "fin"} à transcrire (voir transcribe)
+
+        Yields:
+            (segments de la fenêtre, langue, statistiques cumulées) pour chaque fenêtre
+        """
+        y, sr = self.load_audio(audio)
+        window_seconds = window_seconds or self.transcription_window_seconds or 30.0
+        overlap_seconds = self.transcription_overlap_seconds if overlap_seconds is None else overlap_seconds
+
+        duration = len(y) / sr
+        stats = IncrementalSpeechStats(self.filler_matchers, duration)
+        if self.engine.single_call:
+            # Une seule fenêtre sur tout l'enregistrement, sans retrait des silences
+            window_seconds, speech_regions = max(duration, window_seconds), None
+
+        # Les fenêtres découpent le signal réduit à la parole, si des zones sont données
+        time_map = SpeechTimeMap(speech_regions, sr, len(y)) if speech_regions is not None else None
+        if time_map is not None:
+            print(f" Parole : {time_map.speech_seconds:.1f}s transcrites sur {duration:.1f}s")
+            y = time_map.compact(y)
+            if len(y) == 0:
+                yield [], None, stats.snapshot(duration)
+                return
+
+        language, prompt, index = None, None, 0
+        for (start, end), (keep_start, keep_end) in window_bounds(len(y), sr, window_seconds, overlap_seconds):
+            with self._model_lock:
+                result = self.engine.transcribe(
+                    y[start:end],
+                    language=language,
+                    initial_prompt=prompt,
+                    condition_on_previous_text=False
+                )
+            language = language or result.get("language")
+
+            segments = shift_segments(result["segments"], start / sr, keep_start, keep_end)
+            position = min(keep_end, len(y) / sr)
+            if time_map is not None:
+                segments = time_map.remap_segments(segments)
+                position = time_map.to_original(position, end=True)
+            for segment in segments:
+                segment["id"] = index
+                index += 1
+                stats.update(segment, language)
+            if segments:
+                prompt = "".join(segment["text"] for segment in segments)[-200:]
+
+            yield segments, language, stats.snapshot(position)
+
     def calculate_speech_rate(self, transcription, audio_duration):
         """
         Calcule le débit de parole (mots par minute)
@@ -119,127 +300,118 @@ class AudioExtractor:
         wpm = len(words) / duration_minutes
         return round(wpm, 2)
     
-    def detect_fillers(self, transcription, language="fr"):
+    def detect_fillers(self, transcription, language="fr", segments=None):
         """
-        Détecte les mots de remplissage (fillers)
+        Détecte les mots de remplissage (fillers) en un seul parcours du texte
 
         Args:
             transcription: Texte transcrit
             language: Langue détectée ("fr" ou "en")
+            segments: Segments Whisper avec horodatage par mot (optionnel)
 
         Returns:
-            dict avec nombre et pourcentage de fillers
+            dict avec nombre, pourcentage, détail par filler et occurrences
+            (positions en caractères, et en secondes si les mots sont horodatés)
         """
         text_lower = transcription.lower()
         total_words = len(transcription.split())
 
-        # Choisir la liste de fillers selon la langue
-        fillers_list = self.fillers_en if language == "en" else self.fillers_fr
-
-        filler_counts = {}
-        total_fillers = 0
+        # Choisir le matcher selon la langue
+        matcher = self.filler_matchers["en" if language == "en" else "fr"]
 
-        for filler in fillers_list:
-            # Cherche le filler comme mot entier
-            pattern = r'\b' + re.escape(filler) + r'\b'
-            count = len(re.findall(pattern, text_lower))
-
-            if count > 0:
-                filler_counts[filler] = count
-                total_fillers += count
+        occurrences = matcher.find(text_lower)
+        filler_counts = matcher.count(occurrences)
+        total_fillers = len(occurrences)
 
         percentage = (total_fillers / total_words * 100) if total_words > 0 else 0
 
         return {
             "nombre_total": total_fillers,
             "pourcentage": round(percentage, 2),
-            "detail": filler_counts
+            "detail": filler_counts,
+            "occurrences": locate_occurrences(occurrences, word_char_spans(text_lower, segments))
         }
     
-    def analyze_audio_features(self, audio_path):
+    def analyze_audio_features(self, audio_path, hop_length=512, min_pause_duration=0.5):
         """
         Analyse les caractéristiques audio (volume, pitch, pauses)
         
         Args:
-            audio_path: Chemin du fichier audio
+            audio_path: Chemin du fichier audio ou signal float32 mono à 16 kHz
+            hop_length: Pas entre deux frames d'analyse (échantillons)
+            min_pause_duration: Durée minimale d'une pause (secondes)
             
         Returns:
             dict avec métriques audio
         """
+        if self.stream_block_seconds:
+            return self.analyze_audio_features_streaming(
+                audio_path, hop_length=hop_length, min_pause_duration=min_pause_duration
+            )
+
         print(" Analyse des caractéristiques audio...")
         
-        # Charger l'audio
-        y, sr = librosa.load(audio_path, sr=16000)
+        # Charger l'audio (aucune relecture si le signal est déjà en mémoire)
+        y, sr = self.load_audio(audio_path)
         
-        # 1. Volume (RMS Energy)
-        rms = librosa.feature.rms(y=y)[0]
-        volume_mean = float(np.mean(rms))
-        volume_std = float(np.std(rms))
+        # Valeurs par frame : volume (RMS) et pitch, calculés de façon vectorisée
+        rms = librosa.feature.rms(y=y, hop_length=hop_length)[0]
+        frame_pitches = frame_pitch(y, sr, method=self.pitch_method, hop_length=hop_length)
         
-        # 2. Pitch (F0)
-        pitches, magnitudes = librosa.piptrack(y=y, sr=sr)
+        features = summarize_features(rms, frame_pitches, sr, self.pitch_method,
+                                      hop_length, min_pause_duration)
         
-        # Extraire les pitches non nuls
-        pitch_values = []
-        for t in range(pitches.shape[1]):
-            index = magnitudes[:, t].argmax()
-            pitch = pitches[index, t]
-            if pitch > 0:
-                pitch_values.append(pitch)
-        
-        if pitch_values:
-            pitch_mean = float(np.mean(pitch_values))
-            pitch_std = float(np.std(pitch_values))
+        print(f" Analyse terminée : {features['nombre_pauses']} pauses détectées\n")
+        return features
+    
+    def analyze_audio_features_streaming(self, source, block_seconds=None, hop_length=512,
+                                         min_pause_duration=0.5):
+        """
+        Analyse les caractéristiques audio par blocs de taille fixe
+
+        Le volume, le pitch et les pauses sont calculés bloc par bloc (l'état
+        est conservé aux frontières) : la mémoire dépend de la taille des
+        blocs et non de la durée. Le résultat est identique à
+        analyze_audio_features.
+
+        Args:
+            source: Chemin d'un fichier audio/vidéo (lu en flux) ou signal en mémoire
+            block_seconds: Durée d'un bloc (par défaut stream_block_seconds, sinon 30 s)
+            hop_length: Pas entre deux frames d'analyse (échantillons)
+            min_pause_duration: Durée minimale d'une pause (secondes)
+
+        Returns:
+            dict avec métriques audio
+        """
+        print(" Analyse des caractéristiques audio (par blocs)...")
+
+        block_size = int((block_seconds or self.stream_block_seconds or 30) * SAMPLE_RATE)
+        if isinstance(source, np.ndarray):
+            blocks = iter_blocks(source, block_size)
         else:
-            pitch_mean = 0
-            pitch_std = 0
-        
-        # 3. Détection des pauses (silences > 0.5 secondes)
-        # On considère un silence quand RMS < seuil
-        silence_threshold = np.mean(rms) * 0.2
-        
-        pauses = []
-        in_pause = False
-        pause_start = 0
-        
-        hop_length = 512
-        frame_duration = hop_length / sr  # Durée d'une frame en secondes
-        
-        for i, energy in enumerate(rms):
-            time = i * frame_duration
-            
-            if energy < silence_threshold and not in_pause:
-                # Début d'une pause
-                in_pause = True
-                pause_start = time
-            elif energy >= silence_threshold and in_pause:
-                # Fin d'une pause
-                pause_duration = time - pause_start
-                if pause_duration >= 0.5:  # Seulement si > 0.5 sec
-                    pauses.append({
-                        "timestamp": round(pause_start, 2),
-                        "duree": round(pause_duration, 2)
-                    })
-                in_pause = False
-        
-        print(f" Analyse terminée : {len(pauses)} pauses détectées\n")
-        
-        return {
-            "volume_moyen": round(volume_mean, 4),
-            "volume_std": round(volume_std, 4),
-            "pitch_moyen": round(pitch_mean, 2),
-            "pitch_std": round(pitch_std, 2),
-            "pauses": pauses,
-            "nombre_pauses": len(pauses)
-        }
+            blocks = iter_audio_blocks(source, block_size)
+
+        extractor = StreamingFeatureExtractor(SAMPLE_RATE, self.pitch_method, hop_length)
+        for block in blocks:
+            extractor.push(block)
+        features = extractor.finish(min_pause_duration)
+
+        print(f" Analyse terminée : {features['nombre_pauses']} pauses détectées\n")
+        return features
     
-    def extract_all_metrics(self, video_path, output_json=None):
+    def extract_all_metrics(self, video_path, output_json=None, audio=None,
+                            transcription_data=None, audio_features=None, on_transcription_update=None):
         """
         Pipeline complet : extraction de toutes les métriques
         
         Args:
             video_path: Chemin vers la vidéo
             output_json: Chemin du fichier JSON de sortie (optionnel)
+            audio: Signal déjà décodé (float32 mono 16 kHz), évite un nouveau décodage
+            transcription_data: Transcription déjà calculée (cache), avec "duree_secondes"
+            audio_features: Caractéristiques audio déjà calculées (cache)
+            on_transcription_update: Statistiques partielles de la transcription
+                par fenêtres (voir transcribe)
             
         Returns:
             dict avec toutes les métriques
@@ -248,17 +420,33 @@ class AudioExtractor:
         print(f"EXTRACTION MÉTRIQUES AUDIO : {Path(video_path).name}")
         print(f"{'='*60}\n")
         
-        # 1. Extraire audio
-        audio_path = self.extract_audio_from_video(video_path)
-        if not audio_path:
-            return None
-        
-        # 2. Obtenir la durée
-        y, sr = librosa.load(audio_path, sr=16000)
-        duration = librosa.get_duration(y=y, sr=sr)
+        # 1. Décoder l'audio en mémoire (une seule fois, et seulement s'il reste une étape à calculer)
+        y = None
+        if transcription_data is None or audio_features is None:
+            if audio is None:
+                try:
+                    audio = decode_audio(video_path)
+                except Exception as e:
+                    print(f"Erreur lors du décodage audio : {e}")
+                    return None
+
+            if len(audio) == 0:
+                print("❌ Aucune piste audio trouvée dans la vidéo")
+                return None
+
+            y, sr = self.load_audio(audio)
+
+        # 2. Caractéristiques audio (enveloppe RMS calculée une fois : pauses et zones de parole)
+        if audio_features is None:
+            audio_features = self.analyze_audio_features(y)
         
-        # 3. Transcription
-        transcription_data = self.transcribe(audio_path)
+        # 3. Transcription des zones de parole seulement, et durée
+        if transcription_data is None:
+            speech_regions = audio_features.get("zones_parole") if self.skip_silence else None
+            transcription_data = self.transcribe(y, on_update=on_transcription_update,
+                                                 speech_regions=speech_regions)
+            transcription_data["duree_secondes"] = librosa.get_duration(y=y, sr=sr)
+        duration = transcription_data["duree_secondes"]
         detected_language = transcription_data.get("language", "fr")
 
         # 4. Débit de parole
@@ -268,10 +456,18 @@ class AudioExtractor:
         )
 
         # 5. Fillers
-        fillers_data = self.detect_fillers(transcription_data["texte_complet"], detected_language)
-        
-        # 6. Caractéristiques audio
-        audio_features = self.analyze_audio_features(audio_path)
+        fillers_data = self.detect_fillers(
+            transcription_data["texte_complet"],
+            detected_language,
+            transcription_data["segments"]
+        )
+
+        # 6. Débit d'articulation, débit par fenêtre et pauses entre les mots horodatés
+        timing = timing_metrics(transcription_data["segments"], duration)
+        if timing is not None and self.pause_source == "words":
+            pauses, pause_source = timing["pauses"], "mots"
+        else:
+            pauses, pause_source = audio_features["pauses"], "rms"
         
         # Compilation des résultats
         results = {
@@ -282,6 +478,9 @@ class AudioExtractor:
             "debit_mots_par_minute": speech_rate,
             "fillers": fillers_data,
             "audio_features": audio_features,
+            "timing": timing,
+            "pauses": pauses,
+            "source_pauses": pause_source,
             "segments": transcription_data["segments"],
             "language": detected_language
         }
@@ -321,6 +520,8 @@ if __name__ == "__main__":
         print(f"  • Mots : {results['nombre_mots']}")
         print(f"  • Débit : {results['debit_mots_par_minute']} mots/min")
         print(f"  • Fillers : {results['fillers']['nombre_total']} ({results['fillers']['pourcentage']}%)")
-        print(f"  • Pauses : {results['audio_features']['nombre_pauses']}")
+        print(f"  • Pauses : {len(results['pauses'])} ({results['source_pauses']})")
+        if results['timing']:
+            print(f"  • Débit d'articulation : {results['timing']['debit_articulation']} mots/min")
         print(f"  • Volume moyen : {results['audio_features']['volume_moyen']:.4f}")
         print(f"  • Pitch moyen : {results['audio_features']['pitch_moyen']:.2f} Hz")
\ No newline at end of file
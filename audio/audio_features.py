@@ -0,0 +1,398 @@
+"""
+Calculs vectorisés des caractéristiques audio (volume, pitch, pauses) utilisés par AudioExtractor
+
+Deux chemins produisent les mêmes valeurs par frame puis le même résumé :
+- analyse du signal complet en mémoire (`frame_pitch`, `librosa.feature.rms`)
+- analyse en flux par blocs (`StreamingFeatureExtractor`), dont la mémoire
+  dépend de la taille des blocs et non de la durée de l'enregistrement
+"""
+import librosa
+import numpy as np
+import scipy.signal
+
+PITCH_METHODS = ("piptrack", "yin")
+
+# Taille des frames d'analyse (RMS et STFT de piptrack), comme les valeurs par défaut de librosa
+FRAME_LENGTH = 2048
+
+# Plage de F0 de la voix parlée (Hz) et fréquence de travail de YIN
+YIN_FMIN = 65
+YIN_FMAX = 400
+YIN_SAMPLE_RATE = 8000
+
+# Zones de parole transmises à Whisper : les silences plus longs que
+# VAD_MIN_SILENCE sont retirés, chaque zone garde VAD_PADDING de marge
+VAD_MIN_SILENCE = 1.0
+VAD_PADDING = 0.25
+
+# Résolution (secondes) de la série temporelle du volume et du pitch
+SERIES_RESOLUTION = 1.0
+
+
+class Decimator:
+    """
+    Filtre passe-bas FIR puis décimation vers 8 kHz, avec état conservé entre blocs
+
+    Décimer un signal par blocs successifs donne exactement le même résultat
+    que décimer le signal complet.
+    """
+
+    def __init__(self, sr, target_sr=YIN_SAMPLE_RATE):
+        if sr % target_sr:
+            raise ValueError(f"Décimation impossible de {sr} Hz vers {target_sr} Hz")
+        self.factor = sr // target_sr
+        self.taps = scipy.signal.firwin(63, 0.45 * target_sr, fs=sr)
+        self._state = np.zeros(len(self.taps) - 1)
+        self._phase = 0
+
+    def process(self, block):
+        filtered, self._state = scipy.signal.lfilter(self.taps, 1.0, block, zi=self._state)
+        decimated = filtered[self._phase::self.factor]
+        self._phase = (self._phase - len(block)) % self.factor
+        return decimated.astype(np.float32)
+
+
+def frame_pitch_piptrack(y, sr, hop_length=512, center=True):
+    """
+    Pitch du bin le plus énergétique de chaque frame (librosa.piptrack)
+
+    Args:
+        y: Signal mono
+        sr: Fréquence d'échantillonnage
+        hop_length: Pas entre deux frames
+        center: Frames centrées (False pour un bloc déjà découpé en frames entières)
+
+    Returns:
+        np.ndarray d'un pitch par frame (0 si aucun pic)
+    """
+    if center:
+        pitches, magnitudes = librosa.piptrack(y=y, sr=sr, n_fft=FRAME_LENGTH, hop_length=hop_length)
+    else:
+        S = np.abs(librosa.stft(y, n_fft=FRAME_LENGTH, hop_length=hop_length, center=False))
+        pitches, magnitudes = librosa.piptrack(S=S, sr=sr, n_fft=FRAME_LENGTH, hop_length=hop_length)
+
+    # Un seul argmax sur toutes les colonnes au lieu d'une boucle par frame
+    return pitches[magnitudes.argmax(axis=0), np.arange(pitches.shape[1])]
+
+
+def frame_f0_yin(y_dec, hop_length=512, sr=16000, center=True):
+    """
+    F0 estimée par YIN sur un signal déjà décimé à 8 kHz (moins coûteux que piptrack)
+
+    La F0 de la voix reste sous 400 Hz : travailler à 8 kHz divise par deux la
+    taille des frames. La fenêtre fait deux hops (64 ms), suffisante pour une
+    F0 >= 65 Hz, et les frames sont centrées comme celles du RMS.
+
+    Args:
+        y_dec: Signal décimé (Decimator)
+        hop_length: Pas entre deux frames à la fréquence d'origine `sr`
+        sr: Fréquence d'échantillonnage d'origine
+        center: Frames centrées (False pour un bloc déjà découpé en frames entières)
+
+    Returns:
+        np.ndarray d'une F0 par frame
+    """
+    hop_dec = int(hop_length * YIN_SAMPLE_RATE / sr)
+    return librosa.yin(
+        y_dec, fmin=YIN_FMIN, fmax=YIN_FMAX, sr=YIN_SAMPLE_RATE,
+        frame_length=2 * hop_dec, hop_length=hop_dec, center=center
+    )
+
+
+def frame_pitch(y, sr, method="piptrack", hop_length=512):
+    """
+    Pitch par frame du signal complet selon l'estimateur choisi ("piptrack" ou "yin")
+    """
+    if method == "piptrack":
+        return frame_pitch_piptrack(y, sr, hop_length=hop_length)
+    if method == "yin":
+        return frame_f0_yin(Decimator(sr).process(y), hop_length=hop_length, sr=sr)
+    raise ValueError(f"Méthode de pitch inconnue : {method} (attendu : {', '.join(PITCH_METHODS)})")
+
+
+def pitch_values(frame_pitches, method, voiced):
+    """
+    Valeurs de pitch retenues pour les statistiques
+
+    piptrack : frames avec un pic (pitch > 0) ; yin : frames voisées (RMS au-dessus du seuil)
+    """
+    if method == "yin":
+        n = min(len(frame_pitches), len(voiced))
+        return frame_pitches[:n][voiced[:n]]
+    return frame_pitches[frame_pitches > 0]
+
+
+def silent_runs(rms, silence_threshold):
+    """
+    Plages de frames sous le seuil, trouvées par run-length encoding : les
+    changements d'état du masque de silence donnent directement leurs bornes
+
+    Returns:
+        (débuts, fins) en indices de frames, fin exclue
+    """
+    silent = np.asarray(rms) < silence_threshold
+
+    # +1 au début d'une plage de silence, -1 à la frame qui la termine
+    edges = np.diff(silent.astype(np.int8), prepend=0, append=0)
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def detect_pauses(rms, sr, hop_length=512, min_duration=0.5, silence_threshold=None):
+    """
+    Détecte les pauses (plages de silence) sur l'enveloppe RMS, sans boucle par frame
+
+    Les pauses sont les plages de silence de silent_runs() assez longues.
+    Une pause qui dure jusqu'à la fin du fichier est conservée.
+
+    Args:
+        rms: Enveloppe RMS (une valeur par frame)
+        sr: Fréquence d'échantillonnage
+        hop_length: Pas entre deux frames
+        min_duration: Durée minimale d'une pause (secondes)
+        silence_threshold: Seuil de silence (par défaut 20% du RMS moyen)
+
+    Returns:
+        Liste de pauses {"timestamp", "duree"} en secondes
+    """
+    if silence_threshold is None:
+        silence_threshold = np.mean(rms) * 0.2
+
+    starts, ends = silent_runs(rms, silence_threshold)
+
+    frame_duration = hop_length / sr  # Durée d'une frame en secondes
+    start_times = starts * frame_duration
+    durations = ends * frame_duration - start_times
+
+    keep = durations >= min_duration
+    return [
+        {"timestamp": round(float(start), 2), "duree": round(float(duration), 2)}
+        for start, duration in zip(start_times[keep], durations[keep])
+    ]
+
+
+def speech_regions(rms, sr, hop_length=512, silence_threshold=None,
+                   min_silence=VAD_MIN_SILENCE, padding=VAD_PADDING):
+    """
+    Zones de parole : complément des silences d'au moins `min_silence` secondes
+
+    Calculées sur la même enveloppe RMS et avec le même seuil que les pauses,
+    elles permettent de ne transcrire que la parole (audio/vad.py).
+
+    Returns:
+        Liste de zones {"debut", "fin"} en secondes, élargies de `padding`
+    """
+    if len(rms) == 0:
+        return []
+    if silence_threshold is None:
+        silence_threshold = np.mean(rms) * 0.2
+
+    frame_duration = hop_length / sr
+    duration = len(rms) * frame_duration
+    starts, ends = silent_runs(rms, silence_threshold)
+    long_gaps = (ends - starts) * frame_duration >= min_silence
+
+    # La parole est entre deux longs silences (ou avant le premier / après le dernier)
+    speech_starts = np.concatenate([[0.0], ends[long_gaps] * frame_duration])
+    speech_ends = np.concatenate([starts[long_gaps] * frame_duration, [duration]])
+    keep = speech_ends > speech_starts
+
+    regions = []
+    for start, end in zip(speech_starts[keep] - padding, speech_ends[keep] + padding):
+        start, end = max(0.0, float(start)), min(duration, float(end))
+        if regions and start <= regions[-1]["fin"]:
+            regions[-1]["fin"] = round(end, 2)
+        else:
+            regions.append({"debut": round(start, 2), "fin": round(end, 2)})
+    return regions
+
+
+def frame_series(rms, frame_pitches, sr, method="piptrack", hop_length=512, silence_threshold=0.0,
+                 resolution=SERIES_RESOLUTION):
+    """
+    Volume et pitch regroupés par tranches de `resolution` secondes
+
+    Seuls le nombre de frames, la somme (et pour le pitch la somme des carrés)
+    de chaque tranche sont gardés : la taille dépend de la durée, pas du
+    nombre de frames. Format des séries de scoring/timeline.py.
+
+    Les frames sous le seuil de silence sont exclues : une pause ne doit pas
+    apparaître comme un volume faible ou une voix monotone.
+
+    Returns:
+        dict {"resolution", "metrics": {"volume", "pitch"}}
+    """
+    rms = np.asarray(rms, dtype=np.float64)
+    bins = (np.arange(len(rms)) * hop_length / sr / resolution).astype(np.int64)
+    n_bins = int(bins[-1]) + 1 if len(bins) else 0
+    voiced = rms >= silence_threshold
+
+    # Frames de pitch de pitch_values, parmi les frames de parole
+    n = min(len(frame_pitches), len(rms))
+    pitches = np.asarray(frame_pitches[:n], dtype=np.float64)
+    kept = voiced[:n] if method == "yin" else voiced[:n] & (pitches > 0)
+    pitch_bins, pitches = bins[:n][kept], pitches[kept]
+
+    def rounded(column):
+        return np.round(column, 4).tolist()
+
+    return {
+        "resolution": resolution,
+        "metrics": {
+            "volume": {
+                "count": rounded(np.bincount(bins[voiced], minlength=n_bins)),
+                "sum": rounded(np.bincount(bins[voiced], weights=rms[voiced], minlength=n_bins))
+            },
+            "pitch": {
+                "count": rounded(np.bincount(pitch_bins, minlength=n_bins)),
+                "sum": rounded(np.bincount(pitch_bins, weights=pitches, minlength=n_bins)),
+                "sum_sq": rounded(np.bincount(pitch_bins, weights=pitches ** 2, minlength=n_bins))
+            }
+        }
+    }
+
+
+def summarize_features(rms, frame_pitches, sr, method="piptrack", hop_length=512, min_pause_duration=0.5):
+    """
+    Résume les valeurs par frame en métriques audio (volume, pitch, pauses)
+
+    Args:
+        rms: Enveloppe RMS
+        frame_pitches: Pitch par frame (frame_pitch ou StreamingFeatureExtractor)
+        sr: Fréquence d'échantillonnage
+        method: Estimateur de pitch utilisé
+        hop_length: Pas entre deux frames
+        min_pause_duration: Durée minimale d'une pause (secondes)
+
+    Returns:
+        dict avec métriques audio (dont les zones de parole et la série temporelle)
+    """
+    # 1. Volume (RMS Energy)
+    volume_mean = float(np.mean(rms))
+    volume_std = float(np.std(rms))
+
+    # On considère un silence quand RMS < seuil
+    silence_threshold = np.mean(rms) * 0.2
+
+    # 2. Pitch (F0)
+    pitches = pitch_values(frame_pitches, method, voiced=rms >= silence_threshold)
+
+    if len(pitches) > 0:
+        pitch_mean = float(np.mean(pitches))
+        pitch_std = float(np.std(pitches))
+    else:
+        pitch_mean = 0
+        pitch_std = 0
+
+    # 3. Détection des pauses (silences > 0.5 secondes), y compris en fin de fichier
+    pauses = detect_pauses(rms, sr, hop_length=hop_length, min_duration=min_pause_duration,
+                           silence_threshold=silence_threshold)
+
+    # 4. Zones de parole pour la transcription, sur la même enveloppe
+    regions = speech_regions(rms, sr, hop_length=hop_length, silence_threshold=silence_threshold)
+
+    # 5. Volume et pitch seconde par seconde (timeline)
+    series = frame_series(rms, frame_pitches, sr, method, hop_length, silence_threshold)
+
+    return {
+        "volume_moyen": round(volume_mean, 4),
+        "volume_std": round(volume_std, 4),
+        "pitch_moyen": round(pitch_mean, 2),
+        "pitch_std": round(pitch_std, 2),
+        "pauses": pauses,
+        "nombre_pauses": len(pauses),
+        "zones_parole": regions,
+        "serie_temporelle": series
+    }
+
+
+class _BlockFramer:
+    """
+    Regroupe un flux de blocs en portions contenant un nombre entier de frames
+
+    Reproduit le découpage de librosa avec center=True (zéros ajoutés au début
+    et à la fin) : les frames obtenues sont identiques à celles du signal complet.
+    """
+
+    def __init__(self, frame_length, hop_length):
+        self.frame_length = frame_length
+        self.hop_length = hop_length
+        self._buffer = np.zeros(frame_length // 2, dtype=np.float32)
+
+    def push(self, block):
+        """Retourne la portion prête à analyser (center=False), ou None"""
+        buffer = np.concatenate([self._buffer, block])
+        if len(buffer) < self.frame_length:
+            self._buffer = buffer
+            return None
+
+        n_frames = 1 + (len(buffer) - self.frame_length) // self.hop_length
+        ready = buffer[:(n_frames - 1) * self.hop_length + self.frame_length]
+        self._buffer = buffer[n_frames * self.hop_length:]
+        return ready
+
+    def flush(self):
+        """Dernières frames (zéros de fin ajoutés comme avec center=True)"""
+        return self.push(np.zeros(self.frame_length // 2, dtype=np.float32))
+
+
+class StreamingFeatureExtractor:
+    """
+    Analyse audio incrémentale, bloc par bloc
+
+    Seules les valeurs par frame sont conservées (RMS et pitch, quelques
+    centaines d'octets par seconde) ; le signal et les spectrogrammes ne
+    dépassent jamais la taille d'un bloc. Le résumé final est le même que
+    celui de l'analyse du signal complet.
+    """
+
+    def __init__(self, sr, method="piptrack", hop_length=512):
+        if method not in PITCH_METHODS:
+            raise ValueError(f"Méthode de pitch inconnue : {method} (attendu : {', '.join(PITCH_METHODS)})")
+        self.sr = sr
+        self.method = method
+        self.hop_length = hop_length
+        self.n_samples = 0
+        self._framer = _BlockFramer(FRAME_LENGTH, hop_length)
+        self._rms = []
+        self._pitches = []
+
+        if method == "yin":
+            self._decimator = Decimator(sr)
+            hop_dec = int(hop_length * YIN_SAMPLE_RATE / sr)
+            self._yin_framer = _BlockFramer(2 * hop_dec, hop_dec)
+
+    def _analyze(self, ready):
+        if ready is None:
+            return
+        frames = librosa.util.frame(ready, frame_length=FRAME_LENGTH, hop_length=self.hop_length)
+        self._rms.append(np.sqrt(np.mean(np.abs(frames) ** 2, axis=0)))
+        if self.method == "piptrack":
+            self._pitches.append(frame_pitch_piptrack(ready, self.sr, self.hop_length, center=False))
+
+    def _analyze_yin(self, ready):
+        if ready is not None:
+            self._pitches.append(frame_f0_yin(ready, self.hop_length, self.sr, center=False))
+
+    def push(self, block):
+        """Ajoute un bloc de signal mono float32"""
+        block = np.asarray(block, dtype=np.float32)
+        self.n_samples += len(block)
+        self._analyze(self._framer.push(block))
+        if self.method == "yin":
+            self._analyze_yin(self._yin_framer.push(self._decimator.process(block)))
+
+    def finish(self, min_pause_duration=0.5):
+        """Termine le flux et retourne les métriques audio"""
+        self._analyze(self._framer.flush())
+        if self.method == "yin":
+            self._analyze_yin(self._yin_framer.flush())
+
+        rms = np.concatenate(self._rms) if self._rms else np.zeros(0, dtype=np.float32)
+        pitches = np.concatenate(self._pitches) if self._pitches else np.zeros(0, dtype=np.float32)
+        return summarize_features(rms, pitches, self.sr, self.method, self.hop_length, min_pause_duration)
+
+
+def iter_blocks(y, block_size):
+    """Découpe un signal en mémoire en blocs (vues, sans copie)"""
+    for start in range(0, len(y), block_size):
+        yield y[start:start + block_size]
@@ -0,0 +1,87 @@
+import librosa
+import numpy as np
+import pytest
+
+from audio.audio_features import (
+    FRAME_LENGTH, StreamingFeatureExtractor, detect_pauses, frame_pitch, frame_pitch_piptrack, iter_blocks,
+    pitch_values, summarize_features,
+)
+
+SR = 16000
+
+
+def speech_like(seed, seconds=6.0):
+    """Harmonic voice with a random F0 contour, noise and random silences"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * SR)) / SR
+    f0 = rng.uniform(90, 220) + rng.uniform(10, 60) * np.sin(2 * np.pi * rng.uniform(0.1, 1.0) * t)
+    phase = 2 * np.pi * np.cumsum(f0) / SR
+    y = sum(rng.uniform(0.02, 0.2) / k * np.sin(k * phase) for k in range(1, 6))
+    y += rng.uniform(0.001, 0.02) * rng.standard_normal(len(t))
+    for start in rng.uniform(0, seconds - 1, size=rng.integers(1, 4)):
+        y[int(start * SR):int((start + rng.uniform(0.2, 1.0)) * SR)] *= 0.001
+    return y.astype(np.float32)
+
+
+def piptrack_loop(y, sr, hop_length=512):
+    """Per-frame selection replaced by frame_pitch_piptrack (reference)"""
+    pitches, magnitudes = librosa.piptrack(y=y, sr=sr, n_fft=FRAME_LENGTH, hop_length=hop_length)
+    values = []
+    for t in range(pitches.shape[1]):
+        index = magnitudes[:, t].argmax()
+        pitch = pitches[index, t]
+        if pitch > 0:
+            values.append(pitch)
+    return np.array(values, dtype=pitches.dtype)
+
+
+@pytest.mark.parametrize("seed", range(8))
+@pytest.mark.parametrize("hop_length", [256, 512])
+def test_vectorized_piptrack_matches_loop(seed, hop_length):
+    y = speech_like(seed)
+    frames = frame_pitch_piptrack(y, SR, hop_length=hop_length)
+    vectorized = pitch_values(frames, "piptrack", voiced=None)
+
+    np.testing.assert_array_equal(vectorized, piptrack_loop(y, SR, hop_length))
+
+
+def pauses_loop(rms, sr, hop_length=512, min_duration=0.5):
+    """Frame loop replaced by detect_pauses (reference), plus the silence running to the end"""
+    silence_threshold = np.mean(rms) * 0.2
+    frame_duration = hop_length / sr
+    pauses, in_pause, pause_start = [], False, 0
+    for i, energy in enumerate(list(rms) + [np.inf]):
+        time = i * frame_duration
+        if energy < silence_threshold and not in_pause:
+            in_pause, pause_start = True, time
+        elif energy >= silence_threshold and in_pause:
+            if time - pause_start >= min_duration:
+                pauses.append({"timestamp": round(pause_start, 2), "duree": round(time - pause_start, 2)})
+            in_pause = False
+    return pauses
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_run_length_pauses_match_loop(seed):
+    """Random envelopes: runs of speech and silence of random lengths, some ending the file"""
+    rng = np.random.default_rng(seed)
+    runs = rng.integers(1, 80, size=rng.integers(1, 40))
+    levels = np.where(np.arange(len(runs)) % 2 == rng.integers(2), 0.001, 0.1)
+    rms = np.repeat(levels, runs) * rng.uniform(0.5, 1.5, size=runs.sum())
+
+    assert detect_pauses(rms, SR) == pauses_loop(rms, SR)
+
+
+@pytest.mark.parametrize("method", ["piptrack", "yin"])
+@pytest.mark.parametrize("block_size", [1000, 4096, SR, 3 * SR + 7])
+def test_streaming_matches_whole_signal(method, block_size):
+    """Same summary as AudioExtractor.analyze_audio_features, whatever the block size"""
+    y = speech_like(seed=block_size, seconds=7.3)
+    rms = librosa.feature.rms(y=y, hop_length=512)[0]
+    whole = summarize_features(rms, frame_pitch(y, SR, method=method), SR, method)
+
+    extractor = StreamingFeatureExtractor(SR, method)
+    for block in iter_blocks(y, block_size):
+        extractor.push(block)
+
+    assert extractor.finish() == whole
@@ -22,13 +22,22 @@ class AudioScorer:
         self.pause_ideale_min = 0.8
         self.pause_ideale_max = 2.5
         self.pause_frequence_ideale = 15  # Secondes entre pauses
+        self.pause_trop_longue = 4
+        self.pause_frequence_min = 10  # Bon rythme entre 10 et 20 s
+        self.pause_frequence_max = 20
+        self.pause_frequence_trop_frequente = 5
+        self.pause_frequence_trop_rare = 30
         
         # Seuils pour le volume
         self.volume_optimal_min = 0.02
         self.volume_optimal_max = 0.15
+        self.volume_variation_bonne = 0.01
+        self.volume_variation_moyenne = 0.005
         
         # Seuils pour la variation de pitch (intonation)
         self.pitch_variation_min = 20  # Hz minimum pour être expressif
+        self.pitch_variation_acceptable = 10
+        self.pitch_variation_monotone = 5
     
     def score_debit(self, debit_mpm):
         """
@@ -108,7 +117,7 @@ class AudioScorer:
             score_duree = 10
         elif duree_moyenne < self.pause_ideale_min:
             score_duree = 7  # Pauses trop courtes
-        elif duree_moyenne > 4:
+        elif duree_moyenne > self.pause_trop_longue:
             score_duree = 4  # Pauses trop longues
         else:
             score_duree = 8
@@ -116,11 +125,11 @@ class AudioScorer:
         # 2. Score sur la fréquence des pauses
         frequence = duree_totale / len(pauses) if len(pauses) > 0 else 0
         
-        if 10 <= frequence <= 20:
+        if self.pause_frequence_min <= frequence <= self.pause_frequence_max:
             score_frequence = 10  # Bon rythme
-        elif frequence < 5:
+        elif frequence < self.pause_frequence_trop_frequente:
             score_frequence = 6  # Trop de pauses
-        elif frequence > 30:
+        elif frequence > self.pause_frequence_trop_rare:
             score_frequence = 5  # Pas assez de pauses
         else:
             score_frequence = 8
@@ -152,9 +161,9 @@ class AudioScorer:
         
         # Score sur la variation (dynamique)
         # Une bonne variation montre de l'expressivité
-        if volume_std > 0.01:
+        if volume_std > self.volume_variation_bonne:
             score_variation = 10
-        elif volume_std > 0.005:
+        elif volume_std > self.volume_variation_moyenne:
             score_variation = 8
         else:
             score_variation = 6  # Monotone
@@ -173,9 +182,9 @@ class AudioScorer:
         """
         if pitch_std >= self.pitch_variation_min:
             return 10  # Intonation expressive
-        elif pitch_std >= 10:
+        elif pitch_std >= self.pitch_variation_acceptable:
             return 7  # Acceptable
-        elif pitch_std >= 5:
+        elif pitch_std >= self.pitch_variation_monotone:
             return 5  # Monotone
         else:
             return 3  # Très monotone
@@ -199,7 +208,9 @@ class AudioScorer:
         # Calcul des scores individuels
         score_debit_val = self.score_debit(debit)
         score_fillers_val = self.score_fillers(fillers.get("pourcentage", 0))
-        score_pauses_val = self.score_pauses(audio_features.get("pauses", []), duree)
+        # Pauses entre les mots horodatés si disponibles, sinon celles de l'analyse RMS
+        pauses = metrics.get("pauses", audio_features.get("pauses", []))
+        score_pauses_val = self.score_pauses(pauses, duree)
         score_volume_val = self.score_volume(
             audio_features.get("volume_moyen", 0),
             audio_features.get("volume_std", 0)
@@ -0,0 +1,98 @@
+"""
+Détection des mots de remplissage (fillers) en une seule passe sur le texte
+"""
+import re
+from collections import Counter
+
+import numpy as np
+
+
+class FillerMatcher:
+    """
+    Une expression régulière compilée une fois par langue, qui reconnaît tous
+    les fillers (y compris multi-mots comme "du coup") en un seul parcours
+    """
+
+    def __init__(self, fillers):
+        self.fillers = list(fillers)
+
+        # Les plus longs d'abord : à position égale, "du coup" l'emporte sur un éventuel "du"
+        alternatives = sorted(self.fillers, key=len, reverse=True)
+        self.pattern = re.compile(r"\b(?:" + "|".join(re.escape(f) for f in alternatives) + r")\b")
+
+    def find(self, text_lower):
+        """
+        Args:
+            text_lower: Texte en minuscules
+
+        Returns:
+            Liste de (filler, début, fin) en positions de caractères
+        """
+        return [(m.group(), m.start(), m.end()) for m in self.pattern.finditer(text_lower)]
+
+    def count(self, occurrences):
+        """Nombre d'occurrences par filler, dans l'ordre de la liste de fillers"""
+        counts = Counter(filler for filler, _, _ in occurrences)
+        return {filler: counts[filler] for filler in self.fillers if counts[filler] > 0}
+
+
+def word_char_spans(text_lower, segments):
+    """
+    Aligne les mots horodatés de Whisper (segments[i]["words"]) sur le texte
+
+    Returns:
+        (débuts, fins) en caractères et (débuts, fins) en secondes, en np.ndarray
+        triés ; tableaux vides si les segments n'ont pas d'horodatage par mot
+    """
+    char_starts, char_ends, time_starts, time_ends = [], [], [], []
+    cursor = 0
+
+    for segment in segments or []:
+        for word in segment.get("words") or []:
+            token = word["word"].strip().lower()
+            position = text_lower.find(token, cursor) if token else -1
+            if position < 0:
+                continue
+            char_starts.append(position)
+            char_ends.append(position + len(token))
+            time_starts.append(word["start"])
+            time_ends.append(word["end"])
+            cursor = position + len(token)
+
+    return (np.array(char_starts, dtype=np.int64), np.array(char_ends, dtype=np.int64),
+            np.array(time_starts, dtype=np.float64), np.array(time_ends, dtype=np.float64))
+
+
+def locate_occurrences(occurrences, spans):
+    """
+    Ajoute les positions temporelles aux occurrences de fillers
+
+    Args:
+        occurrences: Liste de (filler, début, fin) en caractères
+        spans: Résultat de word_char_spans()
+
+    Returns:
+        Liste de dicts {filler, debut, fin, timestamp, timestamp_fin}
+        (timestamps à None sans horodatage par mot)
+    """
+    char_starts, char_ends, time_starts, time_ends = spans
+    result = [
+        {"filler": filler, "debut": start, "fin": end, "timestamp": None, "timestamp_fin": None}
+        for filler, start, end in occurrences
+    ]
+    if not result or len(char_starts) == 0:
+        return result
+
+    starts = np.array([o["debut"] for o in result])
+    ends = np.array([o["fin"] for o in result])
+
+    # Premier mot qui se termine après le début du filler, dernier mot qui commence avant sa fin
+    first = np.searchsorted(char_ends, starts, side="right")
+    last = np.searchsorted(char_starts, ends, side="left") - 1
+    found = (first < len(char_starts)) & (last >= first)
+
+    for occurrence, ok, i, j in zip(result, found, first, last):
+        if ok:
+            occurrence["timestamp"] = round(float(time_starts[i]), 2)
+            occurrence["timestamp_fin"] = round(float(time_ends[j]), 2)
+    return result
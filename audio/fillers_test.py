@@ -0,0 +1,119 @@
+import re
+
+import numpy as np
+import pytest
+
+from audio.audio_extraction import AudioExtractor
+from audio.fillers import FillerMatcher, locate_occurrences, word_char_spans
+
+WORDS = [
+    "je", "pense", "que", "le", "modèle", "est", "prêt", "coupé", "fête", "ça", "bonjour", "enfant",
+    "the", "model", "is", "ready", "so-called", "likely", "knowing", "okayish", "whale", "erreur",
+    "heum", "Heu", "EUH", "Voilà", "VOILÀ", "Du", "coup", "du coup", "En fait", "you know", "You Know",
+    "Like", "so", "well", "Bon", "ben", "bah", "alors", "quoi", "hein", "genre", "um", "uh", "er", "ah",
+    "actually", "Basically", "literally", "honestly", "anyway", "okay",
+]
+PUNCTUATION = ["", "", "", ",", ".", "...", "?", "!"]
+
+
+@pytest.fixture(scope="module")
+def extractor():
+    return AudioExtractor(engine="none", load_model=False)
+
+
+def fillers_loop(extractor, transcription, language):
+    """Per-filler regex loop replaced by FillerMatcher (reference)"""
+    text_lower = transcription.lower()
+    total_words = len(transcription.split())
+    fillers_list = extractor.fillers_en if language == "en" else extractor.fillers_fr
+
+    filler_counts = {}
+    total_fillers = 0
+    for filler in fillers_list:
+        pattern = r'\b' + re.escape(filler) + r'\b'
+        count = len(re.findall(pattern, text_lower))
+        if count > 0:
+            filler_counts[filler] = count
+            total_fillers += count
+
+    percentage = (total_fillers / total_words * 100) if total_words > 0 else 0
+    return {"nombre_total": total_fillers, "pourcentage": round(percentage, 2), "detail": filler_counts}
+
+
+@pytest.mark.parametrize("seed", range(300))
+def test_single_pass_matches_per_filler_loop(extractor, seed):
+    """Mixed French and English transcripts: accents, case, punctuation, multi-word and adjacent fillers"""
+    rng = np.random.default_rng(seed)
+    n_words = rng.integers(0, 80)
+    transcription = " ".join(str(rng.choice(WORDS)) + str(rng.choice(PUNCTUATION)) for _ in range(n_words))
+
+    for language in ("fr", "en"):
+        result = extractor.detect_fillers(transcription, language)
+        expected = fillers_loop(extractor, transcription, language)
+        assert {key: result[key] for key in expected} == expected
+        assert list(result["detail"]) == list(expected["detail"])  # Order of the filler list
+        assert len(result["occurrences"]) == result["nombre_total"]
+
+
+def test_accents_case_and_word_boundaries(extractor):
+    # "voilàà" and "bénéfice" contain fillers but are other words
+    result = extractor.detect_fillers("VOILÀ, Euh... voilàà heum heu ben bénéfice EN FAIT Du Coup", "fr")
+
+    assert result["detail"] == {"euh": 1, "heu": 1, "heum": 1, "voilà": 1, "en fait": 1, "ben": 1, "du coup": 1}
+    assert [(o["filler"], o["debut"], o["fin"]) for o in result["occurrences"]][:2] == [("voilà", 0, 5),
+                                                                                        ("euh", 7, 10)]
+
+
+def test_nested_fillers_count_the_longest_once():
+    matcher = FillerMatcher(["du", "du coup", "coup"])
+
+    occurrences = matcher.find("du coup il a dit du pain, coup de chance")
+
+    assert [filler for filler, _, _ in occurrences] == ["du coup", "du", "coup"]
+    assert matcher.count(occurrences) == {"du": 1, "du coup": 1, "coup": 1}
+
+
+def test_occurrences_get_the_times_of_their_words():
+    text = "Bon, du coup on commence. Euh le modèle est prêt, du coup voilà"
+    segments = [
+        {"start": 0.0, "end": 2.0, "words": [
+            {"word": " Bon,", "start": 0.0, "end": 0.3},
+            {"word": " du", "start": 0.5, "end": 0.6},
+            {"word": " coup", "start": 0.6, "end": 0.9},
+            {"word": " on", "start": 1.0, "end": 1.1},
+            {"word": " commence.", "start": 1.1, "end": 1.8},
+        ]},
+        {"start": 12.0, "end": 16.0, "words": [
+            {"word": " Euh", "start": 12.0, "end": 12.4},
+            {"word": " le", "start": 12.6, "end": 12.7},
+            {"word": " modèle", "start": 12.7, "end": 13.1},
+            {"word": " est", "start": 13.1, "end": 13.2},
+            {"word": " prêt,", "start": 13.2, "end": 13.5},
+            {"word": " du", "start": 14.0, "end": 14.1},
+            {"word": " coup", "start": 14.1, "end": 14.4},
+            {"word": " voilà", "start": 15.2, "end": 15.6},
+        ]},
+    ]
+    text_lower = text.lower()
+    matcher = FillerMatcher(["bon", "du coup", "euh", "voilà"])
+
+    occurrences = locate_occurrences(matcher.find(text_lower), word_char_spans(text_lower, segments))
+
+    assert [(o["filler"], o["timestamp"], o["timestamp_fin"]) for o in occurrences] == [
+        ("bon", 0.0, 0.3),
+        ("du coup", 0.5, 0.9),  # Start of "du", end of "coup"
+        ("euh", 12.0, 12.4),
+        ("du coup", 14.0, 14.4),  # Second occurrence: the words after the first one
+        ("voilà", 15.2, 15.6),
+    ]
+    assert all(text_lower[o["debut"]:o["fin"]] == o["filler"] for o in occurrences)
+
+
+def test_occurrences_without_word_timestamps():
+    text_lower = "euh alors"
+    occurrences = FillerMatcher(["euh", "alors"]).find(text_lower)
+
+    # No segments, and a word missing from the text: no timestamps rather than wrong ones
+    for segments in (None, [{"words": [{"word": " bonjour", "start": 0.0, "end": 0.5}]}]):
+        located = locate_occurrences(occurrences, word_char_spans(text_lower, segments))
+        assert [(o["timestamp"], o["timestamp_fin"]) for o in located] == [(None, None), (None, None)]
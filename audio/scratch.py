@@ -0,0 +1,139 @@
+"""
+Fichiers temporaires propres à chaque analyse
+
+Chaque fichier ou répertoire temporaire a un nom unique qui contient le PID
+du processus qui l'a créé et un jeton de ce processus : deux analyses
+simultanées ne partagent jamais un fichier, et reap_stale() reconnaît ce
+qu'un processus arrêté a laissé.
+
+Sous Linux, le jeton est l'instant de démarrage du processus
+(/proc/<pid>/stat) : n'importe quel processus peut vérifier que le PID
+appartient toujours au créateur du fichier, même si un nouveau processus a
+repris ce PID (cas courant dans un conteneur). Sans /proc, le jeton est
+aléatoire et seule l'existence du PID est vérifiée (max_age borne alors la
+durée de vie des fichiers d'un PID repris).
+
+Le répertoire racine est AUDIO_SCRATCH_DIR, sinon /dev/shm (tmpfs : rien
+n'est écrit sur disque) quand il existe, sinon le répertoire temporaire
+du système.
+"""
+import os
+import re
+import shutil
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+# <préfixe>-<pid>-<jeton du processus>-<suffixe aléatoire>[.extension]
+_NAME = re.compile(r"^[a-z]+-(\d+)-([0-9a-f]+)-")
+
+
+def _start_time(pid):
+    """Instant de démarrage d'un processus en tops d'horloge (Linux), None si inconnu"""
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            stat = f.read()
+    except OSError:
+        return None
+    # Le nom du programme (2e champ) peut contenir des espaces : on repart après ")"
+    # ; starttime est le 22e champ, le 20e après le nom
+    return int(stat[stat.rindex(b")") + 2:].split()[19])
+
+
+_HAS_PROC = _start_time(os.getpid()) is not None
+_PROCESS_TOKEN = format(_start_time(os.getpid()), "x") if _HAS_PROC else uuid.uuid4().hex[:8]
+
+
+def scratch_root():
+    """Répertoire racine des fichiers temporaires (créé si besoin)"""
+    configured = os.getenv("AUDIO_SCRATCH_DIR")
+    if configured:
+        root = Path(configured)
+    elif os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+        root = Path("/dev/shm") / "ai-coach"
+    else:
+        root = Path(tempfile.gettempdir()) / "ai-coach"
+    root.mkdir(parents=True, exist_ok=True)
+    return root
+
+
+def owned_name(prefix, suffix=""):
+    """Nom unique rattaché au processus courant (reconnu par reap_stale)"""
+    return f"{_owner(prefix)}{uuid.uuid4().hex}{suffix}"
+
+
+def _owner(prefix):
+    return f"{prefix}-{os.getpid()}-{_PROCESS_TOKEN}-"
+
+
+def scratch_file(suffix="", prefix="audio"):
+    """Chemin d'un nouveau fichier vide au nom unique (à supprimer par l'appelant)"""
+    descriptor, path = tempfile.mkstemp(suffix=suffix, prefix=_owner(prefix), dir=scratch_root())
+    os.close(descriptor)
+    return path
+
+
+def remove(path):
+    """Supprime un fichier ou un répertoire temporaire s'il existe encore"""
+    if path is None:
+        return
+    if os.path.isdir(path):
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def _owner_alive(pid, token):
+    if pid == os.getpid():
+        return token == _PROCESS_TOKEN  # PID repris par ce processus
+    if _HAS_PROC:
+        start = _start_time(pid)
+        # Processus arrêté, ou PID repris par un processus démarré depuis
+        return start is not None and format(start, "x") == token
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Processus d'un autre utilisateur
+    return True
+
+
+def reap_stale(max_age=3600, root=None, keep=()):
+    """
+    Supprime les fichiers temporaires abandonnés
+
+    Un élément est supprimé si le processus qui l'a créé n'existe plus (ou,
+    sous Linux, si son PID appartient maintenant à un autre processus), ou
+    s'il n'a pas été modifié depuis `max_age` secondes.
+
+    Args:
+        root: Répertoire à nettoyer (par défaut scratch_root())
+        keep: Chemins à conserver même si leur processus est arrêté
+
+    Returns:
+        Nombre d'éléments supprimés
+    """
+    root = Path(root) if root else scratch_root()
+    if not root.is_dir():
+        return 0
+
+    keep = {Path(path).resolve() for path in keep}
+    removed = 0
+    now = time.time()
+    for entry in root.iterdir():
+        match = _NAME.match(entry.name)
+        if match is None or entry.resolve() in keep:
+            continue
+        try:
+            age = now - entry.stat().st_mtime
+        except FileNotFoundError:
+            continue  # Supprimé entre-temps par son propriétaire
+        if age > max_age or not _owner_alive(int(match.group(1)), match.group(2)):
+            remove(entry)
+            removed += 1
+    return removed
@@ -0,0 +1,59 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from audio import scratch
+
+
+def _touch(root, pid, token):
+    path = root / f"audio-{pid}-{token}-{os.urandom(4).hex()}.wav"
+    path.touch()
+    return path
+
+
+@pytest.fixture
+def dead_pid():
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+def test_own_files_are_kept(tmp_path):
+    path = tmp_path / scratch.owned_name("audio", ".wav")
+    path.touch()
+    assert scratch.reap_stale(root=tmp_path) == 0
+    assert path.exists()
+
+
+def test_files_of_a_stopped_process_are_removed(tmp_path, dead_pid):
+    path = _touch(tmp_path, dead_pid, "abcdef12")
+    assert scratch.reap_stale(root=tmp_path) == 1
+    assert not path.exists()
+
+
+@pytest.mark.skipif(not scratch._HAS_PROC, reason="start time needs /proc")
+def test_reused_pid_is_detected_from_another_process(tmp_path):
+    """A live PID whose start time differs from the name's token is a reused PID"""
+    other = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    try:
+        owner_token = format(scratch._start_time(other.pid), "x")
+        owned = _touch(tmp_path, other.pid, owner_token)
+        reused = _touch(tmp_path, other.pid, format(scratch._start_time(other.pid) - 1, "x"))
+
+        assert scratch.reap_stale(root=tmp_path) == 1
+        assert owned.exists() and not reused.exists()
+    finally:
+        other.kill()
+        other.wait()
+
+
+def test_keep_and_max_age(tmp_path, dead_pid):
+    kept = _touch(tmp_path, dead_pid, "abcdef12")
+    old = tmp_path / scratch.owned_name("audio")
+    old.touch()
+    os.utime(old, (0, 0))
+
+    assert scratch.reap_stale(root=tmp_path, keep=[kept]) == 1
+    assert kept.exists() and not old.exists()
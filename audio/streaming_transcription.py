@@ -0,0 +1,111 @@
+"""
+Transcription par fenêtres : les segments sont produits au fil du décodage
+
+Le signal est découpé en fenêtres de 30 s qui se chevauchent. Chaque fenêtre
+est transcrite séparément (le spectrogramme mel ne couvre qu'une fenêtre), puis
+les mots du chevauchement sont dédupliqués : un mot appartient à la fenêtre
+dont la zone conservée contient son milieu, la frontière étant placée au
+milieu du chevauchement.
+"""
+
+
+def window_bounds(n_samples, sr, window_seconds=30.0, overlap_seconds=2.0):
+    """
+    Fenêtres qui couvrent le signal
+
+    Returns:
+        Liste de (début, fin) en échantillons et de (début, fin) de la zone
+        conservée en secondes (la première et la dernière vont jusqu'au bord)
+    """
+    if overlap_seconds < 0 or overlap_seconds >= window_seconds:
+        raise ValueError("Le chevauchement doit être positif et plus court que la fenêtre")
+
+    window = int(window_seconds * sr)
+    step = window - int(overlap_seconds * sr)
+    starts = [0]
+    while starts[-1] + window < n_samples:
+        starts.append(starts[-1] + step)
+
+    bounds = []
+    for index, start in enumerate(starts):
+        end = min(start + window, n_samples)
+        keep_start = 0.0 if index == 0 else (start + starts[index - 1] + window) / 2 / sr
+        keep_end = float("inf") if index == len(starts) - 1 else (end + starts[index + 1]) / 2 / sr
+        bounds.append(((start, end), (keep_start, keep_end)))
+    return bounds
+
+
+def shift_segments(segments, offset, keep_start, keep_end):
+    """
+    Recale les segments d'une fenêtre sur le temps absolu et ne garde que les
+    mots de la zone conservée
+
+    Args:
+        segments: Segments Whisper de la fenêtre (temps relatifs à la fenêtre)
+        offset: Début de la fenêtre en secondes
+        keep_start, keep_end: Zone conservée en secondes absolues
+
+    Returns:
+        Segments (texte et bornes recalculés à partir des mots conservés)
+    """
+    kept = []
+    for segment in segments:
+        start, end = segment["start"] + offset, segment["end"] + offset
+        words = [
+            {**word, "start": round(word["start"] + offset, 2), "end": round(word["end"] + offset, 2)}
+            for word in segment.get("words") or []
+        ]
+
+        if not words:
+            # Pas d'horodatage par mot : le segment entier est gardé ou non
+            if keep_start <= (start + end) / 2 < keep_end:
+                kept.append({**segment, "start": round(start, 2), "end": round(end, 2)})
+            continue
+
+        words = [word for word in words if keep_start <= (word["start"] + word["end"]) / 2 < keep_end]
+        if words:
+            kept.append({
+                **segment,
+                "start": words[0]["start"],
+                "end": words[-1]["end"],
+                "text": "".join(word["word"] for word in words),
+                "words": words
+            })
+    return kept
+
+
+class IncrementalSpeechStats:
+    """Nombre de mots, débit et fillers mis à jour segment par segment"""
+
+    def __init__(self, filler_matchers, duration):
+        self.filler_matchers = filler_matchers
+        self.duration = duration
+        self.words = 0
+        self.fillers = 0
+        self.position = 0.0
+        self.language = None
+
+    def update(self, segment, language):
+        self.language = language
+        matcher = self.filler_matchers["en" if language == "en" else "fr"]
+        self.words += len(segment["text"].split())
+        self.fillers += len(matcher.find(segment["text"].lower()))
+        self.position = max(self.position, segment["end"])
+
+    def snapshot(self, position=None):
+        """
+        Args:
+            position: Temps déjà transcrit en secondes (sinon fin du dernier segment)
+        """
+        position = self.position if position is None else position
+        return {
+            "secondes_transcrites": round(position, 2),
+            "duree_secondes": round(self.duration, 2),
+            "nombre_mots": self.words,
+            "debit_mots_par_minute": round(self.words / (position / 60), 2) if position > 0 else 0,
+            "fillers": {
+                "nombre_total": self.fillers,
+                "pourcentage": round(self.fillers / self.words * 100, 2) if self.words else 0
+            },
+            "language": self.language
+        }
@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+
+from audio.streaming_transcription import shift_segments, window_bounds
+
+SR = 16000
+
+
+@pytest.mark.parametrize("duration", [0.5, 29.9, 30.0, 30.0 + 1 / SR, 31.0, 58.0, 59.0, 300.0])
+def test_windows_cover_the_signal_with_contiguous_kept_zones(duration):
+    n_samples = int(round(duration * SR))
+    bounds = window_bounds(n_samples, SR, window_seconds=30.0, overlap_seconds=2.0)
+
+    assert bounds[0][0][0] == 0 and bounds[-1][0][1] == n_samples
+    assert bounds[0][1][0] == 0.0 and bounds[-1][1][1] == float("inf")
+    for ((start, end), (keep_start, keep_end)), ((next_start, _), (next_keep_start, _)) in zip(bounds, bounds[1:]):
+        assert end - start == 30 * SR
+        assert next_start == start + 28 * SR  # Two seconds of overlap
+        # The boundary sits in the middle of the overlap, one second from each window edge
+        assert keep_end == next_keep_start == pytest.approx((next_start + end) / 2 / SR)
+
+
+def test_a_signal_of_exactly_one_window_is_not_split():
+    assert window_bounds(30 * SR, SR) == [((0, 30 * SR), (0.0, float("inf")))]
+    # One more sample: a second, almost empty, window whose kept zone starts in the overlap
+    (first, (_, first_keep_end)), (last, (last_keep_start, last_keep_end)) = window_bounds(30 * SR + 1, SR)
+    assert first == (0, 30 * SR) and last == (28 * SR, 30 * SR + 1)
+    assert first_keep_end == last_keep_start == pytest.approx(29.0)
+    assert last_keep_end == float("inf")
+
+
+def test_invalid_overlap():
+    for overlap in (-1.0, 30.0, 45.0):
+        with pytest.raises(ValueError):
+            window_bounds(60 * SR, SR, window_seconds=30.0, overlap_seconds=overlap)
+
+
+def simulated_words(rng, duration):
+    """Words of the whole recording, with absolute times"""
+    words, t = [], 0.0
+    while True:
+        t += rng.uniform(0.05, 0.6)
+        length = rng.uniform(0.1, 0.8)
+        if t + length > duration:
+            return words
+        words.append({"word": f" w{len(words)}", "start": round(t, 2), "end": round(t + length, 2)})
+        t += length
+
+
+def transcribe_window(words, start, end):
+    """What an engine returns for one window: the words it contains, relative to the window"""
+    inside = [{**word, "start": word["start"] - start, "end": word["end"] - start}
+              for word in words if start <= word["start"] and word["end"] <= end]
+    # Split in segments of about ten words
+    return [{"start": chunk[0]["start"], "end": chunk[-1]["end"], "text": "".join(w["word"] for w in chunk),
+             "words": chunk}
+            for chunk in (inside[i:i + 10] for i in range(0, len(inside), 10))]
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_overlap_words_are_kept_exactly_once_at_their_absolute_times(seed):
+    rng = np.random.default_rng(seed)
+    duration = float(rng.uniform(31, 200))
+    words = simulated_words(rng, duration)
+    n_samples = int(duration * SR)
+
+    kept = []
+    for (start, end), (keep_start, keep_end) in window_bounds(n_samples, SR, 30.0, 2.0):
+        segments = transcribe_window(words, start / SR, end / SR)
+        kept.extend(shift_segments(segments, start / SR, keep_start, keep_end))
+
+    kept_words = [word for segment in kept for word in segment["words"]]
+    assert [w["word"] for w in kept_words] == [w["word"] for w in words]
+    assert [(w["start"], w["end"]) for w in kept_words] == [(w["start"], w["end"]) for w in words]
+    # Segment text and bounds follow the kept words
+    for segment in kept:
+        assert segment["text"] == "".join(w["word"] for w in segment["words"])
+        assert (segment["start"], segment["end"]) == (segment["words"][0]["start"], segment["words"][-1]["end"])
+
+
+def test_shift_segments_without_word_timestamps_keeps_segments_by_their_middle():
+    segments = [
+        {"start": 0.0, "end": 1.0, "text": " avant"},
+        {"start": 1.5, "end": 2.9, "text": " frontière"},  # Middle 2.2 + 10 = 12.2: kept
+        {"start": 2.0, "end": 4.2, "text": " après"},      # Middle 3.1 + 10 = 13.1: next window
+    ]
+
+    kept = shift_segments(segments, offset=10.0, keep_start=11.0, keep_end=13.0)
+
+    assert kept == [{"start": 11.5, "end": 12.9, "text": " frontière"}]
+
+
+def test_shift_segments_drops_segments_with_no_kept_word():
+    segments = [{"start": 0.0, "end": 2.0, "text": " a b", "words": [
+        {"word": " a", "start": 0.0, "end": 0.5},
+        {"word": " b", "start": 1.4, "end": 2.0},
+    ]}]
+
+    assert shift_segments(segments, 28.0, 29.0, float("inf")) == [
+        {"start": 29.4, "end": 30.0, "text": " b", "words": [{"word": " b", "start": 29.4, "end": 30.0}]}
+    ]
+    assert shift_segments(segments, 28.0, 0.0, 28.2) == []
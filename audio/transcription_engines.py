@@ -0,0 +1,221 @@
+"""
+Moteurs de transcription interchangeables
+
+Tous respectent le contrat de whisper.transcribe(word_timestamps=True) :
+{"text", "segments", "language"}, chaque segment ayant "id", "start", "end",
+"text" et "words" ({"word", "start", "end", "probability"}, temps en secondes
+relatifs à l'audio reçu).
+
+- "whisper" : openai-whisper (PyTorch), le moteur d'origine
+- "faster-whisper" : Whisper sur CTranslate2, poids quantifiés int8 sur CPU
+- "fixture" : transcription lue dans un fichier JSON (tests, sans modèle)
+- "none" : aucune transcription (texte vide)
+"""
+import json
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+
+class TranscriptionEngine(ABC):
+    """Modèle chargé une seule fois, au premier appel (ou par load())"""
+
+    name = "base"
+    # Le moteur ne sait transcrire que l'enregistrement entier, en un seul appel
+    # (ses horodatages sont ceux de l'enregistrement d'origine)
+    single_call = False
+
+    def __init__(self, model_size="base"):
+        self.model_size = model_size
+        self._model = None
+        self._load_lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self._model is not None
+
+    def load(self):
+        """Charge le modèle une seule fois et le retourne"""
+        if self._model is None:
+            with self._load_lock:
+                if self._model is None:
+                    print(f" Chargement du moteur de transcription '{self.name}' ({self.model_size})...")
+                    self._model = self._load_model()
+                    print(" Modèle chargé\n")
+        return self._model
+
+    @abstractmethod
+    def _load_model(self):
+        """Modèle du moteur (appelé une seule fois par load())"""
+
+    @abstractmethod
+    def transcribe(self, audio, language=None, initial_prompt=None, condition_on_previous_text=True):
+        """
+        Args:
+            audio: Chemin d'un fichier audio ou signal float32 mono à 16 kHz
+            language: Langue imposée (None : détection automatique)
+            initial_prompt: Texte précédent, donné comme contexte au décodeur
+            condition_on_previous_text: Conditionner chaque fenêtre de 30 s sur la précédente
+
+        Returns:
+            dict {"text", "segments", "language"}
+        """
+
+    def describe(self):
+        """Informations affichées par /models"""
+        return {"engine": self.name, "model_size": self.model_size}
+
+
+class WhisperEngine(TranscriptionEngine):
+    name = "whisper"
+
+    def _load_model(self):
+        import whisper
+
+        return whisper.load_model(self.model_size)
+
+    def transcribe(self, audio, language=None, initial_prompt=None, condition_on_previous_text=True):
+        result = self.load().transcribe(
+            audio,
+            language=language,
+            word_timestamps=True,
+            initial_prompt=initial_prompt,
+            condition_on_previous_text=condition_on_previous_text
+        )
+        return {"text": result["text"], "segments": result["segments"], "language": result.get("language")}
+
+    def describe(self):
+        info = super().describe()
+        if self.loaded:
+            info["parameters"] = int(sum(p.numel() for p in self._model.parameters()))
+        return info
+
+
+class FasterWhisperEngine(TranscriptionEngine):
+    """
+    Whisper converti pour CTranslate2 : sur CPU, les poids int8 réduisent la
+    mémoire et le temps de décodage par rapport à openai-whisper en float32
+    """
+
+    name = "faster-whisper"
+
+    def __init__(self, model_size="base", compute_type="int8", device="cpu", cpu_threads=0):
+        super().__init__(model_size)
+        self.compute_type = compute_type
+        self.device = device
+        self.cpu_threads = cpu_threads
+
+    def _load_model(self):
+        from faster_whisper import WhisperModel
+
+        return WhisperModel(self.model_size, device=self.device, compute_type=self.compute_type,
+                            cpu_threads=self.cpu_threads)
+
+    def transcribe(self, audio, language=None, initial_prompt=None, condition_on_previous_text=True):
+        segments, info = self.load().transcribe(
+            audio,
+            language=language,
+            word_timestamps=True,
+            initial_prompt=initial_prompt,
+            condition_on_previous_text=condition_on_previous_text
+        )
+
+        # Les segments sont produits à la demande : la liste termine le décodage
+        converted = [
+            {
+                "id": segment.id,
+                "start": segment.start,
+                "end": segment.end,
+                "text": segment.text,
+                "words": [
+                    {"word": word.word, "start": round(word.start, 2), "end": round(word.end, 2),
+                     "probability": word.probability}
+                    for word in segment.words or []
+                ],
+                "avg_logprob": segment.avg_logprob,
+                "no_speech_prob": segment.no_speech_prob
+            }
+            for segment in segments
+        ]
+        return {"text": "".join(segment["text"] for segment in converted), "segments": converted,
+                "language": info.language}
+
+    def describe(self):
+        return {**super().describe(), "compute_type": self.compute_type, "device": self.device}
+
+
+class FixtureEngine(TranscriptionEngine):
+    """
+    Rejoue une transcription enregistrée (format de whisper.transcribe)
+
+    Seuls les mots dont le milieu tombe dans la durée de l'audio reçu sont
+    rendus. Les horodatages enregistrés sont ceux de l'enregistrement entier :
+    AudioExtractor transcrit alors en un seul appel, sans fenêtres ni retrait
+    des silences (single_call).
+    """
+
+    name = "fixture"
+    single_call = True
+
+    def __init__(self, path):
+        super().__init__(model_size=Path(path).name)
+        self.path = path
+
+    def _load_model(self):
+        with open(self.path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def transcribe(self, audio, language=None, initial_prompt=None, condition_on_previous_text=True):
+        fixture = self.load()
+        duration = len(audio) / 16000 if not isinstance(audio, str) else float("inf")
+
+        segments = []
+        for segment in fixture["segments"]:
+            words = [word for word in segment.get("words") or [] if (word["start"] + word["end"]) / 2 < duration]
+            if words:
+                segments.append({**segment, "id": len(segments), "words": words,
+                                 "text": "".join(word["word"] for word in words),
+                                 "end": min(segment["end"], words[-1]["end"])})
+        return {"text": "".join(segment["text"] for segment in segments), "segments": segments,
+                "language": language or fixture.get("language")}
+
+    def describe(self):
+        return {"engine": self.name, "path": str(self.path)}
+
+
+class NullEngine(TranscriptionEngine):
+    """Aucune transcription : pour mesurer ou tester le reste du pipeline"""
+
+    name = "none"
+
+    def _load_model(self):
+        return True
+
+    def transcribe(self, audio, language=None, initial_prompt=None, condition_on_previous_text=True):
+        return {"text": "", "segments": [], "language": language}
+
+
+ENGINES = {
+    "whisper": WhisperEngine,
+    "faster-whisper": FasterWhisperEngine,
+    "fixture": FixtureEngine,
+    "none": NullEngine,
+}
+
+
+def create_engine(name, model_size="base", **options):
+    """
+    Args:
+        name: "whisper", "faster-whisper", "fixture" ou "none"
+        model_size: Taille du modèle Whisper (ignorée par fixture / none)
+        options: compute_type, device, cpu_threads (faster-whisper), path (fixture)
+    """
+    if name not in ENGINES:
+        raise ValueError(f"Moteur de transcription inconnu : {name} (attendu : {', '.join(ENGINES)})")
+    if name == "fixture":
+        if not options.get("path"):
+            raise ValueError("Le moteur 'fixture' demande le chemin d'une transcription JSON (path)")
+        return FixtureEngine(options["path"])
+    if name == "faster-whisper":
+        return FasterWhisperEngine(model_size, **options)
+    return ENGINES[name](model_size)
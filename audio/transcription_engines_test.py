@@ -0,0 +1,76 @@
+import json
+
+import numpy as np
+import pytest
+
+from audio.audio_decoding import SAMPLE_RATE
+from audio.audio_extraction import AudioExtractor
+
+N_WORDS = 70
+
+
+@pytest.fixture
+def fixture_path(tmp_path):
+    """Transcription of 70 distinct words, one per second, in segments of 10 words"""
+    segments = []
+    for first in range(0, N_WORDS, 10):
+        words = [{"word": f" w{i}", "start": i + 0.1, "end": i + 0.6, "probability": 1.0}
+                 for i in range(first, first + 10)]
+        segments.append({"id": len(segments), "start": words[0]["start"], "end": words[-1]["end"],
+                         "text": "".join(word["word"] for word in words), "words": words})
+    path = tmp_path / "transcription.json"
+    path.write_text(json.dumps({"text": "".join(s["text"] for s in segments), "segments": segments,
+                                "language": "fr"}))
+    return path
+
+
+@pytest.fixture
+def signal():
+    """70 s of speech-like noise with a 4 s silence (cut by skip_silence with other engines)"""
+    rng = np.random.default_rng(0)
+    y = (0.1 * rng.standard_normal(N_WORDS * SAMPLE_RATE)).astype(np.float32)
+    y[30 * SAMPLE_RATE:34 * SAMPLE_RATE] = 0
+    return y
+
+
+def words_of(segments):
+    return [word["word"].strip() for segment in segments for word in segment["words"]]
+
+
+def test_fixture_engine_forces_single_call(fixture_path):
+    extractor = AudioExtractor(engine="fixture", engine_options={"path": str(fixture_path)},
+                               transcription_window_seconds=30, skip_silence=True)
+
+    assert extractor.transcription_window_seconds is None
+    assert extractor.skip_silence is False
+
+
+def test_fixture_engine_replays_each_word_once(fixture_path, signal):
+    extractor = AudioExtractor(engine="fixture", engine_options={"path": str(fixture_path)},
+                               transcription_window_seconds=30, skip_silence=True)
+
+    result = extractor.extract_all_metrics("fixture.wav", audio=signal)
+
+    words = words_of(result["segments"])
+    assert words == [f"w{i}" for i in range(N_WORDS)]
+
+
+def test_fixture_engine_stream_is_one_window(fixture_path, signal):
+    extractor = AudioExtractor(engine="fixture", engine_options={"path": str(fixture_path)})
+
+    windows = list(extractor.transcribe_stream(signal, window_seconds=30,
+                                               speech_regions=[{"debut": 0.0, "fin": 30.0}]))
+
+    assert len(windows) == 1
+    assert words_of(windows[0][0]) == [f"w{i}" for i in range(N_WORDS)]
+
+
+def test_incomplete_engine_fails_when_created():
+    from audio.transcription_engines import TranscriptionEngine
+
+    class NoTranscribe(TranscriptionEngine):
+        def _load_model(self):
+            return True
+
+    with pytest.raises(TypeError):
+        NoTranscribe()
@@ -0,0 +1,68 @@
+"""
+Transcription des seules zones de parole
+
+Les zones de parole (audio_features.speech_regions, calculées sur l'enveloppe
+RMS déjà utilisée pour les pauses) sont mises bout à bout avant Whisper : les
+longs silences du début, de la fin et entre deux prises ne sont pas décodés.
+Les horodatages du signal compacté sont ensuite ramenés au temps d'origine.
+"""
+import numpy as np
+
+
+class SpeechTimeMap:
+    """Correspondance entre le temps du signal compacté et le temps d'origine"""
+
+    def __init__(self, regions, sr, n_samples):
+        """
+        Args:
+            regions: Zones {"debut", "fin"} en secondes, triées et disjointes
+            sr: Fréquence d'échantillonnage
+            n_samples: Longueur du signal d'origine
+        """
+        self.sr = sr
+        bounds = [(min(int(region["debut"] * sr), n_samples), min(int(region["fin"] * sr), n_samples))
+                  for region in regions]
+        self.bounds = [(start, end) for start, end in bounds if end > start]
+
+        lengths = np.array([end - start for start, end in self.bounds], dtype=np.int64)
+        self.original_starts = np.array([start for start, _ in self.bounds], dtype=np.float64) / sr
+        self.compact_starts = np.concatenate([[0], np.cumsum(lengths)[:-1]]).astype(np.float64) / sr \
+            if len(lengths) else np.zeros(0)
+        self.speech_seconds = float(lengths.sum()) / sr
+
+    def compact(self, y):
+        """Signal réduit aux zones de parole"""
+        if not self.bounds:
+            return y[:0]
+        return np.concatenate([y[start:end] for start, end in self.bounds])
+
+    def to_original(self, t, end=False):
+        """
+        Temps d'origine d'un instant du signal compacté
+
+        Args:
+            end: Instant de fin (un mot qui finit à la jonction de deux zones
+                reste dans la première)
+        """
+        if not self.bounds:
+            return t
+        index = np.searchsorted(self.compact_starts, t, side="left" if end else "right") - 1
+        index = max(int(index), 0)
+        return float(self.original_starts[index] + (t - self.compact_starts[index]))
+
+    def remap_segments(self, segments):
+        """Segments Whisper (et leurs mots) ramenés au temps d'origine"""
+        remapped = []
+        for segment in segments:
+            words = [
+                {**word, "start": round(self.to_original(word["start"]), 2),
+                 "end": round(self.to_original(word["end"], end=True), 2)}
+                for word in segment.get("words") or []
+            ]
+            remapped.append({
+                **segment,
+                "start": round(self.to_original(segment["start"]), 2),
+                "end": round(self.to_original(segment["end"], end=True), 2),
+                **({"words": words} if "words" in segment else {})
+            })
+        return remapped
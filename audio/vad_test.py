@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from audio.vad import SpeechTimeMap
+
+SR = 100
+
+# Speech from 1 s to 3 s, 5 s to 5.5 s and 8 s to the end (the last region overruns the 10 s signal)
+REGIONS = [{"debut": 1.0, "fin": 3.0}, {"debut": 5.0, "fin": 5.5}, {"debut": 8.0, "fin": 12.0}]
+N_SAMPLES = 10 * SR
+
+
+@pytest.fixture
+def time_map():
+    return SpeechTimeMap(REGIONS, SR, N_SAMPLES)
+
+
+def test_compact_keeps_only_the_speech_samples(time_map):
+    # Each sample holds its own index in the original signal
+    compacted = time_map.compact(np.arange(N_SAMPLES))
+
+    assert time_map.speech_seconds == 4.5
+    assert len(compacted) == 450
+    assert compacted[0] == 100 and compacted[199] == 299 and compacted[200] == 500 and compacted[-1] == 999
+
+
+def test_every_compacted_instant_maps_back_to_its_original_sample(time_map):
+    compacted = time_map.compact(np.arange(N_SAMPLES))
+
+    for k, original in enumerate(compacted):
+        assert time_map.to_original(k / SR) == pytest.approx(original / SR)
+    # Inside a region, starts and ends give the same time
+    assert time_map.to_original(2.55, end=True) == pytest.approx(time_map.to_original(2.55)) == pytest.approx(8.05)
+
+
+def test_junctions_between_regions(time_map):
+    # 2 s in the compacted signal is where the silence from 3 s to 5 s was removed
+    assert time_map.to_original(2.0) == 5.0                       # A word starting there: after the silence
+    assert time_map.to_original(2.0, end=True) == 3.0             # A word ending there: before it
+    assert time_map.to_original(2.5) == 8.0
+    assert time_map.to_original(2.5, end=True) == 5.5
+    # Edges of the compacted signal: the silences before the first and after the last region
+    assert time_map.to_original(0.0) == time_map.to_original(0.0, end=True) == 1.0
+    assert time_map.to_original(4.5, end=True) == 10.0
+
+
+def test_remap_segments_on_a_removed_silence(time_map):
+    segments = [{"start": 1.6, "end": 2.5, "text": " deux mots", "words": [
+        {"word": " deux", "start": 1.6, "end": 2.0},
+        {"word": " mots", "start": 2.0, "end": 2.5},
+    ]}, {"start": 2.5, "end": 3.0, "text": " fin"}]
+
+    assert time_map.remap_segments(segments) == [
+        {"start": 2.6, "end": 5.5, "text": " deux mots", "words": [
+            {"word": " deux", "start": 2.6, "end": 3.0},
+            {"word": " mots", "start": 5.0, "end": 5.5},
+        ]},
+        {"start": 8.0, "end": 8.5, "text": " fin"},
+    ]
+
+
+def test_regions_are_clipped_to_the_signal():
+    time_map = SpeechTimeMap([{"debut": 0.5, "fin": 0.5}, {"debut": 9.0, "fin": 20.0},
+                              {"debut": 11.0, "fin": 12.0}], SR, N_SAMPLES)
+
+    assert time_map.bounds == [(900, 1000)]
+    assert time_map.to_original(0.25) == 9.25
+
+
+def test_no_speech():
+    time_map = SpeechTimeMap([], SR, N_SAMPLES)
+
+    assert len(time_map.compact(np.zeros(N_SAMPLES))) == 0
+    assert time_map.speech_seconds == 0
+    assert time_map.to_original(1.5) == 1.5
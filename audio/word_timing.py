@@ -0,0 +1,157 @@
+"""
+Métriques temporelles calculées sur l'horodatage par mot de la transcription
+
+Les débuts et fins de mots donnés par Whisper (segments[i]["words"]) suffisent
+pour mesurer le débit en excluant les silences (débit d'articulation), son
+évolution au fil de la présentation et les pauses entre les mots, sans
+nouvelle analyse du signal.
+"""
+import numpy as np
+
+# Bornes (secondes) des classes de durée de pauses
+PAUSE_BINS = (0.5, 1.0, 2.0, 4.0)
+
+
+def word_times(segments):
+    """
+    Returns:
+        (débuts, fins) des mots horodatés en np.ndarray, triés par début
+    """
+    starts, ends = [], []
+    for segment in segments or []:
+        for word in segment.get("words") or []:
+            if word["word"].strip():
+                starts.append(word["start"])
+                ends.append(word["end"])
+    starts, ends = np.array(starts, dtype=np.float64), np.array(ends, dtype=np.float64)
+    order = np.argsort(starts, kind="stable")
+    return starts[order], np.maximum(ends[order], starts[order])
+
+
+def word_gaps(starts, ends, duration=None, include_edges=False):
+    """
+    Silences entre deux mots consécutifs
+
+    Le silence avant le premier mot et après le dernier n'est pas une pause du
+    discours (début d'enregistrement, fin de la vidéo) : il n'est compté que
+    sur demande.
+
+    Args:
+        include_edges: Ajouter le silence avant le premier mot et, si la durée
+            totale est connue, après le dernier
+
+    Returns:
+        (débuts, durées) des silences en np.ndarray
+    """
+    if len(starts) == 0:
+        return np.zeros(0), np.zeros(0)
+
+    # Fin de parole atteinte jusqu'ici (un mot peut chevaucher le suivant)
+    spoken_until = np.maximum.accumulate(ends)
+    gap_starts, gap_ends = spoken_until[:-1], starts[1:]
+    if include_edges:
+        gap_starts = np.concatenate([[0.0], gap_starts, spoken_until[-1:]])
+        gap_ends = np.concatenate([starts[:1], gap_ends, [duration if duration is not None else spoken_until[-1]]])
+    # Un mot qui commence avant la fin du précédent ne laisse aucun silence
+    durations = np.maximum(gap_ends - gap_starts, 0.0)
+    return gap_starts, durations
+
+
+def word_pauses(starts, ends, duration=None, min_duration=0.5, include_edges=False):
+    """
+    Pauses entre les mots, au format des pauses de l'analyse RMS
+
+    Args:
+        include_edges: Compter aussi les silences avant le premier et après le
+            dernier mot (voir word_gaps)
+
+    Returns:
+        Liste de pauses {"timestamp", "duree"} en secondes
+    """
+    gap_starts, durations = word_gaps(starts, ends, duration, include_edges)
+    keep = durations >= min_duration
+    return [
+        {"timestamp": round(float(start), 2), "duree": round(float(length), 2)}
+        for start, length in zip(gap_starts[keep], durations[keep])
+    ]
+
+
+def pause_distribution(durations):
+    """Statistiques et classes de durée des pauses"""
+    durations = np.asarray(durations, dtype=np.float64)
+    edges = np.array(PAUSE_BINS + (np.inf,))
+    counts = np.histogram(durations, bins=edges)[0] if len(durations) else np.zeros(len(PAUSE_BINS), dtype=int)
+    labels = [f"{low:g}-{high:g}s" for low, high in zip(PAUSE_BINS, PAUSE_BINS[1:])] + [f">{PAUSE_BINS[-1]:g}s"]
+
+    if len(durations) == 0:
+        return {"moyenne": 0, "mediane": 0, "p90": 0, "max": 0, "classes": dict.fromkeys(labels, 0)}
+    return {
+        "moyenne": round(float(durations.mean()), 2),
+        "mediane": round(float(np.median(durations)), 2),
+        "p90": round(float(np.percentile(durations, 90)), 2),
+        "max": round(float(durations.max()), 2),
+        "classes": {label: int(count) for label, count in zip(labels, counts)}
+    }
+
+
+def windowed_rate(starts, ends, duration, window=30.0, step=10.0):
+    """
+    Débit (mots/minute) sur des fenêtres glissantes
+
+    Un mot est compté dans une fenêtre si son milieu y tombe ; la dernière
+    fenêtre est raccourcie à la fin de l'enregistrement.
+
+    Returns:
+        Liste de fenêtres {"debut", "fin", "mots", "mots_par_minute"}
+    """
+    if duration <= 0:
+        return []
+    middles = np.sort((starts + ends) / 2)
+    window_starts = np.arange(0.0, max(duration - window, 0.0) + step, step)
+    window_starts = window_starts[window_starts < duration]
+    window_ends = np.minimum(window_starts + window, duration)
+    counts = np.searchsorted(middles, window_ends, side="left") - np.searchsorted(middles, window_starts, side="left")
+    lengths = window_ends - window_starts
+    return [
+        {"debut": round(float(start), 2), "fin": round(float(end), 2), "mots": int(count),
+         "mots_par_minute": round(float(count / (length / 60)), 2)}
+        for start, end, count, length in zip(window_starts, window_ends, counts, lengths)
+    ]
+
+
+def timing_metrics(segments, duration, min_pause=0.5, window=30.0, step=10.0):
+    """
+    Débit d'articulation, débit par fenêtre et pauses entre les mots
+
+    Args:
+        segments: Segments avec horodatage par mot
+        duration: Durée totale de l'enregistrement (secondes)
+        min_pause: Durée minimale d'une pause (secondes), comme l'analyse RMS
+        window, step: Taille et pas des fenêtres de débit (secondes)
+
+    Returns:
+        dict de métriques, ou None si les segments n'ont pas d'horodatage par mot
+    """
+    starts, ends = word_times(segments)
+    if len(starts) == 0:
+        return None
+
+    # Pauses du discours seulement : les silences des bords ne sont pas notés comme des pauses
+    pauses = word_pauses(starts, ends, duration, min_pause)
+    pause_seconds = sum(pause["duree"] for pause in pauses)
+    silence_before = float(starts[0])
+    silence_after = max(duration - float(ends.max()), 0.0)
+    # Temps de parole : du premier au dernier mot, sans les pauses (les micro-silences entre mots restent)
+    speaking_time = max(duration - silence_before - silence_after - pause_seconds, 0.0)
+
+    return {
+        "nombre_mots": int(len(starts)),
+        "temps_parole": round(speaking_time, 2),
+        "debit_articulation": round(len(starts) / (speaking_time / 60), 2) if speaking_time > 0 else 0,
+        "debit_par_fenetre": windowed_rate(starts, ends, duration, window, step),
+        "pauses": pauses,
+        "nombre_pauses": len(pauses),
+        "silence_debut": round(silence_before, 2),
+        "silence_fin": round(silence_after, 2),
+        "distribution_pauses": pause_distribution([pause["duree"] for pause in pauses])
+    }
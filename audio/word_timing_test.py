@@ -0,0 +1,127 @@
+import numpy as np
+import pytest
+
+from audio.audio_scoring import AudioScorer
+from audio.word_timing import timing_metrics, windowed_rate, word_gaps, word_pauses, word_times
+
+
+def segments_of(*words):
+    return [{"words": [{"word": f" w{i}", "start": start, "end": end} for i, (start, end) in enumerate(words)]}]
+
+
+def test_word_times_sorts_words_and_skips_blank_ones():
+    segments = [
+        {"words": [{"word": " b", "start": 2.0, "end": 2.5}, {"word": " ", "start": 2.5, "end": 2.6}]},
+        {"words": [{"word": " a", "start": 1.0, "end": 0.9}]},  # End before start: clamped
+        {"text": " sans mots"},
+    ]
+
+    starts, ends = word_times(segments)
+
+    assert starts.tolist() == [1.0, 2.0] and ends.tolist() == [1.0, 2.5]
+    assert [len(array) for array in word_times(None)] == [0, 0]
+
+
+def test_gaps_are_between_words_unless_edges_are_asked_for():
+    starts, ends = word_times(segments_of((2.0, 2.5), (3.5, 4.0), (4.1, 5.0)))
+
+    gap_starts, durations = word_gaps(starts, ends, duration=8.0)
+    assert gap_starts.tolist() == [2.5, 4.0]
+    np.testing.assert_allclose(durations, [1.0, 0.1])
+
+    gap_starts, durations = word_gaps(starts, ends, duration=8.0, include_edges=True)
+    assert gap_starts.tolist() == [0.0, 2.5, 4.0, 5.0]
+    np.testing.assert_allclose(durations, [2.0, 1.0, 0.1, 3.0])
+    # Unknown duration: no silence after the last word
+    assert word_gaps(starts, ends, include_edges=True)[1][-1] == 0.0
+
+
+def test_overlapping_words_leave_no_gap():
+    # The second word starts inside the first one, the third one inside the first one too
+    starts, ends = word_times(segments_of((0.0, 3.0), (1.0, 1.5), (2.0, 2.5), (4.0, 4.5)))
+
+    gap_starts, durations = word_gaps(starts, ends)
+
+    # Silence measured from the end of the longest word so far
+    assert gap_starts.tolist() == [3.0, 3.0, 3.0]
+    assert durations.tolist() == [0.0, 0.0, 1.0]
+    assert word_pauses(starts, ends) == [{"timestamp": 3.0, "duree": 1.0}]
+
+
+def test_empty_input():
+    empty = np.zeros(0)
+
+    assert [len(array) for array in word_gaps(empty, empty, 10.0, include_edges=True)] == [0, 0]
+    assert word_pauses(empty, empty, 10.0, include_edges=True) == []
+    assert timing_metrics([], 10.0) is None
+    assert timing_metrics([{"text": " pas d'horodatage"}], 10.0) is None
+    assert windowed_rate(empty, empty, 0.0) == []
+
+
+def test_min_duration_is_inclusive():
+    starts, ends = word_times(segments_of((0.0, 1.0), (1.5, 2.0), (2.49, 3.0), (3.7, 4.0)))
+
+    assert word_pauses(starts, ends, min_duration=0.5) == [
+        {"timestamp": 1.0, "duree": 0.5}, {"timestamp": 3.0, "duree": 0.7}
+    ]
+    assert word_pauses(starts, ends, min_duration=0.6) == [{"timestamp": 3.0, "duree": 0.7}]
+    assert len(word_pauses(starts, ends, min_duration=0.0)) == 3
+
+
+def test_windowed_rate_counts_words_by_their_middle():
+    # One word per second, the last window is cut at the end of the recording
+    starts = np.arange(0.0, 65.0)
+    ends = starts + 0.4
+
+    windows = windowed_rate(starts, ends, duration=65.0, window=30.0, step=10.0)
+
+    assert [(w["debut"], w["fin"]) for w in windows] == [(0.0, 30.0), (10.0, 40.0), (20.0, 50.0),
+                                                        (30.0, 60.0), (40.0, 65.0)]
+    assert [w["mots"] for w in windows] == [30, 30, 30, 30, 25]
+    assert all(w["mots_par_minute"] == 60.0 for w in windows)
+    # A word whose middle is on a window end belongs to the next window
+    assert windowed_rate(np.array([9.8]), np.array([10.2]), 20.0, window=10.0, step=10.0)[1]["mots"] == 1
+
+
+def test_shorter_recording_than_the_window():
+    windows = windowed_rate(np.array([1.0, 2.0]), np.array([1.5, 2.5]), duration=12.0)
+
+    assert windows == [{"debut": 0.0, "fin": 12.0, "mots": 2, "mots_par_minute": 10.0}]
+
+
+def test_edge_silences_do_not_change_the_pause_score():
+    # 20 s of silence before the talk and about 30 s after it, the same talk in both recordings
+    talk = [(start, start + 0.4) for start in np.arange(0.0, 60.0, 0.5)]
+    talk[40:42] = []  # One pause of 1.1 s in the middle of the talk
+    padded = [(start + 20.0, end + 20.0) for start, end in talk]
+
+    plain_timing = timing_metrics(segments_of(*talk), duration=60.0)
+    padded_timing = timing_metrics(segments_of(*padded), duration=110.0)
+
+    assert padded_timing["pauses"] == [{"timestamp": pause["timestamp"] + 20.0, "duree": pause["duree"]}
+                                       for pause in plain_timing["pauses"]]
+    assert (padded_timing["silence_debut"], padded_timing["silence_fin"]) == (20.0, 30.1)
+    assert padded_timing["temps_parole"] == plain_timing["temps_parole"]
+    assert padded_timing["debit_articulation"] == plain_timing["debit_articulation"]
+
+    scorer = AudioScorer()
+    # Same pauses as the talk alone, so the same pause score
+    assert scorer.score_pauses(padded_timing["pauses"], 60.0) == scorer.score_pauses(plain_timing["pauses"], 60.0)
+    edges = word_pauses(*word_times(segments_of(*padded)), duration=110.0, include_edges=True)
+    assert [pause["duree"] for pause in edges] == [20.0, 1.1, 30.1]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_gaps_and_words_cover_the_recording(seed):
+    rng = np.random.default_rng(seed)
+    starts = np.sort(rng.uniform(1, 50, size=40))
+    ends = starts + rng.uniform(0.05, 0.6, size=40)
+
+    _, durations = word_gaps(starts, ends, duration=60.0, include_edges=True)
+    # Union of the words plus every silence: the whole recording
+    merged, spoken = 0.0, 0.0
+    for start, end in zip(starts, ends):
+        spoken += max(end - max(start, merged), 0.0)
+        merged = max(merged, end)
+
+    assert spoken + durations.sum() == pytest.approx(60.0)
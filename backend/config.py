@@ -0,0 +1,85 @@
+"""
+Backend configuration, read once from the environment (or a `.env` file).
+"""
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+# Models
+WHISPER_MODEL_SIZE = os.getenv("WHISPER_MODEL_SIZE", "base")
+# Transcription backend: whisper | faster-whisper (CTranslate2) | fixture (JSON transcript) | none
+TRANSCRIPTION_ENGINE = os.getenv("TRANSCRIPTION_ENGINE", "whisper")
+TRANSCRIPTION_COMPUTE_TYPE = os.getenv("TRANSCRIPTION_COMPUTE_TYPE", "int8")  # faster-whisper weights
+TRANSCRIPTION_CPU_THREADS = _env_int("TRANSCRIPTION_CPU_THREADS", 0)  # faster-whisper, 0 = library default
+TRANSCRIPTION_FIXTURE_PATH = os.getenv("TRANSCRIPTION_FIXTURE_PATH", "")
+PITCH_METHOD = os.getenv("PITCH_METHOD", "piptrack")  # piptrack | yin (faster)
+# Audio features computed by blocks of this many seconds (0 = whole signal at once)
+AUDIO_STREAM_BLOCK_SECONDS = _env_int("AUDIO_STREAM_BLOCK_SECONDS", 30)
+# Transcription by windows of this many seconds, segments are available as each
+# window is decoded (0 = whole file in one Whisper call)
+TRANSCRIPTION_WINDOW_SECONDS = _env_int("TRANSCRIPTION_WINDOW_SECONDS", 30)
+TRANSCRIPTION_OVERLAP_SECONDS = float(os.getenv("TRANSCRIPTION_OVERLAP_SECONDS", "2"))
+# Only the speech regions found on the RMS envelope are given to Whisper
+TRANSCRIPTION_SKIP_SILENCE = _env_bool("TRANSCRIPTION_SKIP_SILENCE", True)
+# Pauses measured between the timestamped words (words) or on the RMS envelope (rms)
+PAUSE_SOURCE = os.getenv("PAUSE_SOURCE", "words")
+# Timeline: rolling metrics over windows of this many seconds; the step grows so
+# that long videos give at most TIMELINE_MAX_WINDOWS windows
+TIMELINE_WINDOW_SECONDS = float(os.getenv("TIMELINE_WINDOW_SECONDS", "10"))
+TIMELINE_STEP_SECONDS = float(os.getenv("TIMELINE_STEP_SECONDS", "5"))
+TIMELINE_MAX_WINDOWS = max(2, _env_int("TIMELINE_MAX_WINDOWS", 120))
+TIMELINE_MAX_EVENTS = max(1, _env_int("TIMELINE_MAX_EVENTS", 20))
+POSE_LANDMARKER_POOL_SIZE = max(1, _env_int("POSE_LANDMARKER_POOL_SIZE", 1))
+MODEL_WARMUP = _env_bool("MODEL_WARMUP", True)
+
+# Execution
+# Worker threads shared by the blocking analysis stages (vision, audio, feedback)
+ANALYSIS_MAX_WORKERS = max(2, _env_int("ANALYSIS_MAX_WORKERS", 4))
+# threads: vision and audio run in this process; processes: in a pool of worker
+# processes, each pinned to a slice of cores with its own resident models
+ANALYSIS_BACKEND = os.getenv("ANALYSIS_BACKEND", "threads")
+PROCESS_WORKERS = _env_int("PROCESS_WORKERS", 0)  # 0 = one per core slice
+PROCESS_CORES_PER_WORKER = max(1, _env_int("PROCESS_CORES_PER_WORKER", 1))
+PROCESS_MAX_TASKS_PER_CHILD = _env_int("PROCESS_MAX_TASKS_PER_CHILD", 20)  # 0 = never recycled
+
+# Background jobs
+JOB_QUEUE_BACKEND = os.getenv("JOB_QUEUE_BACKEND", "memory")  # memory | sqlite
+JOB_QUEUE_PATH = os.getenv("JOB_QUEUE_PATH", "data/jobs.sqlite3")
+JOB_WORKERS = max(1, _env_int("JOB_WORKERS", 2))
+JOB_QUEUE_MAX_SIZE = max(1, _env_int("JOB_QUEUE_MAX_SIZE", 16))
+JOB_RESULT_TTL_SECONDS = _env_int("JOB_RESULT_TTL_SECONDS", 3600)
+
+# Vision frame sampling
+VISION_SAMPLING = os.getenv("VISION_SAMPLING", "all")  # all | every_n | target_fps | uniform
+VISION_MAX_FRAMES = _env_int("VISION_MAX_FRAMES", 900)
+VISION_FRAME_STEP = max(1, _env_int("VISION_FRAME_STEP", 1))
+VISION_TARGET_FPS = float(os.getenv("VISION_TARGET_FPS", "10"))
+VISION_MAX_LONG_EDGE = _env_int("VISION_MAX_LONG_EDGE", 0)  # 0 = full resolution
+
+# Result cache (per-stage artifacts keyed by video hash and pipeline version)
+RESULT_CACHE_ENABLED = _env_bool("RESULT_CACHE_ENABLED", True)
+RESULT_CACHE_DIR = os.getenv("RESULT_CACHE_DIR", "data/cache")
+RESULT_CACHE_MAX_MB = _env_int("RESULT_CACHE_MAX_MB", 512)
+
+# Uploads
+UPLOAD_MAX_BYTES = _env_int("UPLOAD_MAX_MB", 500) * 1024 * 1024
+# Copy chunk size, rounded to whole 64 KiB blocks
+UPLOAD_CHUNK_SIZE = max(1, _env_int("UPLOAD_CHUNK_KB", 1024) // 64) * 64 * 1024
+UPLOAD_REQUIRE_AUDIO = _env_bool("UPLOAD_REQUIRE_AUDIO", True)
+# Uploads and scratch files of a stopped process are removed at startup and on
+# job submission; files untouched for this long are removed in any case
+STALE_FILE_MAX_AGE_SECONDS = _env_int("STALE_FILE_MAX_AGE_SECONDS", 6 * 3600)
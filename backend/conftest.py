@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+# Same imports as main.py: backend modules (services, utils...) and the repository root (audio, scoring...)
+BACKEND_DIR = Path(__file__).parent
+sys.path[:0] = [str(BACKEND_DIR), str(BACKEND_DIR.parent)]
@@ -2,14 +2,43 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
+from feedback import feedback_generator
+from config import ANALYSIS_BACKEND, MODEL_WARMUP, UPLOAD_MAX_BYTES
 from routers.analyze import router as analyze_router
+from routers.jobs import router as jobs_router
+from services import executor, model_registry, process_pool
+from services.result_cache import get_result_cache
+from utils.instrumentation import render_prometheus
+from services.job_service import get_job_manager
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load Whisper and the PoseLandmarker once, before serving requests
+    # (in each worker process instead of this one with ANALYSIS_BACKEND=processes)
+    if ANALYSIS_BACKEND == "processes":
+        process_pool.start()
+    else:
+        model_registry.warm_up(run_inference=MODEL_WARMUP)
+    get_job_manager().start()
+    yield
+    get_job_manager().stop()
+    executor.shutdown()
+    process_pool.shutdown()
+    if feedback_generator.feedback_client is not None:
+        feedback_generator.feedback_client.close()
+    model_registry.close()
+
 
 app = FastAPI(
     title="AI Public Speaking Coach API",
     description="Backend API for analyzing public speaking videos",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -21,13 +50,47 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Multipart boundaries and part headers around the uploaded file
+MULTIPART_OVERHEAD = 64 * 1024
+
+@app.middleware("http")
+async def limit_upload_size(request: Request, call_next):
+    """Refuse oversized uploads from their Content-Length, before the body is received"""
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > UPLOAD_MAX_BYTES + MULTIPART_OVERHEAD:
+        return JSONResponse(status_code=413, content={
+            "detail": f"Video larger than {UPLOAD_MAX_BYTES // (1024 * 1024)} MB"
+        })
+    return await call_next(request)
+
 # Include routers
 app.include_router(analyze_router)
+app.include_router(jobs_router)
 
 @app.get("/")
 async def root():
     return {"message": "AI Public Speaking Coach API"}
 
+@app.get("/models")
+async def models_stats():
+    """Load times, usage counters and memory of the shared models"""
+    if ANALYSIS_BACKEND == "processes":
+        return process_pool.get_stats()
+    return model_registry.get_stats()
+
+@app.get("/cache")
+async def cache_stats():
+    """Size and per-stage hit/miss counters of the result cache and of the feedback client"""
+    stats = get_result_cache().get_stats()
+    if feedback_generator.feedback_client is not None:
+        stats["feedback_client"] = feedback_generator.feedback_client.get_stats()
+    return stats
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Per-stage timings and resource usage in the Prometheus text format"""
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8000)
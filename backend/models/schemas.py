@@ -1,15 +1,64 @@
 from pydantic import BaseModel
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 class TimelineEvent(BaseModel):
-    time: int
+    time: float
     event: str
+    end: Optional[float] = None
+    metric: Optional[str] = None
+    value: Optional[float] = None
+
+class MetricsTimeline(BaseModel):
+    window: float
+    step: float
+    start: List[float]
+    end: List[float]
+    metrics: Dict[str, List[Optional[float]]]
 
 class Feedback(BaseModel):
     summary: str
     recommendations: List[str]
 
+class SpanTiming(BaseModel):
+    name: str
+    parent: Optional[str] = None
+    start_s: float
+    wall_s: float
+    cpu_s: float
+    rss_delta_mb: float
+    peak_rss_delta_mb: float
+    thread: str
+    counts: Dict[str, int]
+    failed: bool
+
 class AnalysisResponse(BaseModel):
     scores: Dict[str, float]
     timeline: List[TimelineEvent]
-    feedback: Feedback
\ No newline at end of file
+    metrics_timeline: Optional[MetricsTimeline] = None
+    feedback: Feedback
+    timings: Optional[List[SpanTiming]] = None
+
+class JobSubmitted(BaseModel):
+    job_id: str
+    state: str
+    status_url: str
+    result_url: str
+
+class PartialAudioMetrics(BaseModel):
+    transcribed_seconds: float
+    duration_seconds: float
+    word_count: int
+    speech_rate: float
+    fillers_count: int
+    filler_percentage: float
+    language: Optional[str] = None
+
+class JobStatus(BaseModel):
+    job_id: str
+    state: str
+    stage: str
+    progress: float
+    partial: Optional[PartialAudioMetrics] = None
+    error: Optional[str] = None
+    created_at: float
+    updated_at: float
@@ -1,53 +1,41 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException
 from models.schemas import AnalysisResponse
-from services.vision_service import extract_vision_metrics
-from services.audio_service import extract_audio_metrics
-from services.scoring_service import calculate_scores
-from services.feedback_service import generate_feedback_response
-from utils.file_handler import save_uploaded_video, cleanup_video
-import uuid
+from services.analysis_service import analyze
+from services.executor import run_in_pool
+from utils.file_handler import UploadError, save_uploaded_video, cleanup_video, upload_filename
+from utils.instrumentation import trace
 
 router = APIRouter()
 
-@router.post("/analyze", response_model=AnalysisResponse)
-async def analyze_video(file: UploadFile = File(...)):
-    """Analyze uploaded video and return scores, timeline, and feedback"""
+@router.post("/analyze", response_model=AnalysisResponse, response_model_exclude_unset=True)
+async def analyze_video(file: UploadFile = File(...), timings: bool = False):
+    """
+    Analyze uploaded video and return scores, timeline, and feedback
+    (plus the per-stage timing breakdown with `?timings=true`)
+    """
     if not file.filename.endswith('.mp4'):
         raise HTTPException(status_code=400, detail="Only MP4 files are supported")
 
-    # Save uploaded video
-    filename = f"{uuid.uuid4()}.mp4"
-    video_path = save_uploaded_video(file.file, filename)
+    with trace() as request_trace:
+        # Save uploaded video (hashed and probed while it is copied)
+        filename = upload_filename()
+        try:
+            upload = await run_in_pool(save_uploaded_video, file.file, filename)
+        except UploadError as e:
+            raise HTTPException(status_code=e.status_code, detail=e.detail)
 
-    try:
-        # Extract metrics
-        vision_metrics = extract_vision_metrics(video_path)
-        audio_metrics = extract_audio_metrics(video_path)
+        try:
+            result = await analyze(upload.path, upload.content_hash)
 
-        # Calculate scores
-        scores = calculate_scores(vision_metrics, audio_metrics)
+        finally:
+            # Cleanup
+            cleanup_video(upload.path)
 
-        # Generate feedback
-        feedback = generate_feedback_response(scores, audio_metrics)
+    if timings:
+        result = {**result, "timings": request_trace.breakdown()}
+    return result
 
-        # Mock timeline (for now, based on scores)
-        timeline = []
-        if scores["eye_contact"] < 6:
-            timeline.append({"time": 10, "event": "Low eye contact"})
-        if scores["speech_rate"] < 6:
-            timeline.append({"time": 23, "event": "Fast speech rate"})
-
-        return {
-            "scores": scores,
-            "timeline": timeline,
-            "feedback": feedback
-        }
-
-    finally:
-        # Cleanup
-        cleanup_video(video_path)
-
-@router.get("/analyze/mock", response_model=AnalysisResponse)
+@router.get("/analyze/mock", response_model=AnalysisResponse, response_model_exclude_unset=True)
 async def analyze_mock():
     """Return mock analysis data for testing UI"""
     return {
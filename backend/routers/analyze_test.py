@@ -0,0 +1,74 @@
+import struct
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from routers import analyze as analyze_router
+
+RESULT = {
+    "scores": {"posture": 7, "global_score": 6.2},
+    "timeline": [{"time": 10, "event": "Low eye contact"}],
+    "feedback": {"summary": "Good posture.", "recommendations": ["Slow down"]},
+}
+
+
+def _box(box_type: bytes, payload: bytes) -> bytes:
+    return struct.pack(">I4s", 8 + len(payload), box_type) + payload
+
+
+def minimal_mp4(handler: bytes = b"soun") -> bytes:
+    """Smallest container accepted by the upload probe: ftyp, one track with `handler`, media data"""
+    hdlr = _box(b"hdlr", bytes(8) + handler + bytes(12))
+    moov = _box(b"moov", _box(b"trak", _box(b"mdia", hdlr)))
+    return _box(b"ftyp", b"isom" + bytes(4) + b"isom") + moov + _box(b"mdat", bytes(256))
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    # Uploads are stored under the working directory (data/videos)
+    monkeypatch.chdir(tmp_path)
+    return TestClient(app)
+
+
+def test_analyze_stores_analyzes_and_removes_upload(client, monkeypatch):
+    analyzed = []
+
+    async def fake_analyze(video_path, content_hash=None):
+        assert Path(video_path).is_file()
+        analyzed.append((video_path, content_hash))
+        return RESULT
+
+    monkeypatch.setattr(analyze_router, "analyze", fake_analyze)
+    response = client.post("/analyze", files={"file": ("talk.mp4", minimal_mp4(), "video/mp4")})
+
+    assert response.status_code == 200, response.text
+    assert response.json()["feedback"]["summary"] == "Good posture."
+    [(video_path, content_hash)] = analyzed
+    assert Path(video_path).name.startswith("upload-")
+    assert len(content_hash) == 64
+    assert not Path(video_path).exists()
+
+
+def test_analyze_timings(client, monkeypatch):
+    async def fake_analyze(video_path, content_hash=None):
+        return RESULT
+
+    monkeypatch.setattr(analyze_router, "analyze", fake_analyze)
+    response = client.post("/analyze?timings=true", files={"file": ("talk.mp4", minimal_mp4(), "video/mp4")})
+
+    assert response.status_code == 200, response.text
+    assert "upload" in [span["name"] for span in response.json()["timings"]]
+
+
+@pytest.mark.parametrize("filename, content, status", [
+    ("talk.mov", minimal_mp4(), 400),
+    ("talk.mp4", b"not a video at all", 415),
+    ("talk.mp4", minimal_mp4(handler=b"vide"), 422),
+], ids=["not-mp4-extension", "not-mp4-content", "no-audio-track"])
+def test_analyze_rejects_bad_uploads(client, filename, content, status):
+    response = client.post("/analyze", files={"file": (filename, content, "video/mp4")})
+
+    assert response.status_code == status, response.text
+    assert not list(Path("data/videos").glob("*"))
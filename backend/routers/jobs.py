@@ -0,0 +1,68 @@
+from fastapi import APIRouter, UploadFile, File, HTTPException
+from models.schemas import AnalysisResponse, JobSubmitted, JobStatus
+from services.executor import run_in_pool
+from services.job_service import get_job_manager
+from services.job_store import DONE
+from utils.file_handler import UploadError, cleanup_video, save_uploaded_video, upload_filename
+
+router = APIRouter()
+
+@router.post("/jobs", response_model=JobSubmitted, status_code=202)
+async def submit_job(file: UploadFile = File(...)):
+    """Queue a video for background analysis and return the job id"""
+    if not file.filename.endswith('.mp4'):
+        raise HTTPException(status_code=400, detail="Only MP4 files are supported")
+
+    manager = get_job_manager()
+    # Reject before storing the upload when the queue is already full
+    if manager.is_full():
+        raise HTTPException(status_code=503, detail="Analysis queue is full, retry later",
+                            headers={"Retry-After": "30"})
+
+    filename = upload_filename()
+    try:
+        upload = await run_in_pool(save_uploaded_video, file.file, filename)
+    except UploadError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+    job = manager.submit(upload.path, upload.content_hash)
+    if job is None:
+        cleanup_video(upload.path)
+        raise HTTPException(status_code=503, detail="Analysis queue is full, retry later",
+                            headers={"Retry-After": "30"})
+
+    return {
+        "job_id": job.id,
+        "state": job.state,
+        "status_url": f"/jobs/{job.id}",
+        "result_url": f"/jobs/{job.id}/result"
+    }
+
+@router.get("/jobs/{job_id}", response_model=JobStatus)
+async def job_status(job_id: str):
+    """State and progress of a background analysis"""
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return {
+        "job_id": job.id,
+        "state": job.state,
+        "stage": job.stage,
+        "progress": job.progress,
+        "partial": job.partial,
+        "error": job.error,
+        "created_at": job.created_at,
+        "updated_at": job.updated_at
+    }
+
+@router.get("/jobs/{job_id}/result", response_model=AnalysisResponse, response_model_exclude_unset=True)
+async def job_result(job_id: str):
+    """Result of a finished analysis (409 while it is queued or running, or if it failed)"""
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.state != DONE:
+        raise HTTPException(status_code=409, detail={"state": job.state, "error": job.error})
+
+    return job.result
@@ -0,0 +1,72 @@
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from routers import jobs as jobs_router
+from routers.analyze_test import minimal_mp4
+from services import job_service
+from services.job_service import JobManager
+from services.job_store import DONE, InMemoryJobStore
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    # Uploads are stored under the working directory (data/videos); workers are not started
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(job_service, "reap_stale_files", lambda keep=(): 0)
+    manager = JobManager(InMemoryJobStore(max_queued=1), workers=1, result_ttl=3600)
+    monkeypatch.setattr(jobs_router, "get_job_manager", lambda: manager)
+    return manager
+
+
+@pytest.fixture
+def client(manager):
+    return TestClient(app)
+
+
+def upload():
+    return {"file": ("talk.mp4", minimal_mp4(), "video/mp4")}
+
+
+def test_submit_poll_and_fetch_result(client, manager):
+    response = client.post("/jobs", files=upload())
+    assert response.status_code == 202, response.text
+    job_id = response.json()["job_id"]
+    assert response.json()["status_url"] == f"/jobs/{job_id}"
+
+    assert client.get(f"/jobs/{job_id}").json()["state"] == "queued"
+    assert client.get(f"/jobs/{job_id}/result").status_code == 409
+
+    result = {"scores": {"posture_score": 7}, "timeline": [], "feedback": {"summary": "", "recommendations": []}}
+    manager.store.update(job_id, state=DONE, stage=DONE, progress=1.0, result=result)
+    response = client.get(f"/jobs/{job_id}/result")
+    assert response.status_code == 200, response.text
+    assert response.json()["scores"] == {"posture_score": 7}
+
+
+def test_full_queue_is_rejected_with_503(client):
+    assert client.post("/jobs", files=upload()).status_code == 202
+
+    response = client.post("/jobs", files=upload())
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "30"
+    # Only the accepted job's upload is on disk
+    assert len(list(Path("data/videos").glob("*"))) == 1
+
+
+def test_queue_filled_during_upload_removes_the_upload(client, manager, monkeypatch):
+    # The queue has room when the request arrives but not once the upload is stored
+    monkeypatch.setattr(manager, "submit", lambda video_path, content_hash=None: None)
+
+    response = client.post("/jobs", files=upload())
+
+    assert response.status_code == 503
+    assert not list(Path("data/videos").glob("*"))
+
+
+def test_unknown_job(client):
+    assert client.get("/jobs/missing").status_code == 404
+    assert client.get("/jobs/missing/result").status_code == 404
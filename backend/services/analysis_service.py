@@ -0,0 +1,132 @@
+"""
+The full analysis pipeline (metrics -> scores -> feedback -> timeline), shared by
+the synchronous /analyze endpoint and the background job workers.
+"""
+import asyncio
+from concurrent.futures import wait
+
+from feedback import feedback_generator, template_feedback
+from scoring import global_score, scoring_engine, scoring_rules, timeline
+from services import feedback_service, scoring_service, vision_service
+from services.vision_service import extract_vision_metrics
+from services.audio_service import extract_audio_metrics
+from services.scoring_service import calculate_scores
+from services.feedback_service import generate_feedback_response
+from services.executor import run_in_pool, submit
+from services.result_cache import code_version, get_result_cache, stage_key
+from utils.media_source import MediaSource
+from config import (ANALYSIS_BACKEND, TIMELINE_MAX_EVENTS, TIMELINE_MAX_WINDOWS, TIMELINE_STEP_SECONDS,
+                    TIMELINE_WINDOW_SECONDS)
+
+if ANALYSIS_BACKEND == "processes":
+    # Same stages, run by the worker processes that hold the models
+    from services.process_pool import extract_audio_metrics, extract_vision_metrics
+
+# Versions of the cached stages: editing e.g. scoring_rules.py only invalidates scores and feedback
+POSE_VERSION = ("pose", vision_service.MODEL_PATH, vision_service.DEFAULT_SAMPLING,
+                code_version(vision_service))
+SCORING_VERSION = ("scores", code_version(scoring_rules, scoring_engine, global_score, scoring_service))
+FEEDBACK_VERSION = ("feedback", feedback_generator.FEEDBACK_POLICY if feedback_generator.client else "template",
+                    code_version(feedback_generator, template_feedback, feedback_service))
+
+
+def _report(progress, stage: str, fraction: float):
+    if progress is not None:
+        progress(stage, fraction)
+
+
+def build_timeline(vision_metrics: dict, audio_metrics: dict) -> tuple:
+    """
+    Timestamped events and rolling metrics from the per-second series of both pipelines
+
+    Returns:
+        (events, windowed metrics); no events when the metrics carry no series (mock data)
+    """
+    series = timeline.merge_series(vision_metrics.get("series"), audio_metrics.get("series"))
+    return timeline.build_timeline(series, TIMELINE_WINDOW_SECONDS, TIMELINE_STEP_SECONDS,
+                                   TIMELINE_MAX_WINDOWS, TIMELINE_MAX_EVENTS)
+
+
+def cached_vision_metrics(video_path: str, media: MediaSource) -> dict:
+    """Pose metrics of the upload, reused when the same video was already analyzed"""
+    key = stage_key(media.content_hash, POSE_VERSION)
+    return get_result_cache().get_or_compute("pose", key, extract_vision_metrics, video_path, media)
+
+
+def finalize_analysis(vision_metrics: dict, audio_metrics: dict, progress=None) -> dict:
+    """Scores, feedback and timeline from the extracted metrics (blocking)"""
+    cache = get_result_cache()
+
+    # Keyed on the stage inputs: same metrics and same code give the same result
+    _report(progress, "scoring", 0.85)
+    scores = cache.get_or_compute(
+        "scores", stage_key(vision_metrics, audio_metrics, SCORING_VERSION),
+        calculate_scores, vision_metrics, audio_metrics
+    )
+
+    _report(progress, "feedback", 0.9)
+    feedback_key = stage_key(scores, audio_metrics, FEEDBACK_VERSION)
+    feedback = cache.get("feedback", feedback_key)
+    if feedback is None:
+        feedback = generate_feedback_response(scores, audio_metrics)
+        # A fallback after a Gemini timeout or error is not stored: the next run retries
+        if feedback.get("source") != "fallback":
+            cache.put("feedback", feedback_key, feedback)
+
+    events, metrics_timeline = build_timeline(vision_metrics, audio_metrics)
+    return {
+        "scores": scores,
+        "timeline": events,
+        "metrics_timeline": metrics_timeline,
+        "feedback": feedback
+    }
+
+
+def run_analysis(video_path: str, progress=None, content_hash: str = None, on_partial=None) -> dict:
+    """
+    Run the whole pipeline from a worker thread (must not be called from the pool itself).
+
+    Args:
+        video_path: Path of the stored upload
+        progress: Optional callback(stage, fraction) reporting the current stage
+        content_hash: SHA-256 computed during the upload (hashed again if missing)
+        on_partial: Optional callback(dict) with the audio metrics transcribed so far
+    """
+    media = MediaSource(video_path, content_hash=content_hash)
+
+    _report(progress, "extracting_metrics", 0.05)
+    futures = [
+        submit(cached_vision_metrics, video_path, media),
+        submit(extract_audio_metrics, video_path, media, on_partial)
+    ]
+    for future in futures:
+        future.add_done_callback(lambda _: _report(
+            progress, "extracting_metrics",
+            0.05 + 0.4 * sum(f.done() for f in futures)
+        ))
+    # Wait for both pipelines before raising, they share the same file
+    wait(futures)
+    vision_metrics, audio_metrics = (future.result() for future in futures)
+
+    return finalize_analysis(vision_metrics, audio_metrics, progress)
+
+
+async def analyze(video_path: str, content_hash: str = None) -> dict:
+    """Run the whole pipeline without blocking the event loop"""
+    # Decode the upload once and share the streams between both pipelines
+    media = MediaSource(video_path, content_hash=content_hash)
+
+    # Extract vision and audio metrics in parallel on the worker pool,
+    # keeping the event loop free for other requests
+    vision_metrics, audio_metrics = await asyncio.gather(
+        run_in_pool(cached_vision_metrics, video_path, media),
+        run_in_pool(extract_audio_metrics, video_path, media),
+        return_exceptions=True
+    )
+    # Both pipelines are done with the file at this point: re-raise failures
+    for result in (vision_metrics, audio_metrics):
+        if isinstance(result, BaseException):
+            raise result
+
+    # Scores + feedback (blocking LLM call)
+    return await run_in_pool(finalize_analysis, vision_metrics, audio_metrics)
@@ -1,24 +1,88 @@
-import os
-import tempfile
-from audio.audio_extraction import AudioExtractor
+from audio import audio_decoding, audio_features, streaming_transcription, transcription_engines, vad
 from audio.audio_scoring import AudioScorer
+from audio.word_timing import word_times
+from config import (PITCH_METHOD, TRANSCRIPTION_COMPUTE_TYPE, TRANSCRIPTION_ENGINE, TRANSCRIPTION_FIXTURE_PATH,
+                    TRANSCRIPTION_OVERLAP_SECONDS, TRANSCRIPTION_SKIP_SILENCE, TRANSCRIPTION_WINDOW_SECONDS,
+                    WHISPER_MODEL_SIZE)
+from services.model_registry import get_audio_extractor
+from services.result_cache import code_version, get_result_cache, stage_key
+from scoring.timeline import merge_series, series_from_samples
+from utils.instrumentation import instrumented
+from utils.media_source import MediaSource
 
-def extract_audio_metrics(video_path: str) -> dict:
+# Versions of the cached audio stages: a change invalidates only that stage
+# (the speech regions skipped by the transcription come from the audio features)
+TRANSCRIPTION_VERSION = (TRANSCRIPTION_ENGINE, WHISPER_MODEL_SIZE, TRANSCRIPTION_COMPUTE_TYPE, TRANSCRIPTION_FIXTURE_PATH,
+                         TRANSCRIPTION_WINDOW_SECONDS, TRANSCRIPTION_OVERLAP_SECONDS, TRANSCRIPTION_SKIP_SILENCE,
+                         code_version(audio_decoding, streaming_transcription, transcription_engines, vad,
+                                      audio_features))
+AUDIO_FEATURES_VERSION = ("features", PITCH_METHOD, code_version(audio_decoding, audio_features))
+
+def compute_audio_results(video_path: str, media: MediaSource, transcription_data: dict = None,
+                          features: dict = None, on_update=None):
+    """
+    Run the audio extractor, reusing the cached transcription / audio features given
+
+    Returns:
+        (extract_all_metrics results or None when the extraction failed,
+         unrounded audio duration in seconds or None when the audio was not decoded)
+    """
+    # Shared audio extractor (Whisper is loaded once per process)
+    extractor = get_audio_extractor()
+
+    # Extract the missing audio metrics from the in-memory PCM buffer
+    needs_audio = transcription_data is None or features is None
+    results = extractor.extract_all_metrics(
+        video_path,
+        audio=media.audio if needs_audio else None,
+        transcription_data=transcription_data,
+        audio_features=features,
+        on_transcription_update=on_update
+    )
+    return results, len(media.audio) / media.sample_rate if needs_audio else None
+
+@instrumented("audio_extraction", counts=lambda metrics: {"words": metrics["word_count"]})
+def extract_audio_metrics(video_path: str, media: MediaSource = None, on_partial=None,
+                          compute=compute_audio_results) -> dict:
     """
     Extract audio metrics from video using real audio processing.
     Falls back to mock data if audio processing fails.
+
+    The transcription and the audio features are cached separately by video
+    hash; the audio is only decoded when one of them has to be computed.
+
+    Args:
+        on_partial: Optional callback(dict) receiving the word count, speech
+            rate and fillers transcribed so far, after each transcription window
+        compute: Runs compute_audio_results (services.process_pool hands it to a
+            worker process; the cache is still read and written here)
     """
     try:
-        # Initialize audio extractor
-        extractor = AudioExtractor(model_size="base")
+        media = media or MediaSource(video_path)
+        cache = get_result_cache()
+
+        transcription_key = stage_key(media.content_hash, TRANSCRIPTION_VERSION)
+        features_key = stage_key(media.content_hash, AUDIO_FEATURES_VERSION)
+        transcription_data = cache.get("transcription", transcription_key)
+        features = cache.get("audio_features", features_key)
 
-        # Extract all audio metrics
-        results = extractor.extract_all_metrics(video_path)
+        results, audio_seconds = compute(video_path, media, transcription_data, features,
+                                         _partial_reporter(on_partial))
 
         if results is None:
             print("Audio extraction failed, using mock data")
             return _get_mock_metrics()
 
+        if transcription_data is None:
+            cache.put("transcription", transcription_key, {
+                "texte_complet": results["transcription"],
+                "segments": results["segments"],
+                "language": results["language"],
+                "duree_secondes": audio_seconds  # Unrounded, as computed
+            })
+        if features is None:
+            cache.put("audio_features", features_key, results["audio_features"])
+
         # Initialize audio scorer
         scorer = AudioScorer()
 
@@ -29,19 +93,7 @@ def extract_audio_metrics(video_path: str) -> dict:
         detected_language = results.get("language", "fr")  # Whisper detects language
         print(f"Detected language: {detected_language}")  # Debug log
 
-        # Clean up temporary audio file if it exists
-        # The AudioExtractor creates temporary files, we need to clean them up
-        try:
-            import os
-            # Try to find and remove temp_audio.wav or similar files
-            temp_files = ["temp_audio.wav", "temp_audio.mp3", "temp_audio.flac"]
-            for temp_file in temp_files:
-                temp_path = os.path.join(os.path.dirname(video_path), temp_file)
-                if os.path.exists(temp_path):
-                    os.remove(temp_path)
-                    print(f"Cleaned up temporary audio file: {temp_file}")
-        except Exception as e:
-            print(f"Warning: Could not clean up temporary audio files: {e}")
+        timing = results.get("timing") or {}
 
         # Return metrics in the format expected by scoring_engine.py
         return {
@@ -53,13 +105,48 @@ def extract_audio_metrics(video_path: str) -> dict:
             "audio_scores": scores,
             "transcription": results.get("transcription", ""),
             "word_count": results.get("nombre_mots", 0),
-            "detected_language": detected_language
+            "detected_language": detected_language,
+            # Timing from the word timestamps (None / empty without timestamps)
+            "articulation_rate": timing.get("debit_articulation"),
+            "speech_rate_windows": [
+                {"start": window["debut"], "end": window["fin"], "speech_rate": window["mots_par_minute"]}
+                for window in timing.get("debit_par_fenetre", [])
+            ],
+            "pause_count": len(results.get("pauses", [])),
+            "pause_source": results.get("source_pauses", "rms"),
+            "pause_distribution": timing.get("distribution_pauses"),
+            # Per-second volume, pitch and word counts for the timeline
+            "series": _audio_series(results)
         }
 
     except Exception as e:
         print(f"Audio processing error: {e}, using mock data")
         return _get_mock_metrics()
 
+def _audio_series(results: dict) -> dict:
+    """Volume and pitch series of the audio features, plus the words at their midpoint"""
+    starts, ends = word_times(results.get("segments"))
+    words = series_from_samples((starts + ends) / 2, {"speech_rate": [1] * len(starts)},
+                                rates=("speech_rate",))
+    return merge_series(results.get("audio_features", {}).get("serie_temporelle"), words)
+
+def _partial_reporter(on_partial):
+    """Translate the incremental transcription stats into the API field names"""
+    if on_partial is None:
+        return None
+
+    def report(stats: dict):
+        on_partial({
+            "transcribed_seconds": stats["secondes_transcrites"],
+            "duration_seconds": stats["duree_secondes"],
+            "word_count": stats["nombre_mots"],
+            "speech_rate": stats["debit_mots_par_minute"],
+            "fillers_count": stats["fillers"]["nombre_total"],
+            "filler_percentage": stats["fillers"]["pourcentage"],
+            "language": stats["language"]
+        })
+    return report
+
 def _get_mock_metrics() -> dict:
     """Return mock audio metrics for fallback"""
     import random
@@ -0,0 +1,40 @@
+"""
+Bounded thread pool running the blocking analysis stages off the event loop.
+
+Whisper (PyTorch), librosa/NumPy, MediaPipe and OpenCV release the GIL in
+their heavy loops, so threads let the vision and audio pipelines of a request
+run in parallel while sharing the models held by the registry. With
+ANALYSIS_BACKEND=processes the same threads hand the extraction stages to
+services.process_pool and wait for them.
+"""
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+from config import ANALYSIS_BACKEND, ANALYSIS_MAX_WORKERS
+
+if ANALYSIS_BACKEND == "processes":
+    # Threads only wait on the worker processes: enough of them to keep every process busy
+    from services.process_pool import worker_count
+
+    _max_workers = max(ANALYSIS_MAX_WORKERS, 2 * worker_count() + 1)
+else:
+    _max_workers = ANALYSIS_MAX_WORKERS
+
+_executor = ThreadPoolExecutor(max_workers=_max_workers, thread_name_prefix="analysis")
+
+
+def submit(fn, *args, **kwargs):
+    """Schedule a blocking call on the pool and return its Future"""
+    # Run in a copy of the caller's context so the request trace follows the task
+    context = contextvars.copy_context()
+    return _executor.submit(context.run, fn, *args, **kwargs)
+
+
+async def run_in_pool(fn, *args, **kwargs):
+    """Await a blocking call executed on the pool"""
+    return await asyncio.wrap_future(submit(fn, *args, **kwargs))
+
+
+def shutdown():
+    _executor.shutdown(wait=False, cancel_futures=True)
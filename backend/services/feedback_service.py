@@ -1,5 +1,7 @@
 from feedback.feedback_generator import generate_feedback, detect_weaknesses
+from utils.instrumentation import instrumented
 
+@instrumented("generate_feedback")
 def generate_feedback_response(scores: dict, audio_metrics: dict = None) -> dict:
     """Generate feedback from scores in the appropriate language"""
     # scores dict now contains both original and simplified keys
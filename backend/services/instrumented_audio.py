@@ -0,0 +1,19 @@
+"""
+AudioExtractor with spans around the stages run inside extract_all_metrics.
+
+The audio package stays standalone: the instrumentation lives in this subclass,
+which the model registry loads instead of the plain AudioExtractor.
+"""
+from audio.audio_extraction import AudioExtractor
+from utils.instrumentation import instrumented
+
+
+class InstrumentedAudioExtractor(AudioExtractor):
+    @instrumented("transcribe", counts=lambda result: {"words": len(result["texte_complet"].split())})
+    def transcribe(self, audio_path, on_update=None, speech_regions=None):
+        return super().transcribe(audio_path, on_update=on_update, speech_regions=speech_regions)
+
+    @instrumented("analyze_audio_features", counts=lambda result: {"pauses": result["nombre_pauses"]})
+    def analyze_audio_features(self, audio_path, hop_length=512, min_pause_duration=0.5):
+        return super().analyze_audio_features(audio_path, hop_length=hop_length,
+                                              min_pause_duration=min_pause_duration)
@@ -0,0 +1,95 @@
+"""
+Background analysis jobs: submit an upload, poll its progress, fetch the result.
+
+A fixed number of worker threads take jobs from the configured store and run
+the same pipeline as /analyze; the CPU-heavy stages still go through the
+shared executor pool.
+"""
+import threading
+import time
+import traceback
+import uuid
+from typing import Optional
+
+from config import (JOB_QUEUE_BACKEND, JOB_QUEUE_MAX_SIZE, JOB_QUEUE_PATH,
+                    JOB_RESULT_TTL_SECONDS, JOB_WORKERS)
+from services.analysis_service import run_analysis
+from services.job_store import DONE, FAILED, Job, create_job_store
+from utils.file_handler import cleanup_video, reap_stale_files
+
+
+class JobManager:
+    def __init__(self, store, workers: int, result_ttl: float):
+        self.store = store
+        self.workers = workers
+        self.result_ttl = result_ttl
+        self._threads = []
+        self._stopping = threading.Event()
+
+    def start(self):
+        self.reap_stale_files()
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 5.0):
+        self._stopping.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def submit(self, video_path: str, content_hash: str = None) -> Optional[Job]:
+        """Enqueue an analysis, returns None when the queue is full"""
+        self.store.purge(time.time() - self.result_ttl)
+        self.reap_stale_files()
+        job = Job(id=str(uuid.uuid4()), video_path=video_path, content_hash=content_hash)
+        return job if self.store.put(job) else None
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.store.get(job_id)
+
+    def reap_stale_files(self) -> int:
+        """Remove the uploads and scratch files nobody owns anymore, keeping unfinished jobs' videos"""
+        try:
+            return reap_stale_files(keep=self.store.active_video_paths())
+        except OSError as e:
+            print(f"Stale file cleanup failed: {e}")
+            return 0
+
+    def is_full(self) -> bool:
+        return self.store.is_full()
+
+    def _work(self):
+        while not self._stopping.is_set():
+            job = self.store.claim(timeout=1.0)
+            if job is not None:
+                self._run(job)
+
+    def _run(self, job: Job):
+        def progress(stage: str, fraction: float):
+            self.store.update(job.id, stage=stage, progress=round(fraction, 2))
+
+        def partial(metrics: dict):
+            self.store.update(job.id, partial=metrics)
+
+        try:
+            result = run_analysis(job.video_path, progress, job.content_hash, partial)
+            self.store.update(job.id, state=DONE, stage=DONE, progress=1.0, result=result)
+        except Exception as e:
+            traceback.print_exc()
+            self.store.update(job.id, state=FAILED, stage=FAILED, error=str(e))
+        finally:
+            cleanup_video(job.video_path)
+
+
+_manager = None
+
+
+def get_job_manager() -> JobManager:
+    """Return the process-wide job manager (built on first use)"""
+    global _manager
+    if _manager is None:
+        store = create_job_store(JOB_QUEUE_BACKEND, JOB_QUEUE_MAX_SIZE, JOB_QUEUE_PATH)
+        _manager = JobManager(store, JOB_WORKERS, JOB_RESULT_TTL_SECONDS)
+    return _manager
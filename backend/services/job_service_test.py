@@ -0,0 +1,83 @@
+import time
+
+import pytest
+
+from services import job_service
+from services.job_service import JobManager
+from services.job_store import DONE, FAILED, InMemoryJobStore
+
+
+def wait_finished(manager, job_id, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = manager.get(job_id)
+        if job.state in (DONE, FAILED):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} still {manager.get(job_id).state}")
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    monkeypatch.setattr(job_service, "reap_stale_files", lambda keep=(): 0)
+    manager = JobManager(InMemoryJobStore(max_queued=4), workers=1, result_ttl=3600)
+    yield manager
+    manager.stop()
+
+
+def test_worker_runs_the_job_and_removes_the_upload(manager, monkeypatch, tmp_path):
+    video = tmp_path / "upload.mp4"
+    video.write_bytes(b"video")
+
+    def fake_run_analysis(video_path, progress, content_hash, on_partial):
+        progress("transcription", 0.333)
+        on_partial({"words": 2})
+        return {"scores": {"posture": 7}, "content_hash": content_hash}
+
+    monkeypatch.setattr(job_service, "run_analysis", fake_run_analysis)
+    job = manager.submit(str(video), content_hash="ab" * 32)
+    manager.start()
+
+    done = wait_finished(manager, job.id)
+    assert (done.state, done.stage, done.progress) == (DONE, DONE, 1.0)
+    assert done.partial == {"words": 2}
+    assert done.result == {"scores": {"posture": 7}, "content_hash": "ab" * 32}
+    manager.stop()  # The upload is removed after the job is marked done
+    assert not video.exists()
+
+
+def test_failed_analysis_records_the_error(manager, monkeypatch, tmp_path):
+    video = tmp_path / "upload.mp4"
+    video.write_bytes(b"video")
+
+    def failing_run_analysis(video_path, progress, content_hash, on_partial):
+        raise RuntimeError("decoder crashed")
+
+    monkeypatch.setattr(job_service, "run_analysis", failing_run_analysis)
+    job = manager.submit(str(video))
+    manager.start()
+
+    failed = wait_finished(manager, job.id)
+    assert (failed.state, failed.error) == (FAILED, "decoder crashed")
+    manager.stop()
+    assert not video.exists()
+
+
+def test_submit_returns_none_when_the_queue_is_full(manager):
+    for index in range(4):
+        assert manager.submit(f"{index}.mp4") is not None
+
+    assert manager.is_full()
+    assert manager.submit("extra.mp4") is None
+
+
+def test_submit_purges_expired_results(monkeypatch):
+    monkeypatch.setattr(job_service, "reap_stale_files", lambda keep=(): 0)
+    manager = JobManager(InMemoryJobStore(max_queued=4), workers=1, result_ttl=0)
+    old = manager.submit("old.mp4")
+    manager.store.update(old.id, state=DONE)
+    time.sleep(0.01)
+
+    manager.submit("new.mp4")
+
+    assert manager.get(old.id) is None
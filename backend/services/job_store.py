@@ -0,0 +1,267 @@
+"""
+Queue backends for analysis jobs.
+
+A store keeps the job records (state, progress, partial metrics, result) and hands queued jobs
+to the workers. `InMemoryJobStore` lives in the process; `SQLiteJobStore`
+keeps jobs in a local SQLite file so they survive a restart.
+"""
+import json
+import queue
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field, asdict, replace
+from pathlib import Path
+from typing import Optional
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+FINISHED_STATES = (DONE, FAILED)
+
+
+@dataclass
+class Job:
+    id: str
+    video_path: str
+    content_hash: Optional[str] = None
+    state: str = QUEUED
+    stage: str = QUEUED
+    progress: float = 0.0
+    partial: Optional[dict] = None  # Audio metrics transcribed so far
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+
+
+class JobStore(ABC):
+    """Storage and FIFO queue of jobs, safe to use from several threads"""
+
+    def __init__(self, max_queued: int):
+        self.max_queued = max_queued
+
+    def is_full(self) -> bool:
+        return self.queued_count() >= self.max_queued
+
+    @abstractmethod
+    def put(self, job: Job) -> bool:
+        """Enqueue a job, returns False when the queue is full"""
+
+    @abstractmethod
+    def claim(self, timeout: float) -> Optional[Job]:
+        """Take the oldest queued job and mark it running (None after timeout)"""
+
+    @abstractmethod
+    def update(self, job_id: str, **fields):
+        """Update fields of a job (state, stage, progress, partial, result, error)"""
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Job]:
+        """Return a snapshot of the job, or None if unknown"""
+
+    @abstractmethod
+    def queued_count(self) -> int:
+        """Number of jobs waiting for a worker"""
+
+    @abstractmethod
+    def purge(self, older_than: float) -> int:
+        """Delete finished jobs last updated before `older_than`, returns their count"""
+
+    @abstractmethod
+    def active_video_paths(self) -> list:
+        """Uploads of the queued and running jobs"""
+
+
+class InMemoryJobStore(JobStore):
+    def __init__(self, max_queued: int):
+        super().__init__(max_queued)
+        self._jobs = {}
+        self._queue = queue.Queue(maxsize=max_queued)
+        self._lock = threading.Lock()
+
+    def put(self, job: Job) -> bool:
+        with self._lock:
+            try:
+                self._queue.put_nowait(job.id)
+            except queue.Full:
+                return False
+            self._jobs[job.id] = job
+        return True
+
+    def claim(self, timeout: float) -> Optional[Job]:
+        try:
+            job_id = self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        self.update(job_id, state=RUNNING)
+        return self.get(job_id)
+
+    def update(self, job_id: str, **fields):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                for name, value in fields.items():
+                    setattr(job, name, value)
+                job.updated_at = time.time()
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return replace(job) if job is not None else None
+
+    def queued_count(self) -> int:
+        return self._queue.qsize()
+
+    def purge(self, older_than: float) -> int:
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items()
+                       if job.state in FINISHED_STATES and job.updated_at < older_than]
+            for job_id in expired:
+                del self._jobs[job_id]
+        return len(expired)
+
+    def active_video_paths(self) -> list:
+        with self._lock:
+            return [job.video_path for job in self._jobs.values() if job.state not in FINISHED_STATES]
+
+
+class SQLiteJobStore(JobStore):
+    """
+    Jobs persisted in a SQLite file.
+
+    Workers of this process are woken up on submit; the poll interval only
+    matters for jobs enqueued by another process sharing the file.
+    """
+
+    _COLUMNS = ("id", "video_path", "content_hash", "state", "stage", "progress", "partial", "result",
+                "error", "created_at", "updated_at")
+    _JSON_COLUMNS = ("partial", "result")
+
+    def __init__(self, max_queued: int, path: str, poll_interval: float = 1.0):
+        super().__init__(max_queued)
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                video_path TEXT NOT NULL,
+                content_hash TEXT,
+                state TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                progress REAL NOT NULL,
+                partial TEXT,
+                result TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, created_at)")
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._poll_interval = poll_interval
+
+        # Jobs left running by a previous process will never finish: run them again
+        with self._lock:
+            self._db.execute("UPDATE jobs SET state = ?, stage = ?, progress = 0, partial = NULL WHERE state = ?",
+                             (QUEUED, QUEUED, RUNNING))
+
+    def _row_to_job(self, row) -> Job:
+        values = dict(zip(self._COLUMNS, row))
+        for name in self._JSON_COLUMNS:
+            if values[name] is not None:
+                values[name] = json.loads(values[name])
+        return Job(**values)
+
+    def put(self, job: Job) -> bool:
+        values = asdict(job)
+        for name in self._JSON_COLUMNS:
+            if values[name] is not None:
+                values[name] = json.dumps(values[name])
+        with self._lock:
+            if self._count_queued() >= self.max_queued:
+                return False
+            self._db.execute(
+                f"INSERT INTO jobs ({', '.join(self._COLUMNS)}) VALUES ({', '.join('?' * len(self._COLUMNS))})",
+                [values[name] for name in self._COLUMNS]
+            )
+            self._wakeup.notify()
+        return True
+
+    def claim(self, timeout: float) -> Optional[Job]:
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            while True:
+                self._db.execute("BEGIN IMMEDIATE")
+                try:
+                    row = self._db.execute(
+                        "SELECT id FROM jobs WHERE state = ? ORDER BY created_at LIMIT 1", (QUEUED,)
+                    ).fetchone()
+                    if row is not None:
+                        self._db.execute("UPDATE jobs SET state = ?, updated_at = ? WHERE id = ?",
+                                         (RUNNING, time.time(), row[0]))
+                    self._db.execute("COMMIT")
+                except Exception:
+                    self._db.execute("ROLLBACK")
+                    raise
+
+                if row is not None:
+                    return self._get(row[0])
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._wakeup.wait(min(remaining, self._poll_interval))
+
+    def update(self, job_id: str, **fields):
+        for name in self._JSON_COLUMNS:
+            if fields.get(name) is not None:
+                fields[name] = json.dumps(fields[name])
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            self._db.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", [*fields.values(), job_id])
+
+    def _get(self, job_id: str) -> Optional[Job]:
+        row = self._db.execute(
+            f"SELECT {', '.join(self._COLUMNS)} FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        return self._row_to_job(row) if row is not None else None
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._get(job_id)
+
+    def _count_queued(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM jobs WHERE state = ?", (QUEUED,)).fetchone()[0]
+
+    def queued_count(self) -> int:
+        with self._lock:
+            return self._count_queued()
+
+    def purge(self, older_than: float) -> int:
+        with self._lock:
+            cursor = self._db.execute(
+                "DELETE FROM jobs WHERE state IN (?, ?) AND updated_at < ?", (*FINISHED_STATES, older_than)
+            )
+            return cursor.rowcount
+
+    def active_video_paths(self) -> list:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT video_path FROM jobs WHERE state NOT IN (?, ?)", FINISHED_STATES
+            ).fetchall()
+        return [row[0] for row in rows]
+
+
+def create_job_store(backend: str, max_queued: int, path: str = None) -> JobStore:
+    """Build the configured queue backend ("memory" or "sqlite")"""
+    if backend == "memory":
+        return InMemoryJobStore(max_queued)
+    if backend == "sqlite":
+        return SQLiteJobStore(max_queued, path)
+    raise ValueError(f"Unknown job queue backend: {backend}")
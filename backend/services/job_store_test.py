@@ -0,0 +1,122 @@
+import threading
+import time
+
+import pytest
+
+from services.job_store import (DONE, FAILED, QUEUED, RUNNING, InMemoryJobStore, Job, SQLiteJobStore,
+                                create_job_store)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_store(request, tmp_path):
+    def make(max_queued=4):
+        return create_job_store(request.param, max_queued, str(tmp_path / "jobs.sqlite3"))
+    return make
+
+
+def test_claim_takes_jobs_in_submission_order(make_store):
+    store = make_store()
+    for index in range(3):
+        assert store.put(Job(id=f"job-{index}", video_path=f"/videos/{index}.mp4", created_at=index))
+
+    claimed = [store.claim(timeout=0.1) for _ in range(3)]
+
+    assert [job.id for job in claimed] == ["job-0", "job-1", "job-2"]
+    assert all(job.state == RUNNING for job in claimed)
+    assert store.queued_count() == 0
+    assert store.claim(timeout=0.05) is None
+
+
+def test_update_and_complete(make_store):
+    store = make_store()
+    store.put(Job(id="job", video_path="/videos/a.mp4", content_hash="ab" * 32))
+    store.claim(timeout=0.1)
+
+    store.update("job", stage="transcription", progress=0.4, partial={"words": 12})
+    running = store.get("job")
+    assert (running.stage, running.progress, running.partial) == ("transcription", 0.4, {"words": 12})
+
+    store.update("job", state=DONE, stage=DONE, progress=1.0, result={"scores": {"posture": 7}})
+    done = store.get("job")
+    assert done.state == DONE and done.result == {"scores": {"posture": 7}}
+    assert done.content_hash == "ab" * 32
+    assert store.active_video_paths() == []
+
+
+def test_get_returns_a_snapshot(make_store):
+    store = make_store()
+    store.put(Job(id="job", video_path="/videos/a.mp4"))
+
+    store.get("job").state = FAILED
+
+    assert store.get("job").state == QUEUED
+    assert store.get("unknown") is None
+
+
+def test_put_refuses_jobs_beyond_the_queue_size(make_store):
+    store = make_store(max_queued=2)
+    assert store.put(Job(id="a", video_path="a.mp4"))
+    assert store.put(Job(id="b", video_path="b.mp4"))
+
+    assert store.is_full()
+    assert not store.put(Job(id="c", video_path="c.mp4"))
+    assert store.get("c") is None
+
+    # A claimed job frees its slot
+    store.claim(timeout=0.1)
+    assert not store.is_full()
+    assert store.put(Job(id="c", video_path="c.mp4"))
+
+
+def test_purge_removes_only_old_finished_jobs(make_store):
+    store = make_store()
+    for job_id in ("old-done", "old-failed", "recent-done", "running"):
+        store.put(Job(id=job_id, video_path=f"{job_id}.mp4"))
+        store.claim(timeout=0.1)
+    store.update("old-done", state=DONE)
+    store.update("old-failed", state=FAILED)
+    cutoff = time.time()
+    time.sleep(0.01)
+    store.update("recent-done", state=DONE)
+    store.update("running", progress=0.5)
+
+    assert store.purge(older_than=cutoff) == 2
+
+    assert store.get("old-done") is None and store.get("old-failed") is None
+    assert store.get("recent-done").state == DONE
+    assert store.active_video_paths() == ["running.mp4"]
+
+
+def test_sqlite_requeues_running_jobs_after_a_restart(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    before = SQLiteJobStore(4, path)
+    before.put(Job(id="interrupted", video_path="a.mp4"))
+    before.put(Job(id="finished", video_path="b.mp4"))
+    before.claim(timeout=0.1)
+    before.update("interrupted", stage="transcription", progress=0.6, partial={"words": 3})
+    before.claim(timeout=0.1)
+    before.update("finished", state=DONE, result={"scores": {}})
+
+    after = SQLiteJobStore(4, path)
+
+    job = after.get("interrupted")
+    assert (job.state, job.stage, job.progress, job.partial) == (QUEUED, QUEUED, 0.0, None)
+    assert after.get("finished").state == DONE
+    assert after.claim(timeout=0.1).id == "interrupted"
+
+
+def test_sqlite_claim_wakes_up_on_put(tmp_path):
+    store = SQLiteJobStore(4, str(tmp_path / "jobs.sqlite3"), poll_interval=30)
+    threading.Timer(0.1, store.put, [Job(id="late", video_path="a.mp4")]).start()
+
+    started = time.monotonic()
+    job = store.claim(timeout=5)
+
+    assert job.id == "late"
+    assert time.monotonic() - started < 2
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        create_job_store("redis", 4)
+    assert isinstance(create_job_store("memory", 4), InMemoryJobStore)
@@ -0,0 +1,200 @@
+"""
+Process-wide model registry.
+
+The transcription engine (through AudioExtractor) and the MediaPipe PoseLandmarker are loaded
+once per process and shared by every request instead of being rebuilt on each
+/analyze call.
+"""
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+from config import (WHISPER_MODEL_SIZE, PITCH_METHOD, AUDIO_STREAM_BLOCK_SECONDS,
+                    POSE_LANDMARKER_POOL_SIZE, TRANSCRIPTION_WINDOW_SECONDS,
+                    TRANSCRIPTION_OVERLAP_SECONDS, TRANSCRIPTION_SKIP_SILENCE, TRANSCRIPTION_ENGINE,
+                    TRANSCRIPTION_COMPUTE_TYPE, TRANSCRIPTION_CPU_THREADS, TRANSCRIPTION_FIXTURE_PATH,
+                    PAUSE_SOURCE)
+from utils.instrumentation import current_rss_mb, peak_rss_mb
+
+_lock = threading.Lock()
+_audio_extractor = None
+_pose_slots = None
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def _count_use(name: str):
+    # Requests run on several threads: the read-modify-write needs the lock
+    with _stats_lock:
+        _stats[name]["uses"] += 1
+
+
+def _record_load(name: str, started: float, rss_before: float, **extra):
+    _stats[name] = {
+        "loaded": True,
+        "load_seconds": round(time.perf_counter() - started, 3),
+        "rss_delta_mb": round(current_rss_mb() - rss_before, 1),
+        "uses": 0,
+        **extra,
+    }
+
+
+class PoseLandmarkerSlot:
+    """
+    A shared PoseLandmarker in VIDEO mode.
+
+    VIDEO mode requires strictly increasing timestamps for the lifetime of the
+    landmarker, so each new video is shifted after the last timestamp seen.
+    """
+
+    def __init__(self, landmarker):
+        self.landmarker = landmarker
+        self._offset_ms = 0
+        self._last_ms = -1
+
+    def start_video(self):
+        self._offset_ms = self._last_ms + 1
+
+    def detect_for_video(self, image, timestamp_ms: int):
+        timestamp = max(self._offset_ms + int(timestamp_ms), self._last_ms + 1)
+        self._last_ms = timestamp
+        return self.landmarker.detect_for_video(image, timestamp)
+
+
+def _engine_options() -> dict:
+    """Options of the configured transcription engine"""
+    if TRANSCRIPTION_ENGINE == "faster-whisper":
+        return {"compute_type": TRANSCRIPTION_COMPUTE_TYPE, "cpu_threads": TRANSCRIPTION_CPU_THREADS}
+    if TRANSCRIPTION_ENGINE == "fixture":
+        return {"path": TRANSCRIPTION_FIXTURE_PATH}
+    return {}
+
+
+def _load_audio_extractor():
+    global _audio_extractor
+    if _audio_extractor is None:
+        with _lock:
+            if _audio_extractor is None:
+                from services.instrumented_audio import InstrumentedAudioExtractor
+
+                started, rss_before = time.perf_counter(), current_rss_mb()
+                extractor = InstrumentedAudioExtractor(model_size=WHISPER_MODEL_SIZE, pitch_method=PITCH_METHOD,
+                                                       stream_block_seconds=AUDIO_STREAM_BLOCK_SECONDS or None,
+                                                       transcription_window_seconds=TRANSCRIPTION_WINDOW_SECONDS or None,
+                                                       transcription_overlap_seconds=TRANSCRIPTION_OVERLAP_SECONDS,
+                                                       skip_silence=TRANSCRIPTION_SKIP_SILENCE,
+                                                       engine=TRANSCRIPTION_ENGINE, engine_options=_engine_options(),
+                                                       pause_source=PAUSE_SOURCE)
+                _record_load("whisper", started, rss_before, **extractor.engine.describe())
+                _audio_extractor = extractor
+    return _audio_extractor
+
+
+def get_audio_extractor():
+    """Return the shared AudioExtractor, loading the transcription engine on first use"""
+    extractor = _load_audio_extractor()
+    _count_use("whisper")
+    return extractor
+
+
+def _get_pose_slots() -> queue.Queue:
+    global _pose_slots
+    if _pose_slots is None:
+        with _lock:
+            if _pose_slots is None:
+                from services.vision_service import create_pose_landmarker
+
+                started, rss_before = time.perf_counter(), current_rss_mb()
+                slots = queue.Queue()
+                for _ in range(POSE_LANDMARKER_POOL_SIZE):
+                    slots.put(PoseLandmarkerSlot(create_pose_landmarker()))
+                _record_load("pose_landmarker", started, rss_before,
+                             pool_size=POSE_LANDMARKER_POOL_SIZE)
+                _pose_slots = slots
+    return _pose_slots
+
+
+@contextmanager
+def pose_landmarker():
+    """
+    Borrow a PoseLandmarker for the duration of one video.
+
+    A landmarker is used by a single video at a time (its tracking state is
+    per stream); other callers wait until a slot is returned.
+    """
+    slots = _get_pose_slots()
+    slot = slots.get()
+    try:
+        _count_use("pose_landmarker")
+        slot.start_video()
+        yield slot
+    finally:
+        slots.put(slot)
+
+
+def _warm_up_whisper(run_inference: bool):
+    extractor = _load_audio_extractor()
+    if run_inference:
+        started = time.perf_counter()
+        extractor.transcribe(np.zeros(16000, dtype=np.float32))
+        _stats["whisper"]["warmup_seconds"] = round(time.perf_counter() - started, 3)
+
+
+def _warm_up_pose_landmarker(run_inference: bool):
+    import mediapipe as mp
+
+    slots = _get_pose_slots()
+    if run_inference:
+        started = time.perf_counter()
+        blank = np.zeros((256, 256, 3), dtype=np.uint8)
+        for _ in range(POSE_LANDMARKER_POOL_SIZE):
+            slot = slots.get()
+            try:
+                slot.start_video()
+                slot.detect_for_video(mp.Image(image_format=mp.ImageFormat.SRGB, data=blank), 0)
+            finally:
+                slots.put(slot)
+        _stats["pose_landmarker"]["warmup_seconds"] = round(time.perf_counter() - started, 3)
+
+
+def warm_up(run_inference: bool = True) -> dict:
+    """
+    Load every model and optionally run one dummy inference on each.
+
+    A model that fails to load is reported and left to be loaded on first use.
+    """
+    for name, warm in (("whisper", _warm_up_whisper), ("pose_landmarker", _warm_up_pose_landmarker)):
+        try:
+            warm(run_inference)
+        except Exception as e:
+            print(f"Warm-up of {name} failed: {e}, it will be loaded on first request")
+    return get_stats()
+
+
+def _snapshot_stats() -> dict:
+    with _stats_lock:
+        return {name: dict(values) for name, values in _stats.items()}
+
+
+def get_stats() -> dict:
+    """Load/warm-up timings, usage counters and memory of the loaded models"""
+    return {
+        "models": _snapshot_stats(),
+        "pose_landmarkers_available": _pose_slots.qsize() if _pose_slots is not None else 0,
+        "process_rss_mb": round(current_rss_mb(), 1),
+        "process_peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def close():
+    """Release the landmarkers (called on shutdown)"""
+    global _pose_slots
+    with _lock:
+        if _pose_slots is not None:
+            while not _pose_slots.empty():
+                _pose_slots.get_nowait().landmarker.close()
+            _pose_slots = None
+            _stats.pop("pose_landmarker", None)
@@ -0,0 +1,61 @@
+import threading
+
+import numpy as np
+
+from audio.audio_extraction import AudioExtractor
+from services import model_registry
+from services.instrumented_audio import InstrumentedAudioExtractor
+from utils.instrumentation import trace
+
+
+def test_extract_all_metrics_records_spans_for_its_stages():
+    extractor = InstrumentedAudioExtractor(engine="none", load_model=False)
+    t = np.arange(16000 * 2) / 16000
+    y = (0.3 * np.sin(2 * np.pi * 180 * t)).astype(np.float32)
+
+    with trace() as current:
+        extractor.extract_all_metrics("talk.mp4", audio=y)
+
+    names = [record["name"] for record in current.breakdown()]
+    assert "analyze_audio_features" in names and "transcribe" in names
+    assert "pauses" in next(r for r in current.breakdown() if r["name"] == "analyze_audio_features")["counts"]
+    # The plain extractor is left untouched
+    assert AudioExtractor.transcribe is not InstrumentedAudioExtractor.transcribe
+    assert "transcribe" not in vars(extractor)
+
+
+def test_use_counters_are_not_lost_across_threads(monkeypatch):
+    monkeypatch.setattr(model_registry, "_stats", {})
+    monkeypatch.setattr(model_registry, "_audio_extractor", object())
+    model_registry._stats["whisper"] = {"uses": 0}
+
+    def use_many():
+        for _ in range(2000):
+            model_registry.get_audio_extractor()
+
+    threads = [threading.Thread(target=use_many) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert model_registry.get_stats()["models"]["whisper"]["uses"] == 8 * 2000
+
+
+def test_pose_landmarker_counts_each_borrow(monkeypatch):
+    class FakeLandmarker:
+        def detect_for_video(self, image, timestamp_ms):
+            return timestamp_ms
+
+    slots = model_registry.queue.Queue()
+    slots.put(model_registry.PoseLandmarkerSlot(FakeLandmarker()))
+    monkeypatch.setattr(model_registry, "_stats", {"pose_landmarker": {"uses": 0}})
+    monkeypatch.setattr(model_registry, "_pose_slots", slots)
+
+    for video in range(3):
+        with model_registry.pose_landmarker() as slot:
+            # Timestamps keep increasing from one video to the next
+            assert slot.detect_for_video(None, 0) == video
+
+    assert model_registry.get_stats()["models"]["pose_landmarker"]["uses"] == 3
+    assert model_registry.get_stats()["pose_landmarkers_available"] == 1
@@ -0,0 +1,292 @@
+"""
+Process pool for the CPU-bound extraction stages (ANALYSIS_BACKEND=processes).
+
+Each worker process is pinned to its own slice of CPU cores and loads the
+transcription engine and the PoseLandmarker once, in the model registry of
+that process; they stay resident for every task the worker runs. A worker
+is replaced after PROCESS_MAX_TASKS_PER_CHILD tasks to cap memory drift.
+
+`extract_audio_metrics` and `extract_vision_metrics` have the signatures of
+the in-process stages and block until the worker is done, so they run on the
+thread executor like the stages they replace; the result cache is only read
+and written by this process, workers get the cached inputs of their stage
+and return what they computed. NumPy arrays crossing the
+process boundary (decoded audio in, arrays in the results out) go through
+shared memory instead of being pickled; the spans recorded by the worker are
+added to the caller's trace and to the /metrics aggregates, and partial
+transcription updates are forwarded to the caller's callback.
+"""
+import itertools
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from multiprocessing.util import Finalize
+
+import numpy as np
+
+from config import MODEL_WARMUP, PROCESS_CORES_PER_WORKER, PROCESS_MAX_TASKS_PER_CHILD, PROCESS_WORKERS
+from utils.instrumentation import import_spans, trace
+
+# Arrays smaller than this are pickled with the rest of the message
+SHARED_MIN_BYTES = 64 * 1024
+
+# Thread count variables of the native libraries, set in each worker to its number of cores
+THREAD_VARIABLES = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+
+_lock = threading.Lock()
+_pool = None
+_context = multiprocessing.get_context("spawn")
+_partial_queue = None
+_partial_forwarder = None
+_partial_callbacks = {}
+_task_ids = itertools.count()
+_worker_stats = {}
+
+# Set in each worker process by _init_worker
+_worker_partials = None
+_worker_cores = None
+_worker_tasks = 0
+
+
+def core_slices() -> list:
+    """The cores of this process split into slices of PROCESS_CORES_PER_WORKER"""
+    cores = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else \
+        list(range(os.cpu_count() or 1))
+    return [cores[start:start + PROCESS_CORES_PER_WORKER]
+            for start in range(0, len(cores), PROCESS_CORES_PER_WORKER)]
+
+
+def worker_count() -> int:
+    """Configured number of worker processes (one per core slice by default)"""
+    return PROCESS_WORKERS or len(core_slices())
+
+
+class SharedArray:
+    """Picklable handle of an array copied into a shared memory block"""
+
+    def __init__(self, array: np.ndarray):
+        self.shape, self.dtype = array.shape, array.dtype.str
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+        self.name = block.name
+        block.close()
+
+    def load(self, unlink: bool = False) -> np.ndarray:
+        """Copy of the array (the block is released when `unlink`)"""
+        block = shared_memory.SharedMemory(name=self.name)
+        try:
+            return np.array(np.ndarray(self.shape, np.dtype(self.dtype), buffer=block.buf))
+        finally:
+            block.close()
+            if unlink:
+                block.unlink()
+
+    def unlink(self):
+        try:
+            block = shared_memory.SharedMemory(name=self.name)
+        except FileNotFoundError:
+            return
+        block.close()
+        block.unlink()
+
+
+def share(value):
+    """Large arrays of a (nested) value replaced by SharedArray handles"""
+    if isinstance(value, np.ndarray) and value.nbytes >= SHARED_MIN_BYTES:
+        return SharedArray(value)
+    if isinstance(value, dict):
+        return {key: share(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(share(item) for item in value)
+    return value
+
+
+def unshare(value, unlink: bool = True):
+    """Inverse of share(): handles replaced by the arrays"""
+    if isinstance(value, SharedArray):
+        return value.load(unlink=unlink)
+    if isinstance(value, dict):
+        return {key: unshare(item, unlink) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(unshare(item, unlink) for item in value)
+    return value
+
+
+# ===================== WORKER SIDE =====================
+
+def limit_native_threads(threads: int):
+    """
+    Size the native thread pools of this process to its core slice
+
+    The variables are read when a library is loaded, which is too late for
+    the BLAS of NumPy: it is loaded when the worker unpickles its initializer
+    (imported with this module), so the pools already loaded are resized with
+    threadpoolctl. Libraries loaded afterwards (PyTorch/OpenMP, CTranslate2)
+    read the variables.
+    """
+    from threadpoolctl import threadpool_limits
+
+    for variable in THREAD_VARIABLES:
+        os.environ[variable] = str(threads)
+    threadpool_limits(limits=threads)
+
+
+def _init_worker(partials, slices, warm_up: bool):
+    """Pin the worker to a free core slice, then load its models"""
+    global _worker_partials, _worker_cores
+    _worker_partials = partials
+
+    try:
+        cores = slices.get(timeout=5)
+    except queue.Empty:
+        cores = None  # Slice of a crashed worker never returned: run unpinned
+    if cores is not None:
+        # Give the slice back when this worker exits (recycled or pool shut down)
+        Finalize(None, slices.put, args=(cores,), exitpriority=10)
+        if hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, cores)
+        limit_native_threads(len(cores))
+    _worker_cores = cores
+
+    from services import model_registry
+
+    model_registry.warm_up(run_inference=warm_up)
+
+
+def _run_task(stage: str, task_id: int, video_path: str, content_hash: str, audio, options: dict) -> dict:
+    global _worker_tasks
+    from services import audio_service, model_registry, vision_service
+    from utils.media_source import MediaSource
+
+    _worker_tasks += 1
+    media = MediaSource(video_path, content_hash=content_hash,
+                        audio=audio.load() if isinstance(audio, SharedArray) else audio)
+
+    def on_partial(metrics: dict):
+        _worker_partials.put((task_id, metrics))
+
+    with trace() as worker_trace:
+        if stage == "audio":
+            result = audio_service.compute_audio_results(
+                video_path, media, options.get("transcription"), options.get("features"),
+                on_partial if options.get("partial") else None
+            )
+        else:
+            result = vision_service.extract_vision_metrics(video_path, media, options.get("sampling"))
+
+    return {
+        "result": share(result),
+        "spans": worker_trace.breakdown(),
+        "worker": {"pid": os.getpid(), "cores": _worker_cores, "tasks": _worker_tasks,
+                   **model_registry.get_stats()}
+    }
+
+
+# ===================== PARENT SIDE =====================
+
+def _forward_partials(partials):
+    """Hand the partial updates of the workers to the callback of their task"""
+    while True:
+        message = partials.get()
+        if message is None:
+            return
+        task_id, metrics = message
+        callback = _partial_callbacks.get(task_id)
+        if callback is not None:
+            callback(metrics)
+
+
+def start() -> ProcessPoolExecutor:
+    """Start the worker processes (each loads its models before taking tasks)"""
+    global _pool, _partial_queue, _partial_forwarder
+    with _lock:
+        if _pool is None:
+            # More workers than slices (PROCESS_WORKERS): the slices are shared in turn
+            slices, available = _context.Queue(), core_slices()
+            for index in range(worker_count()):
+                slices.put(available[index % len(available)])
+            _partial_queue = _context.Queue()
+            _partial_forwarder = threading.Thread(target=_forward_partials, args=(_partial_queue,),
+                                                  name="process-partials", daemon=True)
+            _partial_forwarder.start()
+
+            _pool = ProcessPoolExecutor(
+                max_workers=worker_count(),
+                mp_context=_context,
+                initializer=_init_worker,
+                initargs=(_partial_queue, slices, MODEL_WARMUP),
+                max_tasks_per_child=PROCESS_MAX_TASKS_PER_CHILD or None
+            )
+            # Spawn every worker now so the models are loaded before the first request
+            for future in [_pool.submit(os.getpid) for _ in range(worker_count())]:
+                future.result()
+    return _pool
+
+
+def _run(stage: str, video_path: str, media, on_partial=None, **options):
+    pool = start()
+    task_id = next(_task_ids)
+    # Audio already decoded here is handed over instead of being decoded again
+    audio = SharedArray(media._audio) if media is not None and media._audio is not None else None
+    if on_partial is not None:
+        _partial_callbacks[task_id] = on_partial
+        options["partial"] = True
+
+    dispatched = time.perf_counter()
+    try:
+        reply = pool.submit(_run_task, stage, task_id, video_path,
+                            media.content_hash if media is not None else None, audio, options).result()
+    finally:
+        _partial_callbacks.pop(task_id, None)
+        if audio is not None:
+            audio.unlink()
+
+    pid = reply["worker"]["pid"]
+    import_spans(reply["spans"], dispatched, thread=f"worker-{pid}")
+    # Most recent first, recycled workers eventually drop out
+    _worker_stats.pop(pid, None)
+    _worker_stats[pid] = reply["worker"]
+    while len(_worker_stats) > worker_count():
+        _worker_stats.pop(next(iter(_worker_stats)))
+    return unshare(reply["result"])
+
+
+def _compute_audio_results(video_path: str, media, transcription_data, features, on_update):
+    return _run("audio", video_path, media, on_update, transcription=transcription_data, features=features)
+
+
+def extract_audio_metrics(video_path: str, media=None, on_partial=None) -> dict:
+    """services.audio_service.extract_audio_metrics, extraction run by a worker process"""
+    from services import audio_service
+
+    # Cache lookups and stores stay in this process: one index, one size budget
+    return audio_service.extract_audio_metrics(video_path, media, on_partial, compute=_compute_audio_results)
+
+
+def extract_vision_metrics(video_path: str, media=None, sampling: dict = None) -> dict:
+    """services.vision_service.extract_vision_metrics, run by a worker process"""
+    return _run("vision", video_path, media, sampling=sampling)
+
+
+def get_stats() -> dict:
+    """Last reported state of each worker process (cores, tasks run, loaded models)"""
+    return {
+        "workers": worker_count(),
+        "max_tasks_per_child": PROCESS_MAX_TASKS_PER_CHILD,
+        "processes": {str(pid): stats for pid, stats in list(_worker_stats.items())}
+    }
+
+
+def shutdown():
+    global _pool
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
+            # Wait for the forwarder: killed at interpreter exit, it would die mid-read
+            _partial_queue.put(None)
+            _partial_forwarder.join(timeout=5)
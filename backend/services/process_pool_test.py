@@ -0,0 +1,56 @@
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from services import process_pool
+from services.process_pool import THREAD_VARIABLES, share, unshare
+
+
+def native_threads_after_limit(threads: int) -> dict:
+    """Run in a fresh worker: NumPy is loaded with its BLAS before the limit, as in _init_worker"""
+    from threadpoolctl import threadpool_info
+
+    numpy_loaded = "numpy" in sys.modules
+    process_pool.limit_native_threads(threads)
+    return {"numpy_loaded_before": numpy_loaded,
+            "variables": {variable: os.environ[variable] for variable in THREAD_VARIABLES},
+            "pools": [pool["num_threads"] for pool in threadpool_info()]}
+
+
+def test_worker_thread_pools_are_limited_after_numpy_is_loaded():
+    cores = len(process_pool.core_slices()[0])
+    with ProcessPoolExecutor(1, mp_context=process_pool._context) as pool:
+        worker = pool.submit(native_threads_after_limit, cores).result(timeout=60)
+
+    assert worker["numpy_loaded_before"]
+    assert worker["variables"] == dict.fromkeys(THREAD_VARIABLES, str(cores))
+    assert worker["pools"] and all(threads <= cores for threads in worker["pools"])
+
+
+def test_limit_native_threads_resizes_loaded_pools(monkeypatch):
+    import threadpoolctl
+
+    calls = []
+    monkeypatch.setattr(threadpoolctl, "threadpool_limits", lambda limits=None: calls.append(limits))
+    for variable in THREAD_VARIABLES:
+        monkeypatch.setenv(variable, "64")
+
+    process_pool.limit_native_threads(2)
+
+    assert calls == [2]
+    assert all(os.environ[variable] == "2" for variable in THREAD_VARIABLES)
+
+
+def test_large_arrays_cross_through_shared_memory():
+    big = np.arange(100_000, dtype=np.float32)
+    value = {"audio": big, "small": np.zeros(3), "nested": [big[:10]]}
+
+    shared = share(value)
+    assert isinstance(shared["audio"], process_pool.SharedArray)
+    assert isinstance(shared["small"], np.ndarray)
+
+    restored = unshare(shared)
+    np.testing.assert_array_equal(restored["audio"], big)
+    assert restored["nested"][0].tolist() == list(range(10))
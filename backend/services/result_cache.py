@@ -0,0 +1,174 @@
+"""
+Content-addressed cache of analysis artifacts on local disk.
+
+Each pipeline stage (transcription, audio features, pose metrics, scores,
+feedback) is stored separately under a key derived from what it depends on:
+the hash of the uploaded video or of the stage inputs, plus a version made of
+the relevant settings and source code. A stage can therefore be reused on its
+own, e.g. new scoring thresholds only invalidate the scores and the feedback.
+
+Entries are JSON files evicted least-recently-used first once the cache
+exceeds its size budget.
+"""
+import hashlib
+import inspect
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from config import RESULT_CACHE_DIR, RESULT_CACHE_ENABLED, RESULT_CACHE_MAX_MB
+
+
+def _to_builtin(value):
+    """JSON fallback for NumPy scalars and arrays found in the metrics"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, sort_keys=True, ensure_ascii=False, default=_to_builtin)
+
+
+def code_version(*modules) -> str:
+    """Short hash of the source code of the given modules"""
+    digest = hashlib.sha256()
+    for module in modules:
+        with open(inspect.getsourcefile(module), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def stage_key(*parts) -> str:
+    """Cache key of a stage from its inputs and version (any JSON-serializable values)"""
+    return hashlib.sha256(_dumps(parts).encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """Size-bounded LRU store of JSON artifacts, one file per (stage, key)"""
+
+    def __init__(self, directory: str, max_bytes: int, enabled: bool = True):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.enabled = enabled and max_bytes > 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # path -> size, least recently used first
+        self._size = 0
+        self._counters = {}
+        if self.enabled:
+            self._load_index()
+
+    def _load_index(self):
+        # Recency survives restarts through the file modification times
+        files = sorted(self.directory.glob("*/*.json"), key=lambda p: p.stat().st_mtime)
+        for path in files:
+            size = path.stat().st_size
+            self._entries[path] = size
+            self._size += size
+
+    def _path(self, stage: str, key: str) -> Path:
+        return self.directory / stage / f"{key}.json"
+
+    def _count(self, stage: str, event: str):
+        counters = self._counters.setdefault(stage, {"hits": 0, "misses": 0, "stores": 0})
+        counters[event] += 1
+
+    def get(self, stage: str, key: str):
+        """Return the stored artifact, or None on a miss"""
+        if not self.enabled:
+            return None
+        path = self._path(stage, key)
+        with self._lock:
+            if path not in self._entries and not self._adopt(path):
+                self._count(stage, "misses")
+                return None
+            self._entries.move_to_end(path)
+            self._count(stage, "hits")
+        try:
+            os.utime(path)
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            # Deleted or corrupted behind our back: forget it and recompute
+            with self._lock:
+                self._forget(path)
+                self._counters[stage]["hits"] -= 1
+                self._count(stage, "misses")
+            return None
+
+    def put(self, stage: str, key: str, value):
+        """Store an artifact, then evict the least recently used ones over budget"""
+        if not self.enabled:
+            return
+        data = _dumps(value).encode("utf-8")
+        if len(data) > self.max_bytes:
+            return
+
+        path = self._path(stage, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename, so readers never see a partial file
+        # Unique per process and thread: several worker processes may store the same entry
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._forget(path)
+            self._entries[path] = len(data)
+            self._size += len(data)
+            self._count(stage, "stores")
+            while self._size > self.max_bytes:
+                oldest, _ = next(iter(self._entries.items()))
+                self._forget(oldest)
+                oldest.unlink(missing_ok=True)
+
+    def _adopt(self, path: Path) -> bool:
+        """Index an entry stored by another process sharing the directory"""
+        try:
+            size = path.stat().st_size
+        except OSError:
+            return False
+        self._entries[path] = size
+        self._size += size
+        return True
+
+    def _forget(self, path: Path):
+        size = self._entries.pop(path, None)
+        if size is not None:
+            self._size -= size
+
+    def get_or_compute(self, stage: str, key: str, compute, *args, **kwargs):
+        """Return the cached artifact, or compute and store it"""
+        value = self.get(stage, key)
+        if value is None:
+            value = compute(*args, **kwargs)
+            self.put(stage, key, value)
+        return value
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "size_mb": round(self._size / 1024 / 1024, 2),
+                "max_size_mb": round(self.max_bytes / 1024 / 1024, 2),
+                "stages": {stage: dict(counters) for stage, counters in self._counters.items()}
+            }
+
+
+_cache: Optional[ResultCache] = None
+
+
+def get_result_cache() -> ResultCache:
+    """Return the process-wide result cache (built on first use)"""
+    global _cache
+    if _cache is None:
+        _cache = ResultCache(RESULT_CACHE_DIR, RESULT_CACHE_MAX_MB * 1024 * 1024, RESULT_CACHE_ENABLED)
+    return _cache
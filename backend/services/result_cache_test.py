@@ -0,0 +1,57 @@
+import numpy as np
+
+from audio.audio_decoding import SAMPLE_RATE
+from audio.audio_extraction import AudioExtractor
+from services import audio_service
+from services.result_cache import ResultCache
+from utils.media_source import MediaSource
+
+
+def test_entry_stored_by_another_instance_is_a_hit(tmp_path):
+    # Two processes sharing the cache directory, each with its own index
+    writer = ResultCache(str(tmp_path), max_bytes=1024 * 1024)
+    reader = ResultCache(str(tmp_path), max_bytes=1024 * 1024)
+
+    writer.put("scores", "abc", {"posture_score": 7})
+
+    assert reader.get("scores", "abc") == {"posture_score": 7}
+    assert reader.get_stats()["entries"] == 1
+    assert reader.get_stats()["stages"]["scores"] == {"hits": 1, "misses": 0, "stores": 0}
+
+
+def test_adopted_entries_count_in_the_size_budget(tmp_path):
+    writer = ResultCache(str(tmp_path), max_bytes=1024 * 1024)
+    reader = ResultCache(str(tmp_path), max_bytes=100)
+    writer.put("scores", "old", {"value": "x" * 40})
+    reader.get("scores", "old")
+
+    reader.put("scores", "new", {"value": "y" * 40})
+
+    assert not (tmp_path / "scores" / "old.json").exists()
+    assert reader.get("scores", "new") == {"value": "y" * 40}
+
+
+def test_audio_cache_is_read_and_written_by_the_caller(tmp_path, monkeypatch):
+    cache = ResultCache(str(tmp_path), max_bytes=10 * 1024 * 1024)
+    monkeypatch.setattr(audio_service, "get_result_cache", lambda: cache)
+    rng = np.random.default_rng(0)
+    signal = (0.1 * rng.standard_normal(5 * SAMPLE_RATE)).astype(np.float32)
+    extractor = AudioExtractor(engine="none", load_model=False)
+    calls = []
+
+    def compute(video_path, media, transcription_data, features, on_update):
+        # Stands for the worker process: no cache access, cached inputs are given
+        calls.append((transcription_data, features))
+        results = extractor.extract_all_metrics(video_path, audio=signal, transcription_data=transcription_data,
+                                                audio_features=features)
+        return results, len(signal) / SAMPLE_RATE
+
+    media = MediaSource("talk.mp4", content_hash="0" * 64, audio=signal)
+    first = audio_service.extract_audio_metrics("talk.mp4", media, compute=compute)
+    second = audio_service.extract_audio_metrics("talk.mp4", media, compute=compute)
+
+    assert calls[0] == (None, None)
+    cached_transcription, cached_features = calls[1]
+    assert cached_transcription["duree_secondes"] == 5.0
+    assert cached_features is not None
+    assert first["avg_volume"] == second["avg_volume"]
@@ -1,6 +1,8 @@
 from scoring.scoring_engine import compute_scores
 from scoring.global_score import compute_global_score
+from utils.instrumentation import instrumented
 
+@instrumented("compute_scores")
 def calculate_scores(vision_metrics: dict, audio_metrics: dict) -> dict:
     """Calculate all scores from vision and audio metrics"""
     scores = compute_scores(vision_metrics, audio_metrics)
@@ -1,13 +1,27 @@
-import cv2
 import mediapipe as mp
 from mediapipe.tasks import python
 from mediapipe.tasks.python import vision
 import numpy as np
 import os
+from services.model_registry import pose_landmarker
+from utils.instrumentation import add_counts, instrumented
+from utils.media_source import MediaSource
+from scoring.timeline import series_from_samples
+from config import (VISION_SAMPLING, VISION_MAX_FRAMES, VISION_FRAME_STEP,
+                    VISION_TARGET_FPS, VISION_MAX_LONG_EDGE)
 
 MODEL_PATH = "pose_landmarker_lite.task"
 MODEL_URL = "https://storage.googleapis.com/mediapipe-models/pose_landmarker/pose_landmarker_lite/float16/1/pose_landmarker_lite.task"
 
+# Frames given to the pose detector: temporal sampling and pre-inference downscaling
+DEFAULT_SAMPLING = {
+    "mode": VISION_SAMPLING,
+    "max_frames": VISION_MAX_FRAMES or None,
+    "step": VISION_FRAME_STEP,
+    "target_fps": VISION_TARGET_FPS,
+    "max_long_edge": VISION_MAX_LONG_EDGE or None
+}
+
 def download_model():
     """Download the MediaPipe model if not present"""
     if not os.path.exists(MODEL_PATH):
@@ -16,70 +30,97 @@ def download_model():
         urllib.request.urlretrieve(MODEL_URL, MODEL_PATH)
         print("Model downloaded.")
 
-def calculate_angle(a, b, c):
-    """Calculate angle in degrees between three points (a-b-c)"""
-    a = np.array(a)
-    b = np.array(b)
-    c = np.array(c)
-
+# PoseLandmarker landmark indices used by the metrics
+NOSE = 0
+LEFT_SHOULDER, RIGHT_SHOULDER = 11, 12
+LEFT_WRIST, RIGHT_WRIST = 15, 16
+LEFT_HIP, RIGHT_HIP = 23, 24
+NUM_LANDMARKS = 33
+
+HEAD_ORIENTATIONS = ("front", "left", "right")
+
+class LandmarkBuffer:
+    """
+    Preallocated (frames, 33, 3) float32 array of the x, y, z landmarks of a clip,
+    with the timestamp of each detection
+    """
+
+    def __init__(self, capacity: int):
+        self._data = np.empty((max(1, capacity), NUM_LANDMARKS, 3), dtype=np.float32)
+        self._times_ms = np.empty(max(1, capacity), dtype=np.int64)
+        self._size = 0
+
+    def append(self, pose_landmarks, timestamp_ms: int = 0):
+        if self._size == len(self._data):
+            # More detections than expected (several poses per frame): double the capacity
+            self._data = np.concatenate([self._data, np.empty_like(self._data)])
+            self._times_ms = np.concatenate([self._times_ms, np.empty_like(self._times_ms)])
+        self._data[self._size] = [(landmark.x, landmark.y, landmark.z) for landmark in pose_landmarks]
+        self._times_ms[self._size] = timestamp_ms
+        self._size += 1
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def array(self) -> np.ndarray:
+        return self._data[:self._size]
+
+    @property
+    def times(self) -> np.ndarray:
+        """Detection timestamps in seconds"""
+        return self._times_ms[:self._size] / 1000
+
+def calculate_angles(a, b, c):
+    """Angles in degrees between three points (a-b-c), for arrays of shape (n, 2)"""
     ba = a - b
     bc = c - b
 
-    cosine_angle = np.dot(ba, bc) / (np.linalg.norm(ba) * np.linalg.norm(bc))
+    cosine_angle = np.einsum("ij,ij->i", ba, bc) / (np.linalg.norm(ba, axis=1) * np.linalg.norm(bc, axis=1))
     angle = np.arccos(np.clip(cosine_angle, -1.0, 1.0))
     return np.degrees(angle)
 
-def head_orientation(landmarks):
-    """Detect head orientation: front / left / right"""
-    left_shoulder = [landmarks[11].x, landmarks[11].y]
-    right_shoulder = [landmarks[12].x, landmarks[12].y]
-    nose = [landmarks[0].x, landmarks[0].y]
-
-    shoulder_mid = [(left_shoulder[0] + right_shoulder[0])/2,
-                    (left_shoulder[1] + right_shoulder[1])/2]
-
-    dx = nose[0] - shoulder_mid[0]
-    if abs(dx) < 0.05:
-        return "front"
-    elif dx > 0:
-        return "right"
-    else:
-        return "left"
+def head_orientations(nose, left_shoulder, right_shoulder):
+    """Head orientation of each frame as an index into HEAD_ORIENTATIONS (front / left / right)"""
+    dx = nose[:, 0] - (left_shoulder[:, 0] + right_shoulder[:, 0]) / 2
+    return np.where(np.abs(dx) < 0.05, 0, np.where(dx > 0, 2, 1))
 
-def analyze_frame(landmarks):
-    """Analyze a frame and return metrics"""
-    left_shoulder = landmarks[11]
-    right_shoulder = landmarks[12]
-    left_hip = landmarks[23]
-    right_hip = landmarks[24]
+def analyze_landmarks(landmarks: np.ndarray) -> dict:
+    """
+    Compute the vision metrics of a whole clip at once
 
-    shoulder_mid = [(left_shoulder.x + right_shoulder.x)/2,
-                    (left_shoulder.y + right_shoulder.y)/2]
-    hip_mid = [(left_hip.x + right_hip.x)/2,
-               (left_hip.y + right_hip.y)/2]
+    Args:
+        landmarks: (frames, 33, 3) array of pose landmarks
 
-    posture_angle = calculate_angle([left_shoulder.x, left_shoulder.y], shoulder_mid, hip_mid)
-    posture_score_raw = np.clip((180 - posture_angle)/90, 0, 1)
+    Returns:
+        Per-frame posture scores, gesture activities and head orientation indices
+        (unrounded; rounding only happens on the aggregated values)
+    """
+    # Only the x, y coordinates of the landmarks used below, upcast once for the math
+    points = landmarks[:, :, :2].astype(np.float64)
+    nose = points[:, NOSE]
+    left_shoulder, right_shoulder = points[:, LEFT_SHOULDER], points[:, RIGHT_SHOULDER]
+    left_wrist, right_wrist = points[:, LEFT_WRIST], points[:, RIGHT_WRIST]
 
-    left_wrist = landmarks[15]
-    right_wrist = landmarks[16]
+    shoulder_mid = (left_shoulder + right_shoulder) / 2
+    hip_mid = (points[:, LEFT_HIP] + points[:, RIGHT_HIP]) / 2
 
-    gesture_activity = np.linalg.norm(np.array([left_wrist.x, left_wrist.y]) - np.array([left_shoulder.x, left_shoulder.y])) \
-                     + np.linalg.norm(np.array([right_wrist.x, right_wrist.y]) - np.array([right_shoulder.x, right_shoulder.y]))
+    posture_angle = calculate_angles(left_shoulder, shoulder_mid, hip_mid)
+    posture_score_raw = np.clip((180 - posture_angle) / 90, 0, 1)
 
-    head_dir = head_orientation(landmarks)
+    gesture_activity = np.linalg.norm(left_wrist - left_shoulder, axis=1) \
+                     + np.linalg.norm(right_wrist - right_shoulder, axis=1)
 
     return {
-        "posture_score_raw": round(posture_score_raw, 2),
-        "gesture_activity": round(gesture_activity, 2),
-        "head_orientation": head_dir
+        "posture_score_raw": posture_score_raw,
+        "gesture_activity": gesture_activity,
+        "head_orientation": head_orientations(nose, left_shoulder, right_shoulder)
     }
 
-def extract_vision_metrics(video_path: str) -> dict:
-    """Extract vision metrics from video"""
+def create_pose_landmarker():
+    """Create a PoseLandmarker in VIDEO mode (downloads the model if needed)"""
     download_model()
 
-    # Initialize PoseLandmarker
     base_options = python.BaseOptions(model_asset_path=MODEL_PATH)
     options = vision.PoseLandmarkerOptions(
         base_options=base_options,
@@ -88,54 +129,56 @@ def extract_vision_metrics(video_path: str) -> dict:
         min_pose_presence_confidence=0.5,
         min_tracking_confidence=0.5
     )
-
-    with vision.PoseLandmarker.create_from_options(options) as landmarker:
-        cap = cv2.VideoCapture(video_path)
-
-        if not cap.isOpened():
-            raise ValueError("Cannot open video file.")
-
-        metrics_list = []
-        frame_count = 0
-        max_frames = 900  # Limit to 900 frames for processing
-
-        while cap.isOpened() and frame_count < max_frames:
-            ret, frame = cap.read()
-            if not ret:
-                break
-
-            # Convert BGR to RGB
-            image_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-
+    return vision.PoseLandmarker.create_from_options(options)
+
+@instrumented("pose_detection")
+def extract_vision_metrics(video_path: str, media: MediaSource = None, sampling: dict = None) -> dict:
+    """
+    Extract vision metrics from video
+
+    `sampling` overrides the configured frame sampling (keyword arguments of
+    MediaSource.frames: mode, max_frames, step, target_fps, max_long_edge)
+    """
+    media = media or MediaSource(video_path)
+    sampling = {**DEFAULT_SAMPLING, **(sampling or {})}
+
+    # Landmarks of the whole clip go into one preallocated array
+    capacity = sampling["max_frames"] or media.video_info()["frame_count"]
+    buffer = LandmarkBuffer(capacity)
+
+    # Borrow a shared PoseLandmarker from the registry instead of building one per call
+    frames = 0
+    with pose_landmarker() as landmarker:
+        for timestamp_ms, image_rgb in media.frames(**sampling):
+            frames += 1
             mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=image_rgb)
 
             # Detect pose
-            timestamp_ms = int(cap.get(cv2.CAP_PROP_POS_MSEC))
             pose_landmarker_result = landmarker.detect_for_video(mp_image, timestamp_ms)
 
             # If landmarks detected
-            if pose_landmarker_result.pose_landmarks:
-                for pose_landmarks in pose_landmarker_result.pose_landmarks:
-                    metrics = analyze_frame(pose_landmarks)
-                    metrics_list.append(metrics)
-
-            frame_count += 1
+            for pose_landmarks in pose_landmarker_result.pose_landmarks:
+                buffer.append(pose_landmarks, timestamp_ms)
 
-        cap.release()
+    add_counts(frames=frames, poses=len(buffer))
+    if not len(buffer):
+        raise ValueError("No pose detected in video")
 
-        if not metrics_list:
-            raise ValueError("No pose detected in video")
+    # Aggregate metrics
+    metrics = analyze_landmarks(buffer.array)
 
-        # Aggregate metrics
-        posture_scores = [m["posture_score_raw"] for m in metrics_list]
-        gesture_activities = [m["gesture_activity"] for m in metrics_list]
-        head_orientations = [m["head_orientation"] for m in metrics_list]
+    # Most common head orientation (ties go to the first of front / left / right)
+    counts = np.bincount(metrics["head_orientation"], minlength=len(HEAD_ORIENTATIONS))
+    most_common_head = HEAD_ORIENTATIONS[int(counts.argmax())]
 
-        # Use most common head orientation
-        most_common_head = max(set(head_orientations), key=head_orientations.count)
-
-        return {
-            "posture_score_raw": round(np.mean(posture_scores), 2),
-            "gesture_activity": round(np.mean(gesture_activities), 2),
-            "head_orientation": most_common_head
-        }
\ No newline at end of file
+    return {
+        "posture_score_raw": round(float(np.mean(metrics["posture_score_raw"])), 2),
+        "gesture_activity": round(float(np.mean(metrics["gesture_activity"])), 2),
+        "head_orientation": most_common_head,
+        # Per-second sums for the timeline (the per-frame values are not kept)
+        "series": series_from_samples(buffer.times, {
+            "posture": metrics["posture_score_raw"],
+            "gesture": metrics["gesture_activity"],
+            "eye_contact": metrics["head_orientation"] == 0
+        })
+    }
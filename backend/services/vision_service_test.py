@@ -0,0 +1,145 @@
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from services import vision_service
+from services.vision_service import NUM_LANDMARKS, LandmarkBuffer, analyze_landmarks, extract_vision_metrics
+
+
+# ===================== Per-frame computation replaced by analyze_landmarks (reference) =====================
+
+def calculate_angle(a, b, c):
+    a, b, c = np.array(a), np.array(b), np.array(c)
+    ba, bc = a - b, c - b
+    cosine_angle = np.dot(ba, bc) / (np.linalg.norm(ba) * np.linalg.norm(bc))
+    return np.degrees(np.arccos(np.clip(cosine_angle, -1.0, 1.0)))
+
+
+def head_orientation(landmarks):
+    dx = landmarks[0].x - (landmarks[11].x + landmarks[12].x) / 2
+    if abs(dx) < 0.05:
+        return "front"
+    return "right" if dx > 0 else "left"
+
+
+def analyze_frame(landmarks, rounded=True):
+    left_shoulder, right_shoulder = landmarks[11], landmarks[12]
+    left_hip, right_hip = landmarks[23], landmarks[24]
+    shoulder_mid = [(left_shoulder.x + right_shoulder.x) / 2, (left_shoulder.y + right_shoulder.y) / 2]
+    hip_mid = [(left_hip.x + right_hip.x) / 2, (left_hip.y + right_hip.y) / 2]
+    posture_angle = calculate_angle([left_shoulder.x, left_shoulder.y], shoulder_mid, hip_mid)
+    posture_score_raw = np.clip((180 - posture_angle) / 90, 0, 1)
+    left_wrist, right_wrist = landmarks[15], landmarks[16]
+    gesture_activity = np.linalg.norm(np.array([left_wrist.x, left_wrist.y]) - np.array([left_shoulder.x, left_shoulder.y])) \
+        + np.linalg.norm(np.array([right_wrist.x, right_wrist.y]) - np.array([right_shoulder.x, right_shoulder.y]))
+    keep = (lambda value: round(value, 2)) if rounded else float
+    return {
+        "posture_score_raw": keep(posture_score_raw),
+        "gesture_activity": keep(gesture_activity),
+        "head_orientation": head_orientation(landmarks)
+    }
+
+
+def aggregate(metrics_list):
+    head_orientations = [m["head_orientation"] for m in metrics_list]
+    return {
+        "posture_score_raw": round(np.mean([m["posture_score_raw"] for m in metrics_list]), 2),
+        "gesture_activity": round(np.mean([m["gesture_activity"] for m in metrics_list]), 2),
+        "head_orientation": max(set(head_orientations), key=head_orientations.count)
+    }
+
+
+# ===================== Random poses =====================
+
+def random_pose(rng):
+    """33 landmarks as MediaPipe gives them (float32 values), upper body roughly upright"""
+    points = rng.uniform(0, 1, size=(NUM_LANDMARKS, 3)).astype(np.float32)
+    points[11, :2] = rng.uniform([0.55, 0.2], [0.75, 0.4])   # Left shoulder
+    points[12, :2] = rng.uniform([0.25, 0.2], [0.45, 0.4])   # Right shoulder
+    points[23, :2] = rng.uniform([0.5, 0.6], [0.7, 0.8])     # Left hip
+    points[24, :2] = rng.uniform([0.3, 0.6], [0.5, 0.8])     # Right hip
+    points[0, 0] = (points[11, 0] + points[12, 0]) / 2 + rng.uniform(-0.12, 0.12)  # Nose
+    return [SimpleNamespace(x=float(x), y=float(y), z=float(z)) for x, y, z in points]
+
+
+def random_clip(rng, n_frames):
+    """Detections per frame: none, one, or (rarely) two poses"""
+    return [[random_pose(rng) for _ in range(rng.choice([0, 1, 1, 1, 2]))] for _ in range(n_frames)]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_analyze_landmarks_matches_per_frame_metrics(seed):
+    rng = np.random.default_rng(seed)
+    poses = [pose for frame in random_clip(rng, 200) for pose in frame]
+    buffer = LandmarkBuffer(capacity=50)  # Grows past its capacity
+    for index, pose in enumerate(poses):
+        buffer.append(pose, timestamp_ms=index * 40)
+
+    metrics = analyze_landmarks(buffer.array)
+    expected = [analyze_frame(pose, rounded=False) for pose in poses]
+
+    np.testing.assert_allclose(metrics["posture_score_raw"], [m["posture_score_raw"] for m in expected],
+                               rtol=0, atol=1e-12)
+    np.testing.assert_allclose(metrics["gesture_activity"], [m["gesture_activity"] for m in expected],
+                               rtol=0, atol=1e-12)
+    assert [vision_service.HEAD_ORIENTATIONS[i] for i in metrics["head_orientation"]] == \
+        [m["head_orientation"] for m in expected]
+    np.testing.assert_array_equal(buffer.times, np.arange(len(poses)) * 40 / 1000)
+
+
+class FakeMedia:
+    def __init__(self, n_frames):
+        self.n_frames = n_frames
+
+    def video_info(self):
+        return {"fps": 25.0, "frame_count": self.n_frames, "width": 8, "height": 8}
+
+    def frames(self, **sampling):
+        for index in range(self.n_frames):
+            yield index * 40, np.zeros((8, 8, 3), dtype=np.uint8)
+
+
+def use_detections(monkeypatch, clip):
+    class FakeLandmarker:
+        def detect_for_video(self, image, timestamp_ms):
+            return SimpleNamespace(pose_landmarks=clip[timestamp_ms // 40])
+
+    @contextmanager
+    def fake_pose_landmarker():
+        yield FakeLandmarker()
+
+    monkeypatch.setattr(vision_service, "pose_landmarker", fake_pose_landmarker)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_extract_vision_metrics_matches_per_frame_aggregation(monkeypatch, seed):
+    rng = np.random.default_rng(seed)
+    clip = random_clip(rng, 120)
+    use_detections(monkeypatch, clip)
+
+    result = extract_vision_metrics("talk.mp4", FakeMedia(len(clip)), sampling={"max_frames": None})
+
+    metrics_list = [analyze_frame(pose) for frame in clip for pose in frame]
+    expected = aggregate(metrics_list)
+    # Per-frame values are no longer rounded before the mean: at most one step of the final rounding
+    assert abs(result["posture_score_raw"] - expected["posture_score_raw"]) <= 0.01 + 1e-9
+    assert abs(result["gesture_activity"] - expected["gesture_activity"]) <= 0.01 + 1e-9
+    head_counts = [sum(m["head_orientation"] == h for m in metrics_list) for h in ("front", "left", "right")]
+    if sorted(head_counts)[-1] != sorted(head_counts)[-2]:  # Ties were resolved arbitrarily by the old code
+        assert result["head_orientation"] == expected["head_orientation"]
+    assert sum(result["series"]["metrics"]["posture"]["count"]) == len(metrics_list)
+
+
+def test_frames_without_pose_are_skipped_and_no_pose_at_all_fails(monkeypatch):
+    rng = np.random.default_rng(0)
+    pose = random_pose(rng)
+    use_detections(monkeypatch, [[], [pose], [], []])
+
+    result = extract_vision_metrics("talk.mp4", FakeMedia(4), sampling={"max_frames": None})
+    assert result["posture_score_raw"] == round(float(analyze_frame(pose, rounded=False)["posture_score_raw"]), 2)
+
+    use_detections(monkeypatch, [[], [], []])
+    with pytest.raises(ValueError, match="No pose detected"):
+        extract_vision_metrics("talk.mp4", FakeMedia(3), sampling={"max_frames": None})
@@ -0,0 +1,124 @@
+"""
+Incremental MP4 / QuickTime header probe, fed with the upload as it arrives.
+
+The container is a sequence of boxes (4-byte size + 4-byte type). A valid
+file starts with `ftyp`; the `moov` box lists the tracks, and an audio track
+has a `hdlr` box whose handler type is `soun`. `moov` is usually written
+before the media data (fast start), so most bad uploads are detected from
+their first chunks.
+"""
+import struct
+from typing import Optional
+
+# Boxes that only contain other boxes, on the way from moov to the track handlers
+_CONTAINER_BOXES = {b"moov", b"trak", b"mdia"}
+_MAX_MOOV_SIZE = 64 * 1024 * 1024
+
+
+class ContainerError(ValueError):
+    """The data is not a readable MP4 / QuickTime container"""
+
+
+def _iter_boxes(data: bytes):
+    """(type, payload) of the boxes laid out back to back in `data`"""
+    offset = 0
+    while offset + 8 <= len(data):
+        size, box_type = struct.unpack(">I4s", data[offset:offset + 8])
+        header = 8
+        if size == 1:
+            size = struct.unpack(">Q", data[offset + 8:offset + 16])[0]
+            header = 16
+        elif size == 0:
+            size = len(data) - offset
+        if size < header or offset + size > len(data):
+            raise ContainerError("Truncated box in the movie header")
+        yield box_type, data[offset + header:offset + size]
+        offset += size
+
+
+def _handler_types(data: bytes):
+    for box_type, payload in _iter_boxes(data):
+        if box_type in _CONTAINER_BOXES:
+            yield from _handler_types(payload)
+        elif box_type == b"hdlr" and len(payload) >= 12:
+            # version/flags (4) + pre_defined (4) + handler_type (4)
+            yield payload[8:12]
+
+
+class Mp4Probe:
+    """
+    Parse the top-level boxes of a stream chunk by chunk.
+
+    Only box headers and the `moov` box are kept in memory; media data is
+    skipped. `has_audio` stays None until `moov` has been read.
+    """
+
+    def __init__(self):
+        self._buffer = b""
+        self._skip = 0          # Bytes of the current box still to skip
+        self._moov = None       # Bytes of moov collected so far
+        self._moov_size = 0
+        self._boxes = 0
+        self.has_audio: Optional[bool] = None
+
+    @property
+    def complete(self) -> bool:
+        """True once the track list has been read"""
+        return self.has_audio is not None
+
+    def feed(self, chunk: bytes):
+        """Consume the next chunk, raises ContainerError on an invalid header"""
+        while chunk:
+            if self._skip:
+                consumed = min(self._skip, len(chunk))
+                self._skip -= consumed
+                chunk = chunk[consumed:]
+                continue
+
+            if self._moov is not None:
+                needed = self._moov_size - len(self._moov)
+                self._moov.extend(chunk[:needed])
+                chunk = chunk[needed:]
+                if len(self._moov) == self._moov_size:
+                    self.has_audio = b"soun" in set(_handler_types(bytes(self._moov)))
+                    self._moov = None
+                continue
+
+            self._buffer += chunk
+            chunk = b""
+            if len(self._buffer) < 16:
+                return
+            chunk = self._start_box()
+
+    def _start_box(self) -> bytes:
+        """Read the header at the start of the buffer, return the bytes after it"""
+        size, box_type = struct.unpack(">I4s", self._buffer[:8])
+        header = 8
+        if size == 1:
+            size = struct.unpack(">Q", self._buffer[8:16])[0]
+            header = 16
+
+        if self._boxes == 0 and box_type != b"ftyp":
+            raise ContainerError("Not an MP4 file (missing ftyp box)")
+        if size == 0:
+            # Last box, runs to the end of the file
+            size = float("inf")
+        elif size < header:
+            raise ContainerError(f"Invalid size for box {box_type!r}")
+        self._boxes += 1
+
+        rest, self._buffer = self._buffer[header:], b""
+        if box_type == b"moov" and not self.complete:
+            if size > _MAX_MOOV_SIZE:
+                raise ContainerError("Movie header too large")
+            self._moov, self._moov_size = bytearray(), size - header
+        else:
+            self._skip = size - header
+        return rest
+
+    def finish(self):
+        """Check the whole stream was a complete container"""
+        if self._boxes == 0:
+            raise ContainerError("Not an MP4 file (missing ftyp box)")
+        if not self.complete:
+            raise ContainerError("Incomplete MP4 file (missing moov box)")
@@ -1,18 +1,102 @@
+import hashlib
 import os
-import shutil
+from dataclasses import dataclass
 from pathlib import Path
 
+from audio.scratch import owned_name, reap_stale
+from config import STALE_FILE_MAX_AGE_SECONDS, UPLOAD_CHUNK_SIZE, UPLOAD_MAX_BYTES, UPLOAD_REQUIRE_AUDIO
+from utils.container_probe import ContainerError, Mp4Probe
+from utils.instrumentation import instrumented
+
 UPLOAD_DIR = Path("data/videos")
+CHUNK_SIZE = 1024 * 1024
+
+class UploadError(ValueError):
+    """Upload rejected before analysis, `status_code` is the HTTP answer"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+@dataclass
+class StoredUpload:
+    path: str
+    content_hash: str
+    size: int
+    has_audio: bool
 
-def save_uploaded_video(file, filename: str) -> str:
-    """Save uploaded video file and return the path"""
+@instrumented("upload", counts=lambda upload: {"bytes": upload.size})
+def save_uploaded_video(file, filename: str, max_bytes: int = UPLOAD_MAX_BYTES,
+                        chunk_size: int = UPLOAD_CHUNK_SIZE,
+                        require_audio: bool = UPLOAD_REQUIRE_AUDIO) -> StoredUpload:
+    """
+    Stream an uploaded video to disk, hashing and probing it on the way
+
+    The file is copied in fixed-size chunks (unbuffered, one write per chunk).
+    The SHA-256 is updated as chunks arrive and the MP4 header is parsed
+    incrementally: a non-MP4 file, a video without an audio track (when the
+    track list comes first) or a file over `max_bytes` is rejected as soon as
+    it is detected, and the partial copy is removed.
+
+    Raises:
+        UploadError: 413 (too large), 415 (not an MP4) or 422 (no audio track)
+    """
     UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
     file_path = UPLOAD_DIR / filename
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file, buffer)
-    return str(file_path)
+    digest = hashlib.sha256()
+    probe = Mp4Probe()
+    size = 0
+
+    try:
+        with open(file_path, "wb", buffering=0) as buffer:
+            for chunk in iter(lambda: file.read(chunk_size), b""):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadError(413, f"Video larger than {max_bytes // (1024 * 1024)} MB")
+                probe.feed(chunk)
+                if require_audio and probe.has_audio is False:
+                    raise UploadError(422, "The video has no audio track")
+                digest.update(chunk)
+                buffer.write(chunk)
+        probe.finish()
+        if require_audio and not probe.has_audio:
+            raise UploadError(422, "The video has no audio track")
+    except ContainerError as e:
+        cleanup_video(str(file_path))
+        raise UploadError(415, f"Invalid MP4 file: {e}") from e
+    except BaseException:
+        cleanup_video(str(file_path))
+        raise
+
+    return StoredUpload(str(file_path), digest.hexdigest(), size, probe.has_audio)
+
+def upload_filename() -> str:
+    """Unique name of a stored upload, tagged with the process that owns it"""
+    return owned_name("upload", ".mp4")
+
+def reap_stale_files(keep=(), max_age: float = STALE_FILE_MAX_AGE_SECONDS) -> int:
+    """
+    Remove the uploads and scratch files left by crashed or stopped processes
+
+    Args:
+        keep: Uploads still needed (videos of unfinished jobs)
+        max_age: Files untouched for this long are removed even if their process still runs
+
+    Returns:
+        Number of removed files
+    """
+    return reap_stale(max_age, root=UPLOAD_DIR, keep=keep) + reap_stale(max_age)
 
 def cleanup_video(file_path: str):
     """Remove the video file after processing"""
     if os.path.exists(file_path):
-        os.remove(file_path)
\ No newline at end of file
+        os.remove(file_path)
+
+def hash_file(file_path: str) -> str:
+    """SHA-256 of a file, read in fixed-size chunks"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
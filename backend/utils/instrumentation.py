@@ -0,0 +1,231 @@
+"""
+Lightweight spans for the analysis pipeline.
+
+A span measures a block of blocking code: wall time, CPU time of the calling
+thread, resident and peak RSS deltas, and item counts (frames, words...).
+Every span is aggregated process-wide for the Prometheus `/metrics` endpoint;
+spans opened inside a `trace()` are also kept as a per-request breakdown.
+The current trace lives in a context variable, copied to the pool threads by
+`services.executor`.
+"""
+import contextvars
+import functools
+import resource
+import threading
+import time
+from contextlib import contextmanager
+
+# Wall time histogram buckets (seconds)
+BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+_current_trace = contextvars.ContextVar("analysis_trace", default=None)
+_current_span = contextvars.ContextVar("analysis_span", default=None)
+
+_registry_lock = threading.Lock()
+_registry = {}
+
+
+def current_rss_mb() -> float:
+    """Current resident set size of the process in MB"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * resource.getpagesize() / (1024 * 1024)
+    except (OSError, IndexError, ValueError):
+        # No /proc (macOS...): fall back to the peak RSS
+        return peak_rss_mb()
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of the process in MB (ru_maxrss is kB on Linux)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class Trace:
+    """Spans recorded while handling one request"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def add(self, record: dict):
+        with self._lock:
+            self.spans.append(record)
+
+    def breakdown(self) -> list:
+        """Finished spans ordered by start time"""
+        with self._lock:
+            return sorted(self.spans, key=lambda record: record["start_s"])
+
+
+class Span:
+    def __init__(self, name: str):
+        self.name = name
+        self.counts = {}
+
+    def count(self, **items):
+        """Add item counts (frames=..., words=...) to the span"""
+        for item, value in items.items():
+            self.counts[item] = self.counts.get(item, 0) + int(value)
+
+
+@contextmanager
+def trace():
+    """Collect the spans of the enclosed block (and of the pool tasks it starts)"""
+    current = Trace()
+    token = _current_trace.set(current)
+    try:
+        yield current
+    finally:
+        _current_trace.reset(token)
+
+
+@contextmanager
+def span(name: str, **counts):
+    """Measure a block of blocking code"""
+    current = Span(name)
+    current.count(**counts)
+    parent = _current_span.get()
+    token = _current_span.set(current)
+
+    rss_before, peak_before = current_rss_mb(), peak_rss_mb()
+    cpu_started = time.thread_time()
+    started = time.perf_counter()
+    failed = False
+    try:
+        yield current
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        wall = time.perf_counter() - started
+        cpu = time.thread_time() - cpu_started
+        _current_span.reset(token)
+
+        _aggregate(name, wall, cpu, current.counts, failed)
+        active = _current_trace.get()
+        if active is not None:
+            active.add({
+                "name": name,
+                "parent": parent.name if parent is not None else None,
+                "start_s": round(started - active.started, 4),
+                "wall_s": round(wall, 4),
+                "cpu_s": round(cpu, 4),
+                "rss_delta_mb": round(current_rss_mb() - rss_before, 1),
+                "peak_rss_delta_mb": round(peak_rss_mb() - peak_before, 1),
+                "thread": threading.current_thread().name,
+                "counts": current.counts,
+                "failed": failed
+            })
+
+
+def instrumented(name: str, counts=None):
+    """
+    Decorator running the function inside a span
+
+    Args:
+        name: Span name
+        counts: Optional function(result) -> {item: count} added to the span
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name) as current:
+                result = fn(*args, **kwargs)
+                if counts is not None and result is not None:
+                    current.count(**counts(result))
+                return result
+        return wrapper
+    return decorator
+
+
+def import_spans(records: list, started: float, thread: str = None):
+    """
+    Record spans measured in another process (services.process_pool)
+
+    Args:
+        records: Trace breakdown of the other process
+        started: perf_counter() of this process when the work was dispatched
+        thread: Name reported instead of the thread of the other process
+    """
+    active = _current_trace.get()
+    for record in records:
+        _aggregate(record["name"], record["wall_s"], record["cpu_s"], record["counts"], record["failed"])
+        if active is not None:
+            active.add({**record, "start_s": round(started - active.started + record["start_s"], 4),
+                        "thread": thread or record["thread"]})
+
+
+def add_counts(**items):
+    """Add item counts to the innermost active span (no-op outside spans)"""
+    current = _current_span.get()
+    if current is not None:
+        current.count(**items)
+
+
+def _aggregate(name: str, wall: float, cpu: float, counts: dict, failed: bool):
+    with _registry_lock:
+        stats = _registry.setdefault(name, {
+            "count": 0, "errors": 0, "wall_sum": 0.0, "cpu_sum": 0.0,
+            "buckets": [0] * len(BUCKETS), "items": {}
+        })
+        stats["count"] += 1
+        stats["errors"] += failed
+        stats["wall_sum"] += wall
+        stats["cpu_sum"] += cpu
+        for index, bound in enumerate(BUCKETS):
+            if wall <= bound:
+                stats["buckets"][index] += 1
+        for item, value in counts.items():
+            stats["items"][item] = stats["items"].get(item, 0) + value
+
+
+def render_prometheus() -> str:
+    """Aggregated spans in the Prometheus text exposition format"""
+    with _registry_lock:
+        registry = {name: {**stats, "items": dict(stats["items"]), "buckets": list(stats["buckets"])}
+                    for name, stats in _registry.items()}
+
+    lines = [
+        "# HELP analysis_stage_seconds Wall time of the analysis stages.",
+        "# TYPE analysis_stage_seconds histogram"
+    ]
+    for name, stats in sorted(registry.items()):
+        for bound, value in zip(BUCKETS, stats["buckets"]):
+            lines.append(f'analysis_stage_seconds_bucket{{stage="{name}",le="{bound}"}} {value}')
+        lines.append(f'analysis_stage_seconds_bucket{{stage="{name}",le="+Inf"}} {stats["count"]}')
+        lines.append(f'analysis_stage_seconds_sum{{stage="{name}"}} {stats["wall_sum"]:.6f}')
+        lines.append(f'analysis_stage_seconds_count{{stage="{name}"}} {stats["count"]}')
+
+    lines += [
+        "# HELP analysis_stage_cpu_seconds_total CPU time of the analysis stages (calling thread).",
+        "# TYPE analysis_stage_cpu_seconds_total counter"
+    ]
+    lines += [f'analysis_stage_cpu_seconds_total{{stage="{name}"}} {stats["cpu_sum"]:.6f}'
+              for name, stats in sorted(registry.items())]
+
+    lines += [
+        "# HELP analysis_stage_errors_total Analysis stages that raised an exception.",
+        "# TYPE analysis_stage_errors_total counter"
+    ]
+    lines += [f'analysis_stage_errors_total{{stage="{name}"}} {stats["errors"]}'
+              for name, stats in sorted(registry.items())]
+
+    lines += [
+        "# HELP analysis_stage_items_total Items processed by the analysis stages (frames, words...).",
+        "# TYPE analysis_stage_items_total counter"
+    ]
+    for name, stats in sorted(registry.items()):
+        for item, value in sorted(stats["items"].items()):
+            lines.append(f'analysis_stage_items_total{{stage="{name}",item="{item}"}} {value}')
+
+    lines += [
+        "# HELP process_resident_memory_bytes Resident memory size in bytes.",
+        "# TYPE process_resident_memory_bytes gauge",
+        f"process_resident_memory_bytes {int(current_rss_mb() * 1024 * 1024)}",
+        "# HELP process_peak_resident_memory_bytes Peak resident memory size in bytes.",
+        "# TYPE process_peak_resident_memory_bytes gauge",
+        f"process_peak_resident_memory_bytes {int(peak_rss_mb() * 1024 * 1024)}"
+    ]
+    return "\n".join(lines) + "\n"
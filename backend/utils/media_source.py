@@ -0,0 +1,157 @@
+import threading
+import cv2
+import numpy as np
+from audio.audio_decoding import SAMPLE_RATE, decode_audio
+from utils.file_handler import hash_file
+from utils.instrumentation import span
+
+SAMPLING_MODES = ("all", "every_n", "target_fps", "uniform")
+
+
+class MediaSource:
+    """
+    An uploaded video decoded once and shared by the audio and vision pipelines.
+
+    The audio track is decoded a single time into an in-memory 16 kHz mono
+    float32 buffer (no temporary WAV); video frames are decoded lazily by
+    `frames()` as the pose detector consumes them. `content_hash` identifies
+    the upload for the result cache.
+    """
+
+    def __init__(self, video_path: str, sample_rate: int = SAMPLE_RATE, content_hash: str = None,
+                 audio: np.ndarray = None):
+        self.video_path = str(video_path)
+        self.sample_rate = sample_rate
+        self._audio = audio  # Already decoded by another process (services.process_pool)
+        self._audio_lock = threading.Lock()
+        self._content_hash = content_hash
+        self._hash_lock = threading.Lock()
+
+    @property
+    def content_hash(self) -> str:
+        """SHA-256 of the video file, computed in chunks on first access unless given"""
+        if self._content_hash is None:
+            with self._hash_lock:
+                if self._content_hash is None:
+                    self._content_hash = hash_file(self.video_path)
+        return self._content_hash
+
+    @property
+    def audio(self) -> np.ndarray:
+        """PCM buffer of the audio track, decoded on first access"""
+        if self._audio is None:
+            with self._audio_lock:
+                if self._audio is None:
+                    with span("audio_decode") as decoding:
+                        self._audio = decode_audio(self.video_path, sr=self.sample_rate)
+                        decoding.count(samples=len(self._audio))
+        return self._audio
+
+    def video_info(self) -> dict:
+        """Frame rate, frame count and size read from the container header"""
+        cap = cv2.VideoCapture(self.video_path)
+        try:
+            return {
+                "fps": cap.get(cv2.CAP_PROP_FPS) or 0.0,
+                "frame_count": int(cap.get(cv2.CAP_PROP_FRAME_COUNT)),
+                "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            }
+        finally:
+            cap.release()
+
+    def frames(self, mode: str = "all", max_frames: int = None, step: int = 1,
+               target_fps: float = None, max_long_edge: int = None):
+        """
+        Iterate over sampled video frames
+
+        Args:
+            mode: "all" (every frame), "every_n" (one frame out of `step`),
+                "target_fps" (about `target_fps` frames per second of video) or
+                "uniform" (`max_frames` frames spread over the whole video)
+            max_frames: Maximum number of frames yielded
+            step: Frame step of the "every_n" mode
+            target_fps: Sampling rate of the "target_fps" mode
+            max_long_edge: Downscale frames so their long edge is at most this many pixels
+
+        Yields:
+            (timestamp_ms, frame) with the frame converted to RGB; timestamps are
+            those of the source frames, so skipped frames do not shift them
+        """
+        if mode not in SAMPLING_MODES:
+            raise ValueError(f"Unknown frame sampling mode: {mode}")
+
+        cap = cv2.VideoCapture(self.video_path)
+        if not cap.isOpened():
+            raise ValueError("Cannot open video file.")
+
+        try:
+            if mode == "uniform":
+                sampled = self._sample_uniform(cap, max_frames or 900)
+            else:
+                sampled = self._sample_sequential(cap, mode, step, target_fps)
+
+            for frame_count, (timestamp_ms, frame) in enumerate(sampled):
+                if max_frames is not None and frame_count >= max_frames:
+                    break
+                yield timestamp_ms, self._prepare(frame, max_long_edge)
+        finally:
+            cap.release()
+
+    @staticmethod
+    def _prepare(frame, max_long_edge):
+        """Downscale (before the color conversion, on fewer pixels) and convert BGR to RGB"""
+        height, width = frame.shape[:2]
+        if max_long_edge and max(height, width) > max_long_edge:
+            scale = max_long_edge / max(height, width)
+            frame = cv2.resize(frame, (round(width * scale), round(height * scale)),
+                               interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+    @staticmethod
+    def _sample_sequential(cap, mode, step, target_fps):
+        # Skipped frames are only grabbed (demuxed and decoded, never converted)
+        interval_ms = 1000.0 / target_fps if mode == "target_fps" else None
+        next_due_ms = 0.0
+        index = 0
+
+        while cap.grab():
+            timestamp_ms = cap.get(cv2.CAP_PROP_POS_MSEC)
+            if mode == "every_n":
+                keep = index % max(1, step) == 0
+            elif mode == "target_fps":
+                keep = timestamp_ms >= next_due_ms
+                while next_due_ms <= timestamp_ms:
+                    next_due_ms += interval_ms
+            else:
+                keep = True
+            index += 1
+
+            if keep:
+                ret, frame = cap.retrieve()
+                if not ret:
+                    break
+                yield int(timestamp_ms), frame
+
+    @staticmethod
+    def _sample_uniform(cap, count):
+        total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        if total <= 0:
+            return
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        # Seeking restarts decoding from the previous keyframe: only worth it for large gaps
+        seek_gap = int(2 * fps)
+
+        position = 0
+        for target in np.unique(np.linspace(0, total - 1, count).round().astype(int)):
+            if target - position > seek_gap:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, int(target))
+            else:
+                for _ in range(target - position):
+                    cap.grab()
+            position = target + 1
+
+            ret, frame = cap.read()
+            if not ret:
+                break
+            yield int(cap.get(cv2.CAP_PROP_POS_MSEC)), frame
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Benchmark côte à côte des moteurs de transcription : temps de chargement,
+latence, facteur temps réel, et accord des horodatages par mot avec le
+moteur de référence (mots alignés sur le texte, écarts de début et de fin)
+
+Usage :
+    python benchmarks/bench_transcription_engines.py enregistrement.mp4
+    python benchmarks/bench_transcription_engines.py a.wav b.mp4 --engines whisper faster-whisper \\
+        --model small --compute-type int8 --save-fixture transcription.json
+"""
+
+import argparse
+import contextlib
+import difflib
+import io
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Ajouter le répertoire racine au path pour les imports (audio.*)
+sys.path.append(str(Path(__file__).parent.parent))
+
+from audio.audio_decoding import SAMPLE_RATE, decode_audio
+from audio.transcription_engines import ENGINES, create_engine
+
+
+def load_signal(path):
+    """Signal float32 mono à 16 kHz (FFmpeg, ou librosa pour les fichiers audio)"""
+    try:
+        return decode_audio(path)
+    except (OSError, RuntimeError):
+        import librosa
+
+        return librosa.load(path, sr=SAMPLE_RATE)[0]
+
+
+def timed_words(result):
+    """(mot normalisé, début, fin) de chaque mot horodaté"""
+    words = []
+    for segment in result["segments"]:
+        for word in segment.get("words") or []:
+            token = re.sub(r"[^\w']", "", word["word"].lower())
+            if token:
+                words.append((token, word["start"], word["end"]))
+    return words
+
+
+def agreement(reference, candidate):
+    """Mots de la référence retrouvés et écarts d'horodatage des mots alignés"""
+    ref_words, cand_words = timed_words(reference), timed_words(candidate)
+    matcher = difflib.SequenceMatcher(a=[w[0] for w in ref_words], b=[w[0] for w in cand_words],
+                                      autojunk=False)
+    pairs = [(ref_words[block.a + k], cand_words[block.b + k])
+             for block in matcher.get_matching_blocks() for k in range(block.size)]
+    if not pairs:
+        return {"matched": 0.0}
+
+    start_diff = np.abs([cand[1] - ref[1] for ref, cand in pairs])
+    end_diff = np.abs([cand[2] - ref[2] for ref, cand in pairs])
+    return {
+        "matched": len(pairs) / max(len(ref_words), 1),
+        "start_median": float(np.median(start_diff)),
+        "start_p95": float(np.percentile(start_diff, 95)),
+        "end_median": float(np.median(end_diff)),
+        "within_100ms": float(np.mean((start_diff <= 0.1) & (end_diff <= 0.1))),
+    }
+
+
+def run_engine(name, args, signal):
+    options = {}
+    if name == "faster-whisper":
+        options = {"compute_type": args.compute_type, "cpu_threads": args.cpu_threads}
+    elif name == "fixture":
+        options = {"path": args.fixture}
+    engine = create_engine(name, args.model, **options)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        engine.load()
+        load_seconds = time.perf_counter() - start
+
+        best, result = float("inf"), None
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            result = engine.transcribe(signal)
+            best = min(best, time.perf_counter() - start)
+    return load_seconds, best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("files", nargs="+")
+    parser.add_argument("--engines", nargs="+", choices=list(ENGINES), default=["whisper", "faster-whisper"])
+    parser.add_argument("--reference", choices=list(ENGINES), help="Moteur de référence (par défaut le premier)")
+    parser.add_argument("--model", default="base", help="Taille du modèle Whisper")
+    parser.add_argument("--compute-type", default="int8", help="Type des poids de faster-whisper")
+    parser.add_argument("--cpu-threads", type=int, default=0)
+    parser.add_argument("--fixture", help="Transcription JSON rejouée par le moteur fixture")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--save-fixture", metavar="FICHIER",
+                        help="Enregistrer la transcription de référence (utilisable par le moteur fixture)")
+    args = parser.parse_args()
+    reference_name = args.reference or args.engines[0]
+    engines = [reference_name] + [name for name in args.engines if name != reference_name]
+
+    for path in args.files:
+        signal = load_signal(path)
+        duration = len(signal) / SAMPLE_RATE
+        print(f"\n{path} : {duration:.1f}s d'audio, référence {reference_name}\n")
+        print(f"{'moteur':>15} | {'chargement':>10} | {'latence':>8} | {'x temps réel':>12} | {'mots':>5} | "
+              f"{'mots retrouvés':>14} | {'Δ début méd.':>12} | {'Δ début p95':>11} | {'Δ fin méd.':>10} | {'≤ 100 ms':>8}")
+
+        reference = None
+        for name in engines:
+            try:
+                load_seconds, latency, result = run_engine(name, args, signal)
+            except Exception as e:
+                # Moteur non installé (faster-whisper...) ou sans fixture : signalé, pas bloquant
+                print(f"{name:>15} | ignoré : {type(e).__name__}: {e}")
+                continue
+
+            if name == reference_name:
+                reference = result
+                if args.save_fixture:
+                    with open(args.save_fixture, "w", encoding="utf-8") as f:
+                        json.dump(result, f, ensure_ascii=False, indent=2, default=float)
+
+            scores = agreement(reference, result) if reference is not None else {"matched": float("nan")}
+            details = (f"{scores['start_median'] * 1000:>10.0f}ms | {scores['start_p95'] * 1000:>9.0f}ms | "
+                       f"{scores['end_median'] * 1000:>8.0f}ms | {scores['within_100ms']:>8.0%}"
+                       if "start_median" in scores else f"{'-':>12} | {'-':>11} | {'-':>10} | {'-':>8}")
+            print(f"{name:>15} | {load_seconds:>9.2f}s | {latency:>7.2f}s | {duration / latency:>11.1f}x | "
+                  f"{len(timed_words(result)):>5} | {scores['matched']:>14.0%} | {details}")
+
+
+if __name__ == "__main__":
+    main()
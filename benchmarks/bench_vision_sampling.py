@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark des modes d'échantillonnage et de réduction de résolution de
+extract_vision_metrics : temps, frames analysées par seconde et écart des
+métriques par rapport à l'analyse de toutes les frames
+
+Usage : python benchmarks/bench_vision_sampling.py video1.mp4 [video2.mp4...]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Ajouter le backend au path pour les imports (services.*, utils.*, config)
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent.parent / "backend"))
+
+from services.vision_service import extract_vision_metrics
+from utils.media_source import MediaSource
+
+# Référence : toutes les frames, pleine résolution, sans limite
+REFERENCE = {"mode": "all", "max_frames": None, "max_long_edge": None}
+
+CONFIGURATIONS = [
+    ("every_n 2", {"mode": "every_n", "step": 2}),
+    ("every_n 4", {"mode": "every_n", "step": 4}),
+    ("10 fps", {"mode": "target_fps", "target_fps": 10}),
+    ("5 fps", {"mode": "target_fps", "target_fps": 5}),
+    ("uniform 150", {"mode": "uniform", "max_frames": 150}),
+    ("all 640px", {"mode": "all", "max_long_edge": 640}),
+    ("10 fps 640px", {"mode": "target_fps", "target_fps": 10, "max_long_edge": 640}),
+    ("5 fps 480px", {"mode": "target_fps", "target_fps": 5, "max_long_edge": 480}),
+]
+
+
+def count_frames(video_path, sampling):
+    return sum(1 for _ in MediaSource(video_path).frames(**sampling))
+
+
+def run(video_path, sampling):
+    sampling = {"max_frames": None, "max_long_edge": None, **sampling}
+    start = time.perf_counter()
+    metrics = extract_vision_metrics(video_path, sampling=sampling)
+    elapsed = time.perf_counter() - start
+    return elapsed, count_frames(video_path, sampling), metrics
+
+
+def main(videos):
+    for video_path in videos:
+        info = MediaSource(video_path).video_info()
+        print(f"\n{video_path} : {info['width']}x{info['height']}, {info['fps']:.1f} fps, "
+              f"{info['frame_count']} frames\n")
+        print(f"{'mode':>13} | {'frames':>6} | {'temps':>7} | {'frames/s':>8} | "
+              f"{'Δ posture':>9} | {'Δ gestes':>8} | tête")
+
+        t_ref, n_ref, ref = run(video_path, REFERENCE)
+        print(f"{'référence':>13} | {n_ref:>6} | {t_ref:>6.2f}s | {n_ref / t_ref:>8.1f} | "
+              f"{ref['posture_score_raw']:>9.2f} | {ref['gesture_activity']:>8.2f} | {ref['head_orientation']}")
+
+        for name, sampling in CONFIGURATIONS:
+            elapsed, n_frames, metrics = run(video_path, sampling)
+            d_posture = metrics["posture_score_raw"] - ref["posture_score_raw"]
+            d_gesture = metrics["gesture_activity"] - ref["gesture_activity"]
+            same_head = "=" if metrics["head_orientation"] == ref["head_orientation"] else metrics["head_orientation"]
+            print(f"{name:>13} | {n_frames:>6} | {elapsed:>6.2f}s | {n_frames / elapsed:>8.1f} | "
+                  f"{d_posture:>+9.2f} | {d_gesture:>+8.2f} | {same_head}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    main(sys.argv[1:])
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Suite de benchmarks reproductible des pipelines audio, vision et scoring
+
+Les médias sont générés localement (WAV synthétiques, MP4 d'un personnage en
+fil de fer) : aucune vidéo réelle ni service externe n'est nécessaire. Pour
+chaque cas et chaque taille d'entrée, on mesure le meilleur temps sur
+plusieurs répétitions, le débit et le pic de mémoire (tracemalloc, mesuré
+sur une exécution séparée pour ne pas fausser les temps).
+
+Usage :
+    python benchmarks/run_benchmarks.py                       # tous les cas
+    python benchmarks/run_benchmarks.py --only fillers scoring
+    python benchmarks/run_benchmarks.py --save ma-machine     # baselines/ma-machine.json
+    python benchmarks/run_benchmarks.py --compare ma-machine  # code 1 si régression
+    python benchmarks/run_benchmarks.py --compare reference   # baseline versionnée du dépôt
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+# Ajouter le répertoire racine (audio, scoring) et le backend (services) au path
+ROOT = Path(__file__).parent.parent
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / "backend"))
+
+from benchmarks.synthetic_media import (synthetic_metrics, synthetic_transcript,
+                                        write_stick_figure_mp4, write_wav)
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+# En dessous de cette durée, la mesure est dominée par le bruit : le temps n'est pas comparé
+MIN_COMPARED_SECONDS = 0.005
+
+SIZES = {
+    "audio_features": [30, 120, 600],            # secondes d'audio
+    "audio_features_stream": [30, 120, 600],
+    "fillers": [1_000, 10_000, 100_000],         # mots
+    "vision": [150, 450, 900],                   # frames (30 fps, 640x360)
+    "scoring": [100, 1_000, 10_000],             # couples de métriques
+    "scoring_batch": [100, 1_000, 10_000],
+    "timeline": [600, 3_600, 10_800],            # secondes de vidéo
+    "feedback_template": [100, 1_000, 10_000],   # feedbacks
+    "topic": [1_000, 10_000, 100_000],           # mots
+}
+QUICK_SIZES = {
+    "audio_features": [30], "audio_features_stream": [30], "fillers": [1_000],
+    "vision": [150], "scoring": [100], "scoring_batch": [100], "timeline": [600],
+    "feedback_template": [100], "topic": [1_000],
+}
+UNITS = {
+    "audio_features": "s audio", "audio_features_stream": "s audio", "fillers": "mots",
+    "vision": "frames", "scoring": "scores", "scoring_batch": "scores", "timeline": "s vidéo",
+    "feedback_template": "feedbacks", "topic": "mots",
+}
+
+
+def measure(fn, repeat):
+    """Meilleur temps sur `repeat` exécutions, puis pic mémoire sur une exécution tracée"""
+    # Les messages de progression des extracteurs ne sont pas affichés pendant les mesures
+    with contextlib.redirect_stdout(io.StringIO()):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+
+        tracemalloc.start()
+        try:
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return best, peak / (1024 * 1024)
+
+
+# ===================== CAS DE BENCHMARK =====================
+# Chaque cas prépare ses entrées (hors mesure) et retourne la fonction à mesurer
+
+def case_audio_features(size, workdir, pitch_method, stream=False):
+    from audio.audio_extraction import AudioExtractor
+
+    extractor = AudioExtractor(pitch_method=pitch_method, load_model=False,
+                               stream_block_seconds=30 if stream else None)
+    wav_path = write_wav(workdir / f"speech_{size}s.wav", size)
+    return lambda: extractor.analyze_audio_features(str(wav_path))
+
+
+def case_fillers(size, workdir, pitch_method):
+    from audio.audio_extraction import AudioExtractor
+
+    extractor = AudioExtractor(load_model=False)
+    text, segments = synthetic_transcript(size)
+    return lambda: extractor.detect_fillers(text, "fr", segments)
+
+
+def case_topic(size, workdir, pitch_method):
+    from feedback.topic_index import classify_topic
+
+    text, _ = synthetic_transcript(size)
+    return lambda: classify_topic(text, "fr")
+
+
+def case_vision(size, workdir, pitch_method):
+    from services.vision_service import extract_vision_metrics
+
+    video_path = write_stick_figure_mp4(workdir / f"stick_{size}.mp4", size)
+    sampling = {"mode": "all", "max_frames": None}
+    return lambda: extract_vision_metrics(str(video_path), sampling=sampling)
+
+
+def case_scoring(size, workdir, pitch_method):
+    from scoring.global_score import compute_global_score
+    from scoring.scoring_engine import compute_scores
+
+    metrics = synthetic_metrics(size)
+
+    def run():
+        for vision_metrics, audio_metrics in metrics:
+            compute_global_score(compute_scores(vision_metrics, audio_metrics))
+    return run
+
+
+def case_scoring_batch(size, workdir, pitch_method):
+    from scoring.batch_scoring import compute_global_score_batch, compute_scores_batch, metric_columns
+
+    # Mêmes sessions que le cas scoring, converties en colonnes hors mesure
+    vision, audio = metric_columns([{"vision_metrics": vision_metrics, "audio_metrics": audio_metrics}
+                                    for vision_metrics, audio_metrics in synthetic_metrics(size)])
+    return lambda: compute_global_score_batch(compute_scores_batch(vision, audio))
+
+
+def case_timeline(size, workdir, pitch_method):
+    from scoring.timeline import build_timeline, merge_series, series_from_samples
+
+    # Séries d'une vidéo de `size` secondes : pose à 10 fps, audio à 31 frames/s, 2,5 mots/s
+    rng = np.random.default_rng(0)
+    pose_times, frame_times = np.arange(0, size, 0.1), np.arange(0, size, 0.032)
+    series = merge_series(
+        series_from_samples(pose_times, {"posture": rng.random(len(pose_times)),
+                                         "gesture": rng.random(len(pose_times)) * 3,
+                                         "eye_contact": rng.random(len(pose_times)) > 0.3}),
+        series_from_samples(frame_times, {"volume": rng.random(len(frame_times)) * 0.1,
+                                          "pitch": 150 + 40 * rng.standard_normal(len(frame_times))},
+                            squares=("pitch",)),
+        series_from_samples(np.sort(rng.random(int(size * 2.5))) * size,
+                            {"speech_rate": np.ones(int(size * 2.5))}, rates=("speech_rate",))
+    )
+    return lambda: build_timeline(series)
+
+
+def case_feedback_template(size, workdir, pitch_method):
+    from feedback.feedback_generator import detect_weaknesses
+    from feedback.template_feedback import template_feedback
+    from scoring.global_score import compute_global_score
+    from scoring.scoring_engine import compute_scores
+
+    # Profils des sessions synthétiques du cas scoring, calculés hors mesure
+    profiles = []
+    for index, (vision_metrics, audio_metrics) in enumerate(synthetic_metrics(size)):
+        scores = compute_scores(vision_metrics, audio_metrics)
+        profiles.append((scores, compute_global_score(scores), detect_weaknesses(scores),
+                         ("fr", "en")[index % 2]))
+
+    def run():
+        for scores, global_score, weaknesses, language in profiles:
+            template_feedback(scores, global_score, weaknesses, "general", language)
+    return run
+
+
+CASES = {
+    "audio_features": case_audio_features,
+    "audio_features_stream": lambda size, workdir, pitch: case_audio_features(size, workdir, pitch, stream=True),
+    "fillers": case_fillers,
+    "vision": case_vision,
+    "scoring": case_scoring,
+    "scoring_batch": case_scoring_batch,
+    "timeline": case_timeline,
+    "feedback_template": case_feedback_template,
+    "topic": case_topic,
+}
+
+
+def run_suite(names, sizes, repeat, pitch_method):
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        for name in names:
+            for size in sizes[name]:
+                label = f"{name}[{size}]"
+                try:
+                    fn = CASES[name](size, workdir, pitch_method)
+                    seconds, peak_mb = measure(fn, repeat)
+                except Exception as e:
+                    # Dépendance absente (modèle de pose, FFmpeg...) : le cas est signalé, pas bloquant
+                    print(f"{label:>30} | ignoré : {type(e).__name__}: {e}")
+                    continue
+                results[label] = {
+                    "seconds": round(seconds, 5),
+                    "throughput": round(size / seconds, 2),
+                    "unit": f"{UNITS[name]}/s",
+                    "peak_mb": round(peak_mb, 2),
+                }
+                print(f"{label:>30} | {seconds:>9.4f}s | {size / seconds:>12.1f} {UNITS[name]}/s | "
+                      f"pic {peak_mb:>8.2f} Mo")
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Retourne les cas plus lents (ou plus gourmands) que la baseline au-delà de la tolérance"""
+    regressions = []
+    print(f"\nComparaison à la baseline (tolérance {tolerance:.0%})\n")
+    for label, current in results.items():
+        reference = baseline["results"].get(label)
+        if reference is None:
+            continue
+        time_ratio = current["seconds"] / reference["seconds"]
+        memory_ratio = current["peak_mb"] / reference["peak_mb"] if reference["peak_mb"] else 1.0
+        timed = max(current["seconds"], reference["seconds"]) >= MIN_COMPARED_SECONDS
+        flag = ""
+        if (timed and time_ratio > 1 + tolerance) or memory_ratio > 1 + tolerance:
+            regressions.append(label)
+            flag = "  <-- RÉGRESSION"
+        print(f"{label:>30} | temps x{time_ratio:5.2f} | mémoire x{memory_ratio:5.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", nargs="+", choices=list(CASES), default=list(CASES))
+    parser.add_argument("--quick", action="store_true", help="Une seule petite taille par cas")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--pitch", choices=["piptrack", "yin"], default="piptrack")
+    parser.add_argument("--save", metavar="NOM", help="Enregistrer les résultats dans baselines/NOM.json")
+    parser.add_argument("--compare", metavar="NOM", help="Comparer à baselines/NOM.json")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+    if args.compare and not (BASELINE_DIR / f"{args.compare}.json").exists():
+        available = ", ".join(sorted(path.stem for path in BASELINE_DIR.glob("*.json"))) or "aucune"
+        parser.error(f"baseline introuvable : baselines/{args.compare}.json (disponibles : {available})")
+
+    results = run_suite(args.only, QUICK_SIZES if args.quick else SIZES, args.repeat, args.pitch)
+
+    if args.save:
+        BASELINE_DIR.mkdir(exist_ok=True)
+        path = BASELINE_DIR / f"{args.save}.json"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "machine": platform.platform(),
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "pitch_method": args.pitch,
+                "repeat": args.repeat,
+                "results": results
+            }, f, ensure_ascii=False, indent=2)
+        print(f"\nBaseline enregistrée : {path}")
+
+    if args.compare:
+        with open(BASELINE_DIR / f"{args.compare}.json", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
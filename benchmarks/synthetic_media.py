@@ -0,0 +1,138 @@
+"""
+Médias de test synthétiques et reproductibles pour les benchmarks
+
+- WAV de durée contrôlée : ton harmonique (voix simplifiée), bruit, silences
+- MP4 d'un personnage en fil de fer qui bouge les bras et la tête
+- Transcriptions avec fillers et horodatage par mot (format des segments Whisper)
+"""
+
+import numpy as np
+import soundfile as sf
+
+SR = 16000
+
+WAV_PATTERNS = ("tone", "noise", "speech")
+
+WORDS_FR = ["nous", "allons", "présenter", "le", "projet", "de", "cette", "année", "avec",
+            "les", "résultats", "et", "la", "méthode", "pour", "chaque", "équipe"]
+FILLERS_FR = ["euh", "donc", "du coup", "en fait", "voilà", "bon"]
+
+
+def synthetic_audio(duration, pattern="speech", sr=SR, seed=0):
+    """
+    Signal mono float32 de `duration` secondes
+
+    Args:
+        pattern: "tone" (ton harmonique à F0 variable), "noise" (bruit blanc)
+            ou "speech" (ton + bruit, 1 s de silence toutes les 8 s)
+    """
+    if pattern not in WAV_PATTERNS:
+        raise ValueError(f"Motif inconnu : {pattern} (attendu : {', '.join(WAV_PATTERNS)})")
+
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(duration * sr)) / sr
+    if pattern == "noise":
+        return (0.05 * rng.standard_normal(len(t))).astype(np.float32)
+
+    f0 = 140 + 40 * np.sin(2 * np.pi * 0.3 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / sr
+    y = sum(0.1 / k * np.sin(k * phase) for k in range(1, 6))
+    if pattern == "speech":
+        y += 0.005 * rng.standard_normal(len(t))
+        y[(t % 8) > 7] *= 0.01
+    return y.astype(np.float32)
+
+
+def write_wav(path, duration, pattern="speech", sr=SR, seed=0):
+    """Écrit un WAV synthétique et retourne son chemin"""
+    sf.write(str(path), synthetic_audio(duration, pattern, sr, seed), sr, subtype="FLOAT")
+    return path
+
+
+def synthetic_transcript(n_words, filler_ratio=0.08, seed=0):
+    """
+    Texte de `n_words` mots avec des fillers, et segments horodatés par mot
+
+    Returns:
+        (texte, segments) au format de Whisper (word_timestamps=True)
+    """
+    rng = np.random.default_rng(seed)
+    words = []
+    while len(words) < n_words:
+        if rng.random() < filler_ratio:
+            words.extend(FILLERS_FR[rng.integers(len(FILLERS_FR))].split())
+        else:
+            words.append(WORDS_FR[rng.integers(len(WORDS_FR))])
+    words = words[:n_words]
+
+    # Un segment toutes les 20 mots, 0.4 s par mot
+    segments = []
+    for start in range(0, len(words), 20):
+        chunk = words[start:start + 20]
+        segments.append({
+            "text": " " + " ".join(chunk),
+            "words": [{"word": " " + word, "start": round((start + i) * 0.4, 2),
+                       "end": round((start + i) * 0.4 + 0.35, 2)} for i, word in enumerate(chunk)]
+        })
+    return " " + " ".join(words), segments
+
+
+def _stick_figure(frame, t, width, height):
+    """Dessine le personnage à l'instant t (bras qui bougent, tête qui tourne)"""
+    import cv2
+
+    cx, unit = width // 2, height / 10
+    head = (int(cx + 0.3 * unit * np.sin(2 * np.pi * 0.2 * t)), int(2 * unit))
+    neck = (cx, int(3 * unit))
+    hip = (cx, int(6.5 * unit))
+    shoulders = ((int(cx - 1.2 * unit), int(3.2 * unit)), (int(cx + 1.2 * unit), int(3.2 * unit)))
+
+    color = (230, 230, 230)
+    cv2.circle(frame, head, int(0.8 * unit), color, -1)
+    cv2.line(frame, neck, hip, color, max(2, int(unit / 4)))
+    cv2.line(frame, shoulders[0], shoulders[1], color, max(2, int(unit / 4)))
+    for side, shoulder in zip((-1, 1), shoulders):
+        angle = np.pi / 2 + side * (0.6 + 0.5 * np.sin(2 * np.pi * 0.5 * t + side))
+        wrist = (int(shoulder[0] + side * 2.5 * unit * abs(np.cos(angle))),
+                 int(shoulder[1] + 2.5 * unit * np.sin(angle)))
+        cv2.line(frame, shoulder, wrist, color, max(2, int(unit / 5)))
+        foot = (int(cx + side * 1.2 * unit), int(9.5 * unit))
+        cv2.line(frame, hip, foot, color, max(2, int(unit / 4)))
+
+
+def write_stick_figure_mp4(path, n_frames, fps=30, size=(640, 360)):
+    """Écrit un MP4 (sans audio) d'un personnage en mouvement et retourne son chemin"""
+    import cv2
+
+    width, height = size
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height))
+    try:
+        for index in range(n_frames):
+            frame = np.full((height, width, 3), 40, dtype=np.uint8)
+            _stick_figure(frame, index / fps, width, height)
+            writer.write(frame)
+    finally:
+        writer.release()
+    return path
+
+
+def synthetic_metrics(n, seed=0):
+    """`n` couples (métriques vision, métriques audio) au format de scoring_engine"""
+    rng = np.random.default_rng(seed)
+    orientations = ["front", "left", "right"]
+    return [
+        (
+            {
+                "posture_score_raw": float(rng.uniform(0, 1)),
+                "gesture_activity": float(rng.uniform(0, 2)),
+                "head_orientation": orientations[rng.integers(3)]
+            },
+            {
+                "speech_rate": float(rng.uniform(90, 200)),
+                "pitch_variation": float(rng.uniform(5, 60)),
+                "fillers_count": int(rng.integers(0, 30)),
+                "avg_volume": float(rng.uniform(0.005, 0.08))
+            }
+        )
+        for _ in range(n)
+    ]
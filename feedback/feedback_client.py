@@ -0,0 +1,188 @@
+"""
+Client de Gemini pour le feedback
+
+L'API est bloquante : generate s'appelle depuis n'importe quel thread (hors
+de la boucle) et attend la réponse. Les appels au modèle passent par
+client.aio sur une boucle asyncio dédiée (thread d'arrière-plan), partagée
+par tous les appelants :
+
+- cache LRU + TTL indexé par l'empreinte du prompt : deux sessions avec les
+  mêmes scores arrondis, faiblesses, sujet et langue ne coûtent qu'un appel
+- regroupement des requêtes : un prompt identique déjà en cours n'est pas
+  renvoyé, les appelants attendent la même réponse
+- délai maximal : au-delà (ou en cas d'erreur), la réponse de repli est
+  renvoyée et n'est pas mise en cache
+- nombre d'appels simultanés limité par un sémaphore
+"""
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+def prompt_fingerprint(model, prompt):
+    """Empreinte d'un prompt (espaces normalisés)"""
+    normalized = " ".join(prompt.split())
+    return hashlib.sha256(f"{model}\n{normalized}".encode("utf-8")).hexdigest()
+
+
+def parse_response(text):
+    """Réponse JSON du modèle, éventuellement entourée d'un bloc de code markdown"""
+    text = text.strip()
+    if text.startswith("```json"):
+        text = text[7:]
+    elif text.startswith("```"):
+        text = text[3:]
+    if text.endswith("```"):
+        text = text[:-3]
+    return json.loads(text.strip())
+
+
+def response_text(response):
+    """Texte d'une réponse generate_content"""
+    if getattr(response, "text", None):
+        return response.text
+    return response.candidates[0].content.parts[0].text
+
+
+class FeedbackClient:
+    """
+    Args:
+        client: genai.Client (seul client.aio est utilisé)
+        model: Modèle Gemini
+        timeout: Délai maximal d'une réponse, attente du sémaphore comprise (secondes)
+        max_concurrency: Appels simultanés au plus
+        cache_size: Nombre de réponses gardées en cache (0 = pas de cache)
+        cache_ttl: Durée de vie d'une réponse en cache (secondes)
+    """
+
+    def __init__(self, client, model, timeout=15.0, max_concurrency=4, cache_size=256, cache_ttl=3600.0):
+        self.client = client
+        self.model = model
+        self.timeout = timeout
+        self.max_concurrency = max(1, max_concurrency)
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+
+        # État manipulé uniquement depuis la boucle : pas de verrou
+        self._cache = OrderedDict()
+        self._in_flight = {}
+        self._semaphore = None
+        self._stats = dict.fromkeys(("hits", "misses", "coalesced", "timeouts", "errors"), 0)
+
+        self._loop = None
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    # ===================== BOUCLE D'ARRIÈRE-PLAN =====================
+
+    def _ensure_loop(self):
+        with self._start_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=loop.run_forever, name="feedback-client", daemon=True)
+                self._thread.start()
+                self._loop = loop
+        return self._loop
+
+    def generate(self, prompt, fallback):
+        """
+        Réponse JSON du modèle pour un prompt (bloquant, depuis n'importe quel thread hors de la boucle)
+
+        Args:
+            prompt: Prompt envoyé à Gemini
+            fallback: Fonction sans argument qui donne la réponse de repli
+
+        Returns:
+            (réponse, source) où source vaut "cache", "gemini" ou "fallback"
+        """
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(self._generate(prompt, fallback), loop).result()
+
+    def close(self):
+        with self._start_lock:
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._thread.join(timeout=5)
+                self._loop.close()
+                self._loop = None
+
+    # ===================== DANS LA BOUCLE =====================
+
+    def _cached(self, key):
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        expires, result = entry
+        if expires < time.monotonic():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return result
+
+    def _store(self, key, result):
+        if self.cache_size <= 0:
+            return
+        self._cache[key] = (time.monotonic() + self.cache_ttl, result)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def _generate(self, prompt, fallback):
+        key = prompt_fingerprint(self.model, prompt)
+        result = self._cached(key)
+        if result is not None:
+            self._stats["hits"] += 1
+            return result, "cache"
+
+        task = self._in_flight.get(key)
+        if task is None:
+            self._stats["misses"] += 1
+            task = asyncio.ensure_future(self._call(key, prompt))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self._stats["coalesced"] += 1
+
+        # shield : l'annulation d'un appelant n'annule pas l'appel des autres
+        result = await asyncio.shield(task)
+        if result is None:
+            return fallback(), "fallback"
+        return result, "gemini"
+
+    async def _call(self, key, prompt):
+        """Réponse du modèle (mise en cache), ou None après un délai dépassé ou une erreur"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def request():
+            async with self._semaphore:
+                response = await self.client.aio.models.generate_content(model=self.model, contents=prompt)
+            return parse_response(response_text(response))
+
+        try:
+            result = await asyncio.wait_for(request(), self.timeout)
+        except asyncio.TimeoutError:
+            self._stats["timeouts"] += 1
+            print(f"Gemini n'a pas répondu en {self.timeout:g}s, feedback de repli")
+            return None
+        except Exception as e:
+            self._stats["errors"] += 1
+            print(f"Erreur Gemini ({type(e).__name__}: {e}), feedback de repli")
+            return None
+
+        self._store(key, result)
+        return result
+
+    def get_stats(self):
+        return {
+            "model": self.model,
+            "cache_entries": len(self._cache),
+            "cache_size": self.cache_size,
+            "in_flight": len(self._in_flight),
+            "max_concurrency": self.max_concurrency,
+            "timeout_seconds": self.timeout,
+            **self._stats
+        }
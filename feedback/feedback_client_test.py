@@ -0,0 +1,153 @@
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from feedback.feedback_client import FeedbackClient, parse_response, prompt_fingerprint
+
+
+class StubGemini:
+    """Stands in for genai.Client: client.aio.models.generate_content"""
+
+    def __init__(self, delay=0.0, fail=None):
+        self.delay = delay
+        self.fail = fail
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self.aio = SimpleNamespace(models=SimpleNamespace(generate_content=self.generate_content))
+
+    async def generate_content(self, model, contents):
+        self.calls.append(contents)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail is not None:
+                raise self.fail
+            return SimpleNamespace(text="```json\n" + json.dumps({"summary": contents}) + "\n```")
+        finally:
+            self.active -= 1
+
+
+@pytest.fixture
+def make_client():
+    clients = []
+
+    def make(stub, **options):
+        client = FeedbackClient(stub, "gemini-test", **options)
+        clients.append(client)
+        return client
+
+    yield make
+    for client in clients:
+        client.close()
+
+
+def fallback():
+    return {"summary": "repli"}
+
+
+def test_concurrent_identical_prompts_make_one_call(make_client):
+    stub = StubGemini(delay=0.2)
+    client = make_client(stub)
+    start = threading.Barrier(8)
+
+    def ask():
+        start.wait()
+        return client.generate("même prompt", fallback)
+
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(lambda _: ask(), range(8)))
+
+    assert len(stub.calls) == 1
+    assert results == [({"summary": "même prompt"}, "gemini")] * 8
+    stats = client.get_stats()
+    assert (stats["misses"], stats["coalesced"], stats["in_flight"]) == (1, 7, 0)
+
+
+def test_cache_hit_within_the_ttl_and_expiry_after_it(make_client):
+    stub = StubGemini()
+    client = make_client(stub, cache_ttl=0.2)
+
+    assert client.generate("prompt", fallback)[1] == "gemini"
+    # Same prompt with other whitespace: same fingerprint
+    assert client.generate("  prompt\n", fallback) == ({"summary": "prompt"}, "cache")
+    time.sleep(0.25)
+    assert client.generate("prompt", fallback)[1] == "gemini"
+
+    assert len(stub.calls) == 2
+    assert client.get_stats()["hits"] == 1
+
+
+def test_cache_keeps_the_most_recent_prompts(make_client):
+    stub = StubGemini()
+    client = make_client(stub, cache_size=2)
+
+    for prompt in ("a", "b", "a", "c"):  # "a" is used again before "c" evicts the oldest entry
+        client.generate(prompt, fallback)
+
+    assert client.generate("a", fallback)[1] == "cache"
+    assert client.generate("b", fallback)[1] == "gemini"
+    assert client.get_stats()["cache_entries"] == 2
+
+
+def test_timeout_returns_the_fallback_and_is_not_cached(make_client):
+    stub = StubGemini(delay=1.0)
+    client = make_client(stub, timeout=0.05)
+
+    started = time.monotonic()
+    assert client.generate("lent", fallback) == ({"summary": "repli"}, "fallback")
+    assert time.monotonic() - started < 0.5
+
+    # The next request calls the model again
+    stub.delay = 0.0
+    assert client.generate("lent", fallback) == ({"summary": "lent"}, "gemini")
+    assert len(stub.calls) == 2
+    assert client.get_stats()["timeouts"] == 1
+
+
+def test_errors_return_the_fallback_and_are_not_cached(make_client):
+    stub = StubGemini(fail=RuntimeError("quota"))
+    client = make_client(stub)
+
+    assert client.generate("prompt", fallback) == ({"summary": "repli"}, "fallback")
+    assert client.generate("prompt", fallback)[1] == "fallback"
+
+    assert len(stub.calls) == 2
+    assert client.get_stats()["errors"] == 2 and client.get_stats()["cache_entries"] == 0
+
+
+def test_invalid_json_is_an_error(make_client):
+    stub = StubGemini()
+
+    async def not_json(model, contents):
+        return SimpleNamespace(text="Voici votre feedback !")
+
+    stub.aio.models.generate_content = not_json
+    client = make_client(stub)
+
+    assert client.generate("prompt", fallback)[1] == "fallback"
+    assert client.get_stats()["errors"] == 1
+
+
+def test_semaphore_limits_simultaneous_calls(make_client):
+    stub = StubGemini(delay=0.1)
+    client = make_client(stub, max_concurrency=2)
+
+    with ThreadPoolExecutor(6) as pool:
+        results = list(pool.map(lambda index: client.generate(f"prompt {index}", fallback), range(6)))
+
+    assert [source for _, source in results] == ["gemini"] * 6
+    assert len(stub.calls) == 6
+    assert stub.max_active == 2
+
+
+def test_fingerprint_and_response_parsing():
+    assert prompt_fingerprint("m", "a  b\nc") == prompt_fingerprint("m", "a b c")
+    assert prompt_fingerprint("m", "a b") != prompt_fingerprint("other", "a b")
+    assert parse_response('```\n{"a": 1}\n```') == parse_response('{"a": 1}') == {"a": 1}
@@ -3,35 +3,48 @@ import os
 import re
 from dotenv import load_dotenv
 from google import genai
+from google.genai import types
+
+from feedback.feedback_client import FeedbackClient
+from feedback.topic_index import classify_topic
+from feedback.template_feedback import is_common_profile, template_feedback
 
 load_dotenv()
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-3-flash-preview")
+# Délai maximal d'une réponse de Gemini, au-delà le feedback de repli est utilisé
+FEEDBACK_TIMEOUT_SECONDS = float(os.getenv("FEEDBACK_TIMEOUT_SECONDS", "15"))
+FEEDBACK_MAX_CONCURRENCY = int(os.getenv("FEEDBACK_MAX_CONCURRENCY", "4"))
+FEEDBACK_CACHE_SIZE = int(os.getenv("FEEDBACK_CACHE_SIZE", "256"))
+FEEDBACK_CACHE_TTL_SECONDS = float(os.getenv("FEEDBACK_CACHE_TTL_SECONDS", "3600"))
+# Choix entre phrases types et LLM : "template" (jamais de LLM), "llm" (toujours),
+# "hybrid" (LLM seulement pour les profils que les phrases types couvrent mal)
+FEEDBACK_POLICY = os.getenv("FEEDBACK_POLICY", "hybrid")
+FEEDBACK_TEMPLATE_MAX_WEAKNESSES = int(os.getenv("FEEDBACK_TEMPLATE_MAX_WEAKNESSES", "2"))
+FEEDBACK_TEMPLATE_MAX_SPREAD = float(os.getenv("FEEDBACK_TEMPLATE_MAX_SPREAD", "5"))
+if FEEDBACK_POLICY not in ("template", "llm", "hybrid"):
+    raise ValueError(f"FEEDBACK_POLICY inconnue : {FEEDBACK_POLICY} (template, llm ou hybrid)")
+
 # Configure Gemini API if key available
 api_key = os.getenv("GOOGLE_API_KEY")
 if api_key:
-    client = genai.Client()
+    # GEMINI_BASE_URL : autre point d'accès (proxy, serveur local de test)
+    base_url = os.getenv("GEMINI_BASE_URL")
+    client = genai.Client(http_options=types.HttpOptions(base_url=base_url) if base_url else None)
+    feedback_client = FeedbackClient(
+        client, GEMINI_MODEL,
+        timeout=FEEDBACK_TIMEOUT_SECONDS,
+        max_concurrency=FEEDBACK_MAX_CONCURRENCY,
+        cache_size=FEEDBACK_CACHE_SIZE,
+        cache_ttl=FEEDBACK_CACHE_TTL_SECONDS
+    )
 else:
     client = None
-    print("No GOOGLE_API_KEY found, using mock feedback")
-
-def detect_topic(transcription):
-    """Détecte le sujet de la présentation basé sur la transcription"""
-    text = transcription.lower()
-    technical_keywords = ['algorithme', 'code', 'data', 'machine learning', 'intelligence artificielle', 'technique', 'programmation']
-    emotional_keywords = ['sentiment', 'émotion', 'passion', 'cœur', 'amour', 'joie', 'tristesse', 'motivation']
-    business_keywords = ['business', 'entreprise', 'marché', 'stratégie', 'vente', 'client']
-
-    tech_count = sum(1 for word in technical_keywords if word in text)
-    emo_count = sum(1 for word in emotional_keywords if word in text)
-    bus_count = sum(1 for word in business_keywords if word in text)
-
-    if tech_count > emo_count and tech_count > bus_count:
-        return "technical"
-    elif emo_count > tech_count and emo_count > bus_count:
-        return "emotional"
-    elif bus_count > tech_count and bus_count > emo_count:
-        return "business"
-    else:
-        return "general"
+    feedback_client = None
+    print("No GOOGLE_API_KEY found, using template feedback")
+
+def detect_topic(transcription, language=None):
+    """Détecte le sujet de la présentation basé sur la transcription (voir topic_index.classify_topic)"""
+    return classify_topic(transcription, language)["topic"]
 
 def adjust_scores_for_topic(scores, topic):
     """Ajuste les poids des scores selon le sujet détecté"""
@@ -62,32 +75,11 @@ def detect_weaknesses(scores):
         weaknesses.append("voix")
     return weaknesses
 
-def generate_feedback(scores, global_score, weaknesses, transcription="", language="fr"):
-    """Generate feedback using Gemini in the specified language, adapté au sujet"""
-    # Détecter le sujet et ajuster les scores
-    topic = detect_topic(transcription) if transcription else "general"
-    adjusted_scores = adjust_scores_for_topic(scores, topic)
-    if not client:
-        # Mock response for demo purposes - defaults to French
-        if language == "en":
-            result = {
-                "summary": "Your presentation shows a solid foundation, particularly in posture and eye contact with the audience. However, the overall impact could be strengthened by working more on body expressiveness and voice dynamics.",
-                "recommendations": [
-                    "Use your hands more to accompany your key ideas and strengthen your message.",
-                    "Vary the tone and intensity of your voice to maintain audience attention.",
-                    "Continue to maintain eye contact with the audience while avoiding moments of stiffness."
-                ]
-            }
-        else:  # French (default)
-            result = {
-                "summary": "Votre présentation montre une base solide, notamment au niveau de la posture et du regard vers le public. Toutefois, l'impact global pourrait être renforcé en travaillant davantage l'expressivité corporelle et la dynamique de la voix.",
-                "recommendations": [
-                    "Utilisez davantage vos mains pour accompagner vos idées clés et renforcer votre message.",
-                    "Variez le ton et l'intensité de votre voix afin de maintenir l'attention de votre audience.",
-                    "Continuez à maintenir un regard orienté vers le public tout en évitant les moments de rigidité."
-                ]
-            }
-        return result
+def build_prompt(adjusted_scores, global_score, weaknesses, topic, language="fr"):
+    """Prompt envoyé à Gemini (scores arrondis : des sessions proches partagent le même prompt)"""
+    adjusted_scores = {key: round(value, 1) for key, value in adjusted_scores.items()
+                       if isinstance(value, (int, float))}
+    global_score = round(global_score, 1)
 
     # Language-specific prompts with explicit language instructions
     if language == "en":
@@ -140,24 +132,37 @@ def generate_feedback(scores, global_score, weaknesses, transcription="", langua
 
         Réponds en JSON avec clés "summary" et "recommendations" (liste de 3 strings), tout en FRANÇAIS.
         """
+    return prompt
 
-    response = client.models.generate_content(
-        model="gemini-3-flash-preview",
-        contents=prompt
-    )
-    # Extract text from response
-    if hasattr(response, 'text'):
-        text = response.text
-    else:
-        text = response.candidates[0].content.parts[0].text
-    # Remove markdown code block if present
-    if text.startswith('```json'):
-        text = text[7:]  # Remove ```json
-    if text.endswith('```'):
-        text = text[:-3]  # Remove ```
-    text = text.strip()
-    result = json.loads(text)
-    return result
+def use_template(adjusted_scores, weaknesses):
+    """Selon FEEDBACK_POLICY, le profil se contente-t-il des phrases types ?"""
+    if feedback_client is None or FEEDBACK_POLICY == "template":
+        return True
+    if FEEDBACK_POLICY == "llm":
+        return False
+    return is_common_profile(adjusted_scores, weaknesses,
+                             FEEDBACK_TEMPLATE_MAX_WEAKNESSES, FEEDBACK_TEMPLATE_MAX_SPREAD)
+
+def generate_feedback(scores, global_score, weaknesses, transcription="", language="fr"):
+    """
+    Generate feedback in the specified language, adapté au sujet : phrases types
+    ou Gemini selon FEEDBACK_POLICY
+
+    Returns:
+        {"summary", "recommendations", "source"} ; source vaut "template",
+        "gemini", "cache" ou "fallback" (Gemini trop lent ou en erreur : phrases types)
+    """
+    # Détecter le sujet et ajuster les scores
+    topic = detect_topic(transcription, language) if transcription else "general"
+    adjusted_scores = adjust_scores_for_topic(scores, topic)
+
+    local = lambda: template_feedback(adjusted_scores, global_score, weaknesses, topic, language)
+    if use_template(adjusted_scores, weaknesses):
+        return {**local(), "source": "template"}
+
+    prompt = build_prompt(adjusted_scores, global_score, weaknesses, topic, language)
+    result, source = feedback_client.generate(prompt, local)
+    return {**result, "source": source}
 
 if __name__ == "__main__":
     # Load scores
@@ -0,0 +1,121 @@
+import pytest
+
+from feedback import feedback_generator
+from feedback.feedback_generator import detect_weaknesses, generate_feedback, use_template
+from feedback.template_feedback import template_feedback
+
+COMMON = {"posture_score": 8, "gesture_score": 4, "eye_contact_score": 8,
+          "speech_rate_score": 6, "voice_modulation_score": 6}
+
+
+class StubClient:
+    """FeedbackClient stand-in recording the prompts"""
+
+    def __init__(self, source="gemini"):
+        self.source = source
+        self.prompts = []
+
+    def generate(self, prompt, fallback):
+        self.prompts.append(prompt)
+        if self.source == "fallback":
+            return fallback(), "fallback"
+        return {"summary": "sur mesure", "recommendations": ["a", "b", "c"]}, self.source
+
+
+@pytest.fixture
+def policy(monkeypatch):
+    def configure(name, api_key=True, source="gemini", max_weaknesses=2, max_spread=5.0):
+        client = StubClient(source) if api_key else None
+        monkeypatch.setattr(feedback_generator, "FEEDBACK_POLICY", name)
+        monkeypatch.setattr(feedback_generator, "feedback_client", client)
+        monkeypatch.setattr(feedback_generator, "FEEDBACK_TEMPLATE_MAX_WEAKNESSES", max_weaknesses)
+        monkeypatch.setattr(feedback_generator, "FEEDBACK_TEMPLATE_MAX_SPREAD", max_spread)
+        return client
+    return configure
+
+
+def test_hybrid_keeps_templates_for_common_profiles(policy):
+    client = policy("hybrid")
+
+    assert use_template(COMMON, detect_weaknesses(COMMON))
+    feedback = generate_feedback(COMMON, 6.5, detect_weaknesses(COMMON))
+
+    assert feedback["source"] == "template"
+    assert client.prompts == []
+
+
+def test_hybrid_uses_the_llm_beyond_max_weaknesses(policy):
+    policy("hybrid", max_weaknesses=2)
+    scores = {"posture_score": 4, "gesture_score": 4, "eye_contact_score": 4,
+              "speech_rate_score": 6, "voice_modulation_score": 6}
+
+    assert use_template(scores, ["posture", "gestuelle"])  # At the limit
+    assert not use_template(scores, ["posture", "gestuelle", "regard"])
+
+
+def test_hybrid_uses_the_llm_beyond_max_spread(policy):
+    client = policy("hybrid", max_spread=5.0)
+    at_limit = {**COMMON, "posture_score": 9}     # 9 - 4
+    beyond = {**COMMON, "posture_score": 9, "gesture_score": 3.5}
+
+    assert use_template(at_limit, ["gestuelle"])
+    assert not use_template(beyond, ["gestuelle"])
+
+    feedback = generate_feedback(beyond, 6.0, ["gestuelle"])
+    assert (feedback["summary"], feedback["source"]) == ("sur mesure", "gemini")
+    assert len(client.prompts) == 1
+
+
+def test_template_and_llm_policies(policy):
+    uncommon = {**COMMON, "posture_score": 10, "gesture_score": 1}
+
+    client = policy("template")
+    assert generate_feedback(uncommon, 5.0, ["gestuelle"])["source"] == "template"
+    assert client.prompts == []
+
+    client = policy("llm")
+    assert generate_feedback(COMMON, 6.5, ["gestuelle"])["source"] == "gemini"
+    assert len(client.prompts) == 1
+
+
+def test_no_api_key_always_uses_templates(policy):
+    uncommon = {**COMMON, "posture_score": 10, "gesture_score": 1}
+
+    for name in ("hybrid", "llm"):
+        policy(name, api_key=False)
+        assert use_template(uncommon, ["gestuelle", "posture", "regard"])
+        assert generate_feedback(uncommon, 5.0, ["gestuelle"])["source"] == "template"
+
+
+def test_gemini_fallback_gives_the_template_feedback(policy):
+    policy("llm", source="fallback")
+
+    feedback = generate_feedback(COMMON, 6.5, ["gestuelle"], language="en")
+
+    assert feedback == {**template_feedback(COMMON, 6.5, ["gestuelle"], "general", "en"), "source": "fallback"}
+
+
+def test_template_feedback_is_stable_for_a_profile():
+    feedback = template_feedback(COMMON, 6.5, ["gestuelle"], "technical", "fr")
+
+    assert feedback == {
+        "summary": "Votre présentation est convaincante dans l'ensemble, avec quelques axes de progrès bien "
+                   "identifiés. Sur un sujet technique, la clarté de vos explications repose autant sur votre "
+                   "corps que sur vos mots. Vous pouvez vous appuyer sur votre posture et votre regard vers le "
+                   "public. Pour gagner en impact, concentrez-vous sur votre gestuelle.",
+        "recommendations": [
+            "Utilisez davantage vos mains pour accompagner vos idées clés et renforcer votre message.",
+            "Illustrez chaque notion complexe par un exemple concret ou un geste qui la rend visible.",
+            "Continuez à garder cette posture stable et ouverte, elle inspire confiance.",
+        ],
+    }
+    # Same profile (bands of the scores), same feedback; the returned lists are copies
+    nearby = {**COMMON, "posture_score": 9.5, "speech_rate_score": 5.5}
+    assert template_feedback(nearby, 7.4, ["gestuelle"], "technical", "fr") == feedback
+    feedback["recommendations"].clear()
+    assert len(template_feedback(COMMON, 6.5, ["gestuelle"], "technical", "fr")["recommendations"]) == 3
+
+
+def test_template_feedback_unknown_language_and_topic():
+    assert template_feedback(COMMON, 6.5, ["gestuelle"], "cooking", "de") == \
+        template_feedback(COMMON, 6.5, ["gestuelle"], "general", "fr")
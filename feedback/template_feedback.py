@@ -0,0 +1,193 @@
+"""
+Feedback local à base de phrases types, sans appel au LLM
+
+Le feedback dépend uniquement du profil de la session : langue, sujet
+(detect_topic), tranche du score global, faiblesses (detect_weaknesses) et
+points forts. Toutes les combinaisons sont composées une fois au chargement
+du module : générer un feedback revient à une recherche dans un dictionnaire.
+"""
+import itertools
+
+CRITERIA = ("posture", "gestuelle", "regard", "voix")
+TOPICS = ("general", "technical", "emotional", "business")
+LANGUAGES = ("fr", "en")
+
+# Tranches de score (sur 10) : sous LOW_BAND c'est une faiblesse (detect_weaknesses),
+# à partir de HIGH_BAND un point fort
+LOW_BAND = 5.0
+HIGH_BAND = 7.5
+
+PHRASES = {
+    "fr": {
+        "opening": {
+            "low": "Votre présentation pose des bases sur lesquelles construire, et chaque point travaillé fera une vraie différence.",
+            "mid": "Votre présentation est convaincante dans l'ensemble, avec quelques axes de progrès bien identifiés.",
+            "high": "Votre présentation est maîtrisée et engageante : vous avez déjà les réflexes d'un bon orateur.",
+        },
+        "topic": {
+            "general": "",
+            "technical": "Sur un sujet technique, la clarté de vos explications repose autant sur votre corps que sur vos mots.",
+            "emotional": "Sur un sujet aussi personnel, votre voix et votre présence portent l'émotion du message.",
+            "business": "Dans un contexte professionnel, votre assurance compte autant que vos arguments.",
+        },
+        "names": {"posture": "votre posture", "gestuelle": "votre gestuelle",
+                  "regard": "votre regard vers le public", "voix": "votre voix"},
+        "and": " et ",
+        "strengths": "Vous pouvez vous appuyer sur {}.",
+        "weaknesses": "Pour gagner en impact, concentrez-vous sur {}.",
+        "no_weakness": "Aucun point faible majeur ne ressort : il s'agit maintenant d'affiner les détails.",
+        "fix": {
+            "posture": "Ancrez vos deux pieds au sol et gardez les épaules ouvertes pour dégager plus d'assurance.",
+            "gestuelle": "Utilisez davantage vos mains pour accompagner vos idées clés et renforcer votre message.",
+            "regard": "Balayez la salle du regard et revenez régulièrement vers le public plutôt que vers vos notes.",
+            "voix": "Variez le ton, le rythme et l'intensité de votre voix pour maintenir l'attention de votre audience.",
+        },
+        "topic_tip": {
+            "general": "Marquez une courte pause après chaque idée importante pour laisser le public l'assimiler.",
+            "technical": "Illustrez chaque notion complexe par un exemple concret ou un geste qui la rend visible.",
+            "emotional": "Appuyez-vous sur une anecdote personnelle pour rendre votre message plus touchant.",
+            "business": "Terminez par un message clair et une action précise attendue de votre auditoire.",
+        },
+        "keep": {
+            "posture": "Continuez à garder cette posture stable et ouverte, elle inspire confiance.",
+            "gestuelle": "Conservez cette gestuelle naturelle qui rend votre discours vivant.",
+            "regard": "Continuez à maintenir ce contact visuel qui crée un lien avec le public.",
+            "voix": "Gardez cette voix posée et expressive, elle porte bien votre message.",
+        },
+        "generic": (
+            "Répétez votre introduction à voix haute pour gagner en aisance dès les premières secondes.",
+            "Filmez-vous à nouveau pour mesurer vos progrès d'une session à l'autre.",
+        ),
+    },
+    "en": {
+        "opening": {
+            "low": "Your presentation lays foundations you can build on, and every point you work on will make a real difference.",
+            "mid": "Your presentation is convincing overall, with a few clear areas for improvement.",
+            "high": "Your presentation is confident and engaging: you already have the reflexes of a good speaker.",
+        },
+        "topic": {
+            "general": "",
+            "technical": "On a technical topic, the clarity of your explanations relies on your body as much as on your words.",
+            "emotional": "On such a personal topic, your voice and presence carry the emotion of the message.",
+            "business": "In a professional setting, your confidence matters as much as your arguments.",
+        },
+        "names": {"posture": "your posture", "gestuelle": "your gestures",
+                  "regard": "your eye contact with the audience", "voix": "your voice"},
+        "and": " and ",
+        "strengths": "You can rely on {}.",
+        "weaknesses": "To increase your impact, focus on {}.",
+        "no_weakness": "No major weakness stands out: it is now about refining the details.",
+        "fix": {
+            "posture": "Keep both feet grounded and your shoulders open to project more confidence.",
+            "gestuelle": "Use your hands more to accompany your key ideas and strengthen your message.",
+            "regard": "Sweep the room with your eyes and come back to the audience rather than to your notes.",
+            "voix": "Vary the tone, pace and intensity of your voice to keep your audience's attention.",
+        },
+        "topic_tip": {
+            "general": "Pause briefly after each important idea to let the audience absorb it.",
+            "technical": "Illustrate each complex notion with a concrete example or a gesture that makes it visible.",
+            "emotional": "Draw on a personal anecdote to make your message more moving.",
+            "business": "End with a clear message and a specific action you expect from your audience.",
+        },
+        "keep": {
+            "posture": "Keep this stable and open posture, it inspires confidence.",
+            "gestuelle": "Keep these natural gestures that make your speech lively.",
+            "regard": "Keep up this eye contact that builds a connection with the audience.",
+            "voix": "Keep this calm and expressive voice, it carries your message well.",
+        },
+        "generic": (
+            "Rehearse your introduction out loud to feel at ease from the very first seconds.",
+            "Film yourself again to measure your progress from one session to the next.",
+        ),
+    },
+}
+
+
+def band(score):
+    """Tranche d'un score sur 10 (low, mid ou high)"""
+    if score < LOW_BAND:
+        return "low"
+    return "high" if score >= HIGH_BAND else "mid"
+
+
+def criterion_scores(scores):
+    """Score de chaque critère de detect_weaknesses (la voix est la moyenne débit / modulation)"""
+    return {
+        "posture": scores["posture_score"],
+        "gestuelle": scores["gesture_score"],
+        "regard": scores["eye_contact_score"],
+        "voix": (scores["speech_rate_score"] + scores["voice_modulation_score"]) / 2,
+    }
+
+
+def _join(items, phrases):
+    names = [phrases["names"][item] for item in items]
+    if len(names) <= 1:
+        return "".join(names)
+    return ", ".join(names[:-1]) + phrases["and"] + names[-1]
+
+
+def _compose(language, topic, global_band, weaknesses, strengths):
+    phrases = PHRASES[language]
+    summary = [phrases["opening"][global_band], phrases["topic"][topic]]
+    if strengths:
+        summary.append(phrases["strengths"].format(_join(strengths, phrases)))
+    summary.append(phrases["weaknesses"].format(_join(weaknesses, phrases)) if weaknesses
+                   else phrases["no_weakness"])
+
+    # Faiblesses d'abord, puis conseil du sujet, points forts à garder, conseils génériques
+    candidates = [phrases["fix"][item] for item in weaknesses] + [phrases["topic_tip"][topic]] + \
+        [phrases["keep"][item] for item in strengths] + list(phrases["generic"])
+    return {
+        "summary": " ".join(sentence for sentence in summary if sentence),
+        "recommendations": candidates[:3],
+    }
+
+
+def _compile():
+    """Feedback de chaque profil (langue, sujet, tranche globale, faiblesses, points forts)"""
+    bank = {}
+    for language, topic, global_band in itertools.product(LANGUAGES, TOPICS, ("low", "mid", "high")):
+        # Chaque critère est faible, moyen ou fort
+        for bands in itertools.product(("low", "mid", "high"), repeat=len(CRITERIA)):
+            weaknesses = tuple(c for c, b in zip(CRITERIA, bands) if b == "low")
+            strengths = tuple(c for c, b in zip(CRITERIA, bands) if b == "high")
+            bank[(language, topic, global_band, weaknesses, strengths)] = \
+                _compose(language, topic, global_band, weaknesses, strengths)
+    return bank
+
+
+_BANK = _compile()
+
+
+def template_feedback(scores, global_score, weaknesses, topic="general", language="fr"):
+    """
+    Feedback du profil de la session
+
+    Args:
+        scores: Scores par critère (ajustés au sujet ou non)
+        global_score: Score global sur 10
+        weaknesses: Sortie de detect_weaknesses
+        topic: Sortie de detect_topic
+        language: "fr" ou "en" (français par défaut)
+
+    Returns:
+        {"summary", "recommendations"} (3 recommandations)
+    """
+    language = language if language in PHRASES else "fr"
+    topic = topic if topic in TOPICS else "general"
+    weak = set(weaknesses)
+    strengths = tuple(c for c, score in criterion_scores(scores).items()
+                      if c not in weak and score >= HIGH_BAND)
+    key = (language, topic, band(global_score), tuple(c for c in CRITERIA if c in weak), strengths)
+    result = _BANK[key]
+    return {"summary": result["summary"], "recommendations": list(result["recommendations"])}
+
+
+def is_common_profile(scores, weaknesses, max_weaknesses=2, max_spread=5.0):
+    """
+    Profil couvert par les phrases types : peu de faiblesses et des critères
+    d'un niveau comparable (un écart très marqué mérite un feedback sur mesure)
+    """
+    values = criterion_scores(scores).values()
+    return len(weaknesses) <= max_weaknesses and max(values) - min(values) <= max_spread
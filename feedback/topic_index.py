@@ -0,0 +1,131 @@
+"""
+Détection du sujet d'une présentation par index de mots-clés
+
+La transcription est parcourue une seule fois pour compter ses mots ; chaque
+mot distinct est ensuite cherché dans un index mot -> sujet construit au
+chargement du module (pluriels compris). Les mots-clés ne correspondent qu'à
+des mots entiers ("code" ne compte pas dans "encoder") et dépendent de la
+langue de la transcription.
+"""
+import re
+import unicodedata
+from collections import Counter
+
+TOPICS = ("technical", "emotional", "business")
+
+TOPIC_KEYWORDS = {
+    "fr": {
+        "technical": ["algorithme", "code", "data", "machine learning", "intelligence artificielle",
+                      "technique", "programmation"],
+        "emotional": ["sentiment", "émotion", "passion", "cœur", "amour", "joie", "tristesse", "motivation"],
+        "business": ["business", "entreprise", "marché", "stratégie", "vente", "client"],
+    },
+    "en": {
+        "technical": ["algorithm", "code", "data", "machine learning", "artificial intelligence",
+                      "technical", "programming"],
+        "emotional": ["feeling", "emotion", "passion", "heart", "love", "joy", "sadness", "motivation"],
+        "business": ["business", "company", "market", "strategy", "sales", "customer", "client"],
+    },
+}
+
+# Mots : lettres (accents, œ compris) ou chiffres ; l'apostrophe sépare ("l'algorithme")
+_WORD = re.compile(r"[^\W_]+")
+
+
+def tokenize(text):
+    """Mots en minuscules d'un texte (forme Unicode NFC)"""
+    return _WORD.findall(unicodedata.normalize("NFC", text).lower())
+
+
+def build_index(keywords):
+    """
+    Index d'un jeu de mots-clés {sujet: [mots-clés]}
+
+    Returns:
+        (index {mot: sujet} des mots-clés d'un mot et de leur pluriel en -s,
+         [(premier mot, motif, sujet)] des mots-clés de plusieurs mots)
+    """
+    index, phrases = {}, []
+    for topic, entries in keywords.items():
+        for keyword in entries:
+            words = tokenize(keyword)
+            if len(words) == 1:
+                index[words[0]] = topic
+            else:
+                pattern = re.compile(r"(?<!\w)" + r"\W+".join(map(re.escape, words)) + r"s?(?!\w)")
+                phrases.append((words[0], pattern, topic))
+    # Pluriels, sans remplacer un mot-clé ("sales" reste "sales")
+    for word, topic in list(index.items()):
+        index.setdefault(word + "s", topic)
+    return index, phrases
+
+
+def _merged(languages):
+    merged = {topic: [] for topic in TOPICS}
+    for language in languages:
+        for topic, entries in TOPIC_KEYWORDS[language].items():
+            merged[topic] += [keyword for keyword in entries if keyword not in merged[topic]]
+    return merged
+
+
+# Langue inconnue (None) : mots-clés de toutes les langues
+_INDEXES = {language: build_index(TOPIC_KEYWORDS[language]) for language in TOPIC_KEYWORDS}
+_INDEXES[None] = build_index(_merged(TOPIC_KEYWORDS))
+
+
+def classify_topic(text, language=None):
+    """
+    Sujet d'une transcription
+
+    Args:
+        text: Transcription
+        language: "fr", "en", ou None (mots-clés de toutes les langues)
+
+    Returns:
+        {"topic", "counts", "confidence"} : occurrences des mots-clés de chaque
+        sujet ; "general" si aucun sujet ne l'emporte strictement, avec une
+        confiance nulle, sinon confiance = part des occurrences du sujet retenu
+    """
+    index, phrases = _INDEXES.get(language, _INDEXES[None])
+    lowered = unicodedata.normalize("NFC", text or "").lower()
+    counts = dict.fromkeys(TOPICS, 0)
+
+    # Une passe (en C) sur le texte, puis une recherche par mot distinct
+    seen = set()
+    for token, occurrences in Counter(lowered.split()).items():
+        for word in _WORD.findall(token):  # "l'algorithme," -> "l", "algorithme"
+            seen.add(word)
+            topic = index.get(word)
+            if topic is not None:
+                counts[topic] += occurrences
+    # Mots-clés de plusieurs mots : seulement si leur premier mot apparaît
+    for first, pattern, topic in phrases:
+        if first in seen:
+            counts[topic] += len(pattern.findall(lowered))
+
+    total = sum(counts.values())
+    ranked = sorted(counts.values(), reverse=True)
+    if total == 0 or ranked[0] == ranked[1]:
+        return {"topic": "general", "counts": counts, "confidence": 0.0}
+    topic = max(counts, key=counts.get)
+    return {"topic": topic, "counts": counts, "confidence": round(counts[topic] / total, 3)}
+
+
+def classify_topics(transcriptions, languages=None):
+    """
+    classify_topic sur une série de transcriptions (archives de sessions)
+
+    Args:
+        transcriptions: Itérable de textes
+        languages: Langue commune, ou liste d'une langue par transcription
+
+    Returns:
+        Liste de résultats de classify_topic, dans l'ordre des transcriptions
+    """
+    transcriptions = list(transcriptions)
+    if languages is None or isinstance(languages, str):
+        languages = [languages] * len(transcriptions)
+    elif len(languages) != len(transcriptions):
+        raise ValueError(f"{len(languages)} langues pour {len(transcriptions)} transcriptions")
+    # Les index sont construits une fois au chargement du module, pour toutes les transcriptions
+    return [classify_topic(text, language) for text, language in zip(transcriptions, languages)]
@@ -0,0 +1,70 @@
+import unicodedata
+
+import pytest
+
+from feedback import topic_index
+from feedback.topic_index import classify_topic, classify_topics, tokenize
+
+
+def test_keywords_match_whole_words_only():
+    # "code" inside "encoder" / "décodage", "data" inside "database", "joie" inside "joies" is a plural
+    result = classify_topic("Il faut encoder puis décodage de la database, quelle joies", "fr")
+
+    assert result["counts"] == {"technical": 0, "emotional": 1, "business": 0}
+    assert classify_topic("l'algorithme, (code) et codes !", "fr")["counts"]["technical"] == 3
+
+
+def test_multi_word_keywords():
+    text = "Le Machine Learning et le machine-learning, pas une machine à laver ni learning seul"
+
+    assert classify_topic(text, "fr")["counts"]["technical"] == 2
+    assert classify_topic("artificial intelligences matter", "en")["counts"]["technical"] == 1
+
+
+def test_keyword_set_depends_on_the_language():
+    text = "customer sales heart"
+
+    assert classify_topic(text, "fr")["topic"] == "general"  # English keywords
+    assert classify_topic(text, "en")["counts"] == {"technical": 0, "emotional": 1, "business": 2}
+    # Unknown language: the keywords of every language
+    assert classify_topic(text, None)["counts"] == classify_topic(text, "en")["counts"]
+    assert classify_topic("cœur et customer", "de")["counts"] == {"technical": 0, "emotional": 1, "business": 1}
+
+
+def test_occurrence_counts_and_confidence():
+    text = "code code algorithme data " + "marché " + "passion"
+
+    result = classify_topic(text, "fr")
+
+    assert result == {"topic": "technical", "counts": {"technical": 4, "emotional": 1, "business": 1},
+                      "confidence": round(4 / 6, 3)}
+
+
+def test_no_match_and_ties_are_general():
+    assert classify_topic("Bonjour à tous, merci d'être venus", "fr") == \
+        {"topic": "general", "counts": {"technical": 0, "emotional": 0, "business": 0}, "confidence": 0.0}
+    assert classify_topic("", "fr")["topic"] == classify_topic(None)["topic"] == "general"
+    assert classify_topic("code client", "fr") == \
+        {"topic": "general", "counts": {"technical": 1, "emotional": 0, "business": 1}, "confidence": 0.0}
+
+
+def test_unicode_forms_are_normalized():
+    decomposed = unicodedata.normalize("NFD", "ÉMOTION et émotions")
+
+    assert classify_topic(decomposed, "fr")["counts"]["emotional"] == 2
+    assert tokenize(decomposed) == ["émotion", "et", "émotions"]
+
+
+def test_classify_topics_matches_one_by_one_classification(monkeypatch):
+    texts = ["le code et les data", "customer first", "", "joie et passion, code"]
+    languages = ["fr", "en", "fr", "fr"]
+
+    # The indexes are built when the module is loaded, not per transcription
+    monkeypatch.setattr(topic_index, "build_index", lambda keywords: pytest.fail("index rebuilt"))
+
+    assert classify_topics(texts, languages) == [classify_topic(t, l) for t, l in zip(texts, languages)]
+    assert classify_topics(iter(texts), "en") == [classify_topic(t, "en") for t in texts]
+    assert classify_topics(texts) == [classify_topic(t) for t in texts]
+    assert classify_topics([]) == []
+    with pytest.raises(ValueError):
+        classify_topics(texts, ["fr"])
@@ -0,0 +1,333 @@
+"""
+Vectorized scoring of many sessions at once
+
+Same thresholds and same arithmetic as scoring_rules, compute_scores,
+compute_global_score and AudioScorer.calculate_scores, applied to NumPy
+columns with np.select: the results are identical to the scalar path.
+"""
+import numpy as np
+
+from audio.audio_scoring import AudioScorer
+from .scoring_rules import (GESTURE_MAX, GESTURE_MIN, GESTURE_NATURAL_MAX, PITCH_VARIATION_FAIR,
+                            PITCH_VARIATION_GOOD, POSTURE_EXCELLENT, POSTURE_FAIR, POSTURE_GOOD,
+                            SPEECH_RATE_MAX, SPEECH_RATE_MIN, SPEECH_RATE_OPTIMAL_MAX, SPEECH_RATE_OPTIMAL_MIN)
+
+VISION_COLUMNS = ("posture_score_raw", "gesture_activity", "head_orientation")
+AUDIO_COLUMNS = ("speech_rate", "pitch_variation")
+AUDIO_SCORE_COLUMNS = ("debit", "intonation", "volume")
+SCORE_KEYS = ("posture_score", "gesture_score", "eye_contact_score",
+              "speech_rate_score", "voice_modulation_score")
+
+
+def _two_product(a, b):
+    """a * b as the float product plus its exact rounding error (Dekker)"""
+    product = a * b
+    split = 134217729.0  # 2**27 + 1
+    a_big = split * a
+    a_high = a_big - (a_big - a)
+    a_low = a - a_high
+    b_big = split * b
+    b_high = b_big - (b_big - b)
+    b_low = b - b_high
+    error = ((a_high * b_high - product) + a_high * b_low + a_low * b_high) + a_low * b_low
+    return product, error
+
+
+def python_round(values, ndigits=0):
+    """
+    Round like the built-in round() (correctly rounded, ties to even)
+
+    np.round rounds the float product values * 10**ndigits, which moves values
+    sitting near a tie (round(0.45, 1) == 0.5 but np.round(0.45, 1) == 0.4).
+    The side of the tie is decided on the exact product instead.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    scale = 10.0 ** ndigits
+    with np.errstate(invalid="ignore"):
+        scaled, error = _two_product(values, scale)
+        lower = np.floor(scaled)
+        # The float product may have been rounded up onto the next integer
+        lower = np.where((scaled == lower) & (error < 0), lower - 1, lower)
+        # Sign of the exact distance to the tie lower + 0.5
+        distance = (scaled - (lower + 0.5)) + error
+        up = (distance > 0) | ((distance == 0) & (lower % 2 == 1))
+    return np.where(np.isfinite(values), np.where(up, lower + 1, lower) / scale, values)
+
+
+def _max(floor, values):
+    # Same result as the built-in max(floor, value), including for NaN
+    return np.where(values > floor, values, floor)
+
+
+# ===================== RULES (scoring_rules.py) =====================
+
+def score_posture_batch(posture_raw):
+    posture_raw = np.asarray(posture_raw, dtype=np.float64)
+    return np.select([posture_raw >= POSTURE_EXCELLENT, posture_raw >= POSTURE_GOOD, posture_raw >= POSTURE_FAIR],
+                     [9, 8, 6], 4)
+
+
+def score_gesture_batch(activity):
+    activity = np.asarray(activity, dtype=np.float64)
+    return np.select(
+        [activity < GESTURE_MIN,
+         (GESTURE_MIN <= activity) & (activity <= GESTURE_NATURAL_MAX),
+         (GESTURE_NATURAL_MAX < activity) & (activity <= GESTURE_MAX)],
+        [4, 8, 6], 4
+    )
+
+
+def score_eye_contact_batch(direction):
+    return np.where(np.asarray(direction, dtype=object) == "front", 8, 5)
+
+
+def score_speech_rate_batch(rate):
+    rate = np.asarray(rate, dtype=np.float64)
+    return np.select(
+        [(SPEECH_RATE_OPTIMAL_MIN <= rate) & (rate <= SPEECH_RATE_OPTIMAL_MAX),
+         ((SPEECH_RATE_MIN <= rate) & (rate < SPEECH_RATE_OPTIMAL_MIN))
+         | ((SPEECH_RATE_OPTIMAL_MAX < rate) & (rate <= SPEECH_RATE_MAX))],
+        [8, 6], 4
+    )
+
+
+def score_voice_modulation_batch(pitch_var):
+    pitch_var = np.asarray(pitch_var, dtype=np.float64)
+    return np.select([pitch_var >= PITCH_VARIATION_GOOD, pitch_var >= PITCH_VARIATION_FAIR], [8, 6], 4)
+
+
+# ===================== SCORES (scoring_engine / global_score) =====================
+
+def compute_scores_batch(vision: dict, audio: dict) -> dict:
+    """
+    Sub-scores of many sessions (vectorized compute_scores)
+
+    Args:
+        vision: Columns posture_score_raw, gesture_activity, head_orientation
+        audio: Columns speech_rate, pitch_variation and, for sessions scored by
+            AudioScorer, debit / intonation / volume (NaN elsewhere) with a
+            boolean has_audio_scores column
+
+    Returns:
+        dict of arrays keyed like compute_scores
+    """
+    n = len(vision["posture_score_raw"])
+    has_audio_scores = np.asarray(audio.get("has_audio_scores", np.zeros(n, dtype=bool)), dtype=bool)
+
+    speech_rate_score = score_speech_rate_batch(audio["speech_rate"]).astype(np.float64)
+    voice_modulation_score = score_voice_modulation_batch(audio["pitch_variation"]).astype(np.float64)
+    if has_audio_scores.any():
+        debit = np.asarray(audio["debit"], dtype=np.float64)
+        intonation = np.asarray(audio["intonation"], dtype=np.float64)
+        volume = np.asarray(audio["volume"], dtype=np.float64)
+        speech_rate_score = np.where(has_audio_scores, debit, speech_rate_score)
+        voice_modulation_score = np.where(has_audio_scores, (intonation + volume) / 2, voice_modulation_score)
+
+    return {
+        "posture_score": score_posture_batch(vision["posture_score_raw"]),
+        "gesture_score": score_gesture_batch(vision["gesture_activity"]),
+        "eye_contact_score": score_eye_contact_batch(vision["head_orientation"]),
+        "speech_rate_score": speech_rate_score,
+        "voice_modulation_score": voice_modulation_score,
+        "has_audio_scores": has_audio_scores
+    }
+
+
+def compute_global_score_batch(scores: dict) -> np.ndarray:
+    """Vectorized compute_global_score (same weights, same operation order)"""
+    voice_avg = (scores["speech_rate_score"] + scores["voice_modulation_score"]) / 2
+    global_score = (
+        scores["posture_score"] * 0.3 +
+        scores["gesture_score"] * 0.25 +
+        scores["eye_contact_score"] * 0.15 +
+        voice_avg * 0.3
+    )
+    return python_round(global_score, 1)
+
+
+# ===================== AUDIO (AudioScorer) =====================
+
+def audio_columns_from_results(results_list) -> dict:
+    """Columns needed by audio_scores_batch from AudioExtractor.extract_all_metrics results"""
+    pause_means, pause_counts = [], []
+    for results in results_list:
+        pauses = results.get("pauses", results.get("audio_features", {}).get("pauses", []))
+        durees = [p["duree"] for p in pauses]
+        # Same summation as AudioScorer.score_pauses
+        pause_means.append(sum(durees) / len(durees) if durees else np.nan)
+        pause_counts.append(len(durees))
+
+    def column(getter):
+        return np.array([getter(results) for results in results_list], dtype=np.float64)
+
+    return {
+        "debit_mots_par_minute": column(lambda r: r.get("debit_mots_par_minute", 0)),
+        "pourcentage_fillers": column(lambda r: r.get("fillers", {}).get("pourcentage", 0)),
+        "duree_secondes": column(lambda r: r.get("duree_secondes", 1)),
+        "pause_mean": np.array(pause_means, dtype=np.float64),
+        "pause_count": np.array(pause_counts, dtype=np.int64),
+        "volume_moyen": column(lambda r: r.get("audio_features", {}).get("volume_moyen", 0)),
+        "volume_std": column(lambda r: r.get("audio_features", {}).get("volume_std", 0)),
+        "pitch_std": column(lambda r: r.get("audio_features", {}).get("pitch_std", 0)),
+    }
+
+
+def audio_scores_batch(columns: dict, scorer: AudioScorer = None) -> dict:
+    """
+    Vectorized AudioScorer.calculate_scores, with the thresholds of `scorer`
+
+    Returns:
+        dict of rounded arrays: debit, fillers, pauses, volume, intonation, global_audio
+    """
+    s = scorer or AudioScorer()
+
+    # Débit
+    debit = columns["debit_mots_par_minute"]
+    score_debit = np.select(
+        [(s.debit_optimal_min <= debit) & (debit <= s.debit_optimal_max),
+         debit < s.debit_trop_lent,
+         debit > s.debit_trop_rapide,
+         debit < s.debit_optimal_min],
+        [np.full_like(debit, 10),
+         _max(3, 10 * (debit / s.debit_trop_lent)),
+         _max(2, 10 - ((debit - s.debit_trop_rapide) / 20)),
+         10 - ((s.debit_optimal_min - debit) / (s.debit_optimal_min - s.debit_trop_lent) * 3)],
+        10 - ((debit - s.debit_optimal_max) / (s.debit_trop_rapide - s.debit_optimal_max) * 4)
+    )
+
+    # Fillers
+    fillers = columns["pourcentage_fillers"]
+    score_fillers = np.select(
+        [fillers <= s.filler_excellent, fillers <= s.filler_bon, fillers <= s.filler_moyen],
+        [np.full_like(fillers, 10),
+         10 - ((fillers - s.filler_excellent) / (s.filler_bon - s.filler_excellent) * 3),
+         7 - ((fillers - s.filler_bon) / (s.filler_moyen - s.filler_bon) * 2)],
+        _max(1, 5 - ((fillers - s.filler_moyen) / 5))
+    )
+
+    # Pauses
+    pause_mean, pause_count = columns["pause_mean"], columns["pause_count"]
+    score_duree = np.select(
+        [(s.pause_ideale_min <= pause_mean) & (pause_mean <= s.pause_ideale_max),
+         pause_mean < s.pause_ideale_min,
+         pause_mean > s.pause_trop_longue],
+        [10, 7, 4], 8
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        frequence = np.where(pause_count > 0, columns["duree_secondes"] / pause_count, 0)
+    score_frequence = np.select(
+        [(s.pause_frequence_min <= frequence) & (frequence <= s.pause_frequence_max),
+         frequence < s.pause_frequence_trop_frequente,
+         frequence > s.pause_frequence_trop_rare],
+        [10, 6, 5], 8
+    )
+    score_pauses = np.where(pause_count > 0, score_duree * 0.6 + score_frequence * 0.4, 5)
+
+    # Volume
+    volume_moyen, volume_std = columns["volume_moyen"], columns["volume_std"]
+    score_niveau = np.select(
+        [(s.volume_optimal_min <= volume_moyen) & (volume_moyen <= s.volume_optimal_max),
+         volume_moyen < s.volume_optimal_min],
+        [np.full_like(volume_moyen, 10), _max(4, 10 * (volume_moyen / s.volume_optimal_min))],
+        8
+    )
+    score_variation = np.select([volume_std > s.volume_variation_bonne, volume_std > s.volume_variation_moyenne],
+                                [10, 8], 6)
+    score_volume = score_niveau * 0.7 + score_variation * 0.3
+
+    # Intonation
+    pitch_std = columns["pitch_std"]
+    score_intonation = np.select(
+        [pitch_std >= s.pitch_variation_min,
+         pitch_std >= s.pitch_variation_acceptable,
+         pitch_std >= s.pitch_variation_monotone],
+        [10, 7, 5], 3
+    )
+
+    score_global = (
+        score_debit * 0.25 +
+        score_fillers * 0.20 +
+        score_pauses * 0.20 +
+        score_volume * 0.15 +
+        score_intonation * 0.20
+    )
+
+    return {
+        "debit": python_round(score_debit, 2),
+        "fillers": python_round(score_fillers, 2),
+        "pauses": python_round(score_pauses, 2),
+        "volume": python_round(score_volume, 2),
+        "intonation": python_round(score_intonation, 2),
+        "global_audio": python_round(score_global, 2)
+    }
+
+
+# ===================== METRIC DICTS =====================
+
+def metric_columns(metric_sets, scorer: AudioScorer = None):
+    """
+    Columns (vision, audio) of compute_scores_batch from a list of sessions
+
+    Args:
+        metric_sets: dicts with "vision_metrics" and "audio_metrics" (as given
+            to compute_scores) and optionally "audio_results" (raw
+            AudioExtractor results, rescored with AudioScorer thresholds)
+    """
+    n = len(metric_sets)
+    vision = {name: [m["vision_metrics"][name] for m in metric_sets] for name in VISION_COLUMNS}
+    audio = {name: np.array([m["audio_metrics"].get(name, np.nan) for m in metric_sets], dtype=np.float64)
+             for name in AUDIO_COLUMNS}
+
+    # Detailed audio scores: recomputed from raw results, or the stored ones
+    audio_scores = {name: np.full(n, np.nan) for name in AUDIO_SCORE_COLUMNS}
+    has_audio_scores = np.zeros(n, dtype=bool)
+    raw = [i for i, m in enumerate(metric_sets) if m.get("audio_results")]
+    if raw:
+        rescored = audio_scores_batch(audio_columns_from_results([metric_sets[i]["audio_results"] for i in raw]),
+                                      scorer)
+        for name in AUDIO_SCORE_COLUMNS:
+            audio_scores[name][raw] = rescored[name]
+        has_audio_scores[raw] = True
+    for i, m in enumerate(metric_sets):
+        stored = m["audio_metrics"].get("audio_scores")
+        if not has_audio_scores[i] and stored:
+            for name in AUDIO_SCORE_COLUMNS:
+                audio_scores[name][i] = stored[name]
+            has_audio_scores[i] = True
+
+    return vision, {**audio, **audio_scores, "has_audio_scores": has_audio_scores}
+
+
+def score_metric_sets(metric_sets, scorer: AudioScorer = None) -> list:
+    """
+    Score a list of sessions in one vectorized pass
+
+    Args:
+        metric_sets: Sessions as accepted by metric_columns
+
+    Returns:
+        One dict per session: compute_scores keys plus "global_score"
+    """
+    n = len(metric_sets)
+    if n == 0:
+        return []
+
+    vision, audio = metric_columns(metric_sets, scorer)
+    scores = compute_scores_batch(vision, audio)
+    global_scores = compute_global_score_batch(scores).tolist()
+    has_audio_scores = scores["has_audio_scores"].tolist()
+
+    posture, gesture, eye_contact = (scores[key].tolist() for key in SCORE_KEYS[:3])
+    speech_rate, voice_modulation = (scores[key].tolist() for key in SCORE_KEYS[3:])
+    return [
+        {
+            "posture_score": posture[i],
+            "gesture_score": gesture[i],
+            "eye_contact_score": eye_contact[i],
+            # Integers from the rules, floats from the detailed audio scores (as compute_scores)
+            "speech_rate_score": speech_rate[i] if has_audio_scores[i] else int(speech_rate[i]),
+            "voice_modulation_score": voice_modulation[i] if has_audio_scores[i] else int(voice_modulation[i]),
+            "global_score": global_scores[i]
+        }
+        for i in range(n)
+    ]
@@ -0,0 +1,126 @@
+import numpy as np
+import pytest
+
+from audio.audio_scoring import AudioScorer
+from scoring.batch_scoring import audio_scores_batch, audio_columns_from_results, python_round, score_metric_sets
+from scoring.global_score import compute_global_score
+from scoring.scoring_engine import compute_scores
+from scoring.scoring_rules import (GESTURE_MAX, GESTURE_MIN, GESTURE_NATURAL_MAX, PITCH_VARIATION_FAIR,
+                                   PITCH_VARIATION_GOOD, POSTURE_EXCELLENT, POSTURE_FAIR, POSTURE_GOOD,
+                                   SPEECH_RATE_MAX, SPEECH_RATE_MIN, SPEECH_RATE_OPTIMAL_MAX,
+                                   SPEECH_RATE_OPTIMAL_MIN)
+
+# Values on and around the rule thresholds, so that every branch boundary is hit
+POSTURE = [POSTURE_FAIR, POSTURE_GOOD, POSTURE_EXCELLENT]
+GESTURE = [GESTURE_MIN, GESTURE_NATURAL_MAX, GESTURE_MAX]
+SPEECH_RATE = [SPEECH_RATE_MIN, SPEECH_RATE_OPTIMAL_MIN, SPEECH_RATE_OPTIMAL_MAX, SPEECH_RATE_MAX, float("nan")]
+PITCH_VARIATION = [PITCH_VARIATION_FAIR, PITCH_VARIATION_GOOD, float("nan")]
+DEBIT = [100, 130, 160, 200]
+FILLERS = [3, 7, 12]
+PAUSE = [0.8, 2.5, 4]
+VOLUME = [0.005, 0.01, 0.02, 0.15]
+PITCH_STD = [5, 10, 20]
+
+
+def pick(rng, thresholds, low, high):
+    """A threshold, a value just around one, or a uniform value"""
+    kind = rng.integers(3)
+    if kind == 0:
+        return float(rng.choice(thresholds))
+    if kind == 1:
+        return float(np.nextafter(rng.choice(thresholds), rng.choice([-np.inf, np.inf])))
+    return float(rng.uniform(low, high))
+
+
+def random_results(rng):
+    """AudioExtractor-style raw results"""
+    pauses = [{"timestamp": float(i), "duree": round(pick(rng, PAUSE, 0.1, 6), 2)}
+              for i in range(rng.integers(0, 12))]
+    results = {
+        "debit_mots_par_minute": pick(rng, DEBIT, 40, 260),
+        "fillers": {"pourcentage": pick(rng, FILLERS, 0, 30)},
+        "duree_secondes": float(rng.uniform(5, 400)),
+        "audio_features": {
+            "volume_moyen": pick(rng, VOLUME, 0, 0.3),
+            "volume_std": pick(rng, VOLUME, 0, 0.05),
+            "pitch_std": pick(rng, PITCH_STD, 0, 40),
+        },
+    }
+    # Word-level pauses when available, RMS pauses otherwise
+    if rng.integers(2):
+        results["pauses"] = pauses
+    else:
+        results["audio_features"]["pauses"] = pauses
+    return results
+
+
+def random_session(rng, scorer):
+    """A metric set for score_metric_sets and its compute_scores inputs"""
+    vision = {
+        "posture_score_raw": pick(rng, POSTURE, 0, 1),
+        "gesture_activity": pick(rng, GESTURE, 0, 3),
+        "head_orientation": str(rng.choice(["front", "left", "right", "down"])),
+    }
+    audio = {
+        "speech_rate": pick(rng, SPEECH_RATE, 60, 220),
+        "pitch_variation": pick(rng, PITCH_VARIATION, 0, 60),
+    }
+    session = {"vision_metrics": vision, "audio_metrics": audio}
+    kind = rng.integers(3)
+    if kind == 1:
+        # Detailed audio scores stored with the session
+        audio["audio_scores"] = scorer.calculate_scores(random_results(rng))
+    elif kind == 2:
+        # Raw results, rescored (and taking precedence over stored scores)
+        session["audio_results"] = random_results(rng)
+        audio["audio_scores"] = {"debit": 0.0, "intonation": 0.0, "volume": 0.0} if rng.integers(2) else None
+    return session
+
+
+def scalar_scores(session, scorer):
+    """Reference: compute_scores + compute_global_score, with AudioScorer on raw results"""
+    audio = dict(session["audio_metrics"])
+    if session.get("audio_results"):
+        audio["audio_scores"] = scorer.calculate_scores(session["audio_results"])
+    scores = compute_scores(session["vision_metrics"], audio)
+    return {**scores, "global_score": compute_global_score(scores)}
+
+
+def test_score_metric_sets_matches_scalar_path():
+    rng = np.random.default_rng(0)
+    scorer = AudioScorer()
+    sessions = [random_session(rng, scorer) for _ in range(5000)]
+
+    batch = score_metric_sets(sessions, scorer)
+    for session, scores in zip(sessions, batch):
+        expected = scalar_scores(session, scorer)
+        assert scores == expected
+
+
+def test_audio_scores_batch_matches_audio_scorer():
+    rng = np.random.default_rng(1)
+    scorer = AudioScorer()
+    # Thresholds are read from the scorer
+    scorer.debit_optimal_min = 120
+    scorer.pause_trop_longue = 3.5
+    scorer.volume_variation_moyenne = 0.004
+    scorer.pitch_variation_acceptable = 12
+    results = [random_results(rng) for _ in range(5000)]
+
+    batch = audio_scores_batch(audio_columns_from_results(results), scorer)
+    for i, result in enumerate(results):
+        expected = scorer.calculate_scores(result)
+        assert {name: float(column[i]) for name, column in batch.items()} == \
+            {name: value for name, value in expected.items() if name != "weights"}
+
+
+@pytest.mark.parametrize("ndigits", [1, 2])
+def test_python_round_matches_builtin(ndigits):
+    """Ties on multiples of 0.05 / 0.005, where np.round differs from round()"""
+    rng = np.random.default_rng(ndigits)
+    step = 0.5 / 10 ** ndigits
+    values = np.concatenate([np.arange(0, 10, step), rng.uniform(-10, 10, 10000), [np.nan, np.inf]])
+
+    rounded = python_round(values, ndigits)
+    for value, result in zip(values.tolist(), rounded.tolist()):
+        assert result == round(value, ndigits) or (np.isnan(value) and np.isnan(result))
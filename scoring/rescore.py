@@ -0,0 +1,70 @@
+"""
+Recalcule les scores d'un répertoire de fichiers de métriques JSON
+
+Chaque fichier contient une session ({"vision_metrics": ..., "audio_metrics": ...,
+"audio_results": ... optionnel}) ou une liste de sessions. Toutes les sessions
+sont scorées en une seule passe vectorisée (scoring/batch_scoring.py), par
+exemple après un changement de seuils.
+
+Usage :
+    python -m scoring.rescore data/metrics
+    python -m scoring.rescore data/metrics --output scoring/rescored.json
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from .batch_scoring import score_metric_sets
+
+
+def load_metric_sets(directory):
+    """(fichier, index dans le fichier, session) pour tous les *.json du répertoire"""
+    entries = []
+    for path in sorted(Path(directory).glob("*.json")):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        sessions = data if isinstance(data, list) else [data]
+        for index, session in enumerate(sessions):
+            if not isinstance(session, dict) or "vision_metrics" not in session or "audio_metrics" not in session:
+                print(f"⚠️  {path.name}[{index}] ignoré : vision_metrics / audio_metrics manquants")
+                continue
+            entries.append((path.name, index, session))
+    return entries
+
+
+def rescore_directory(directory):
+    """Scores de toutes les sessions du répertoire, regroupés par fichier"""
+    entries = load_metric_sets(directory)
+    scores = score_metric_sets([session for _, _, session in entries])
+
+    results = {}
+    for (name, index, _), session_scores in zip(entries, scores):
+        results.setdefault(name, []).append({"index": index, **session_scores})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory", help="Répertoire des fichiers de métriques JSON")
+    parser.add_argument("--output", "-o", help="Fichier JSON de sortie (sinon affichage)")
+    args = parser.parse_args()
+
+    if not Path(args.directory).is_dir():
+        parser.error(f"Répertoire introuvable : {args.directory}")
+
+    results = rescore_directory(args.directory)
+    count = sum(len(sessions) for sessions in results.values())
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=4)
+        print(f"✅ {count} sessions rescorées ({len(results)} fichiers) : {args.output}")
+    else:
+        json.dump(results, sys.stdout, ensure_ascii=False, indent=4)
+        print()
+
+
+if __name__ == "__main__":
+    main()
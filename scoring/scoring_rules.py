@@ -4,23 +4,40 @@ Increment 3
 Group 1: Youssouf & Hajar
 """
 
+# Seuils des règles, partagés avec le scoring vectorisé (batch_scoring) et la timeline
+POSTURE_EXCELLENT = 0.8
+POSTURE_GOOD = 0.6
+POSTURE_FAIR = 0.4
+
+GESTURE_MIN = 0.8           # en dessous : trop peu de gestes
+GESTURE_NATURAL_MAX = 1.5   # au-delà : un peu excessive
+GESTURE_MAX = 2.2           # au-delà : trop agitée
+
+SPEECH_RATE_OPTIMAL_MIN = 120
+SPEECH_RATE_OPTIMAL_MAX = 160
+SPEECH_RATE_MIN = 100
+SPEECH_RATE_MAX = 180
+
+PITCH_VARIATION_GOOD = 40
+PITCH_VARIATION_FAIR = 25
+
 def score_posture(posture_raw):
-    if posture_raw >= 0.8:
+    if posture_raw >= POSTURE_EXCELLENT:
         return 9
-    elif posture_raw >= 0.6:
+    elif posture_raw >= POSTURE_GOOD:
         return 8
-    elif posture_raw >= 0.4:
+    elif posture_raw >= POSTURE_FAIR:
         return 6
     else:
         return 4
 
 
 def score_gesture(activity):
-    if activity < 0.8:
+    if activity < GESTURE_MIN:
         return 4  # trop peu de gestes
-    elif 0.8 <= activity <= 1.5:
+    elif GESTURE_MIN <= activity <= GESTURE_NATURAL_MAX:
         return 8  # gestuelle naturelle
-    elif 1.5 < activity <= 2.2:
+    elif GESTURE_NATURAL_MAX < activity <= GESTURE_MAX:
         return 6  # un peu excessive
     else:
         return 4  # trop agitée
@@ -34,18 +51,18 @@ def score_eye_contact(direction):
 
 
 def score_speech_rate(rate):
-    if 120 <= rate <= 160:
+    if SPEECH_RATE_OPTIMAL_MIN <= rate <= SPEECH_RATE_OPTIMAL_MAX:
         return 8
-    elif 100 <= rate < 120 or 160 < rate <= 180:
+    elif SPEECH_RATE_MIN <= rate < SPEECH_RATE_OPTIMAL_MIN or SPEECH_RATE_OPTIMAL_MAX < rate <= SPEECH_RATE_MAX:
         return 6
     else:
         return 4
 
 
 def score_voice_modulation(pitch_var):
-    if pitch_var >= 40:
+    if pitch_var >= PITCH_VARIATION_GOOD:
         return 8
-    elif pitch_var >= 25:
+    elif pitch_var >= PITCH_VARIATION_FAIR:
         return 6
     else:
         return 4
\ No newline at end of file
@@ -1,4 +1,4 @@
-from scoring_engine import compute_scores
+from scoring.scoring_engine import compute_scores
 
 vision_test = {
     "posture_score_raw": 0.5,
@@ -0,0 +1,200 @@
+"""
+Time-resolved metrics: rolling windows over per-second series, and timeline
+events where a windowed metric crosses a scoring threshold.
+
+A series holds fixed-resolution bins instead of per-frame values, so its size
+depends on the duration only (one bin per second):
+
+    {"resolution": 1.0, "metrics": {name: {"count": [...], "sum": [...], "sum_sq": [...]}}}
+
+- "count" and "sum" give the windowed mean; "sum_sq" (optional) also gives the
+  standard deviation, reported as "<name>_std"
+- without "count", "sum" is a number of occurrences (e.g. words) and the
+  windowed value is a rate per minute
+"""
+import math
+
+import numpy as np
+
+from .scoring_rules import GESTURE_MAX, GESTURE_MIN, PITCH_VARIATION_FAIR, POSTURE_FAIR, SPEECH_RATE_MAX, SPEECH_RATE_MIN
+
+SERIES_RESOLUTION = 1.0
+
+# A window needs at least this share of the median sample count of its metric
+# (a window ending on a few voiced frames says nothing about the voice)
+MIN_COVERAGE = 0.25
+
+# (metric, comparison, threshold, event): thresholds where scoring_rules gives less than 6
+TIMELINE_RULES = (
+    ("posture", "<", POSTURE_FAIR, "Slouched posture"),
+    ("gesture", "<", GESTURE_MIN, "Few gestures"),
+    ("gesture", ">", GESTURE_MAX, "Agitated gestures"),
+    ("eye_contact", "<", 0.5, "Low eye contact"),
+    ("speech_rate", ">", SPEECH_RATE_MAX, "Fast speech rate"),
+    ("speech_rate", "<", SPEECH_RATE_MIN, "Slow speech rate"),
+    ("volume", "<", 0.02, "Low volume"),
+    ("pitch_std", "<", PITCH_VARIATION_FAIR, "Monotone voice"),
+)
+
+
+def series_from_samples(times, values: dict, resolution: float = SERIES_RESOLUTION,
+                        squares=(), rates=()) -> dict:
+    """
+    Bin timestamped samples into a series
+
+    Args:
+        times: Sample times in seconds
+        values: {metric: per-sample values} (a rate metric counts its values as occurrences)
+        squares: Metrics that also keep the sum of squares
+        rates: Metrics reported as occurrences per minute
+    """
+    bins = (np.asarray(times, dtype=np.float64) / resolution).astype(np.int64)
+    n_bins = int(bins.max()) + 1 if len(bins) else 0
+
+    metrics = {}
+    for name, samples in values.items():
+        samples = np.asarray(samples, dtype=np.float64)
+        metric = {"sum": np.bincount(bins, weights=samples, minlength=n_bins)}
+        if name not in rates:
+            metric["count"] = np.bincount(bins, minlength=n_bins)
+        if name in squares:
+            metric["sum_sq"] = np.bincount(bins, weights=samples ** 2, minlength=n_bins)
+        metrics[name] = {key: np.round(column, 4).tolist() for key, column in metric.items()}
+    return {"resolution": resolution, "metrics": metrics}
+
+
+def merge_series(*series_list) -> dict:
+    """Metrics of several series with the same resolution (None entries are skipped)"""
+    series_list = [series for series in series_list if series]
+    if not series_list:
+        return {"resolution": SERIES_RESOLUTION, "metrics": {}}
+    resolution = series_list[0]["resolution"]
+    if any(series["resolution"] != resolution for series in series_list):
+        raise ValueError("Series must share the same resolution")
+    merged = {}
+    for series in series_list:
+        merged.update(series["metrics"])
+    return {"resolution": resolution, "metrics": merged}
+
+
+def _window_sums(column, n_bins, starts, ends):
+    """Sum of each window from one cumulative sum (O(bins + windows))"""
+    padded = np.zeros(n_bins)
+    padded[:len(column)] = column
+    cumulative = np.concatenate([[0.0], np.cumsum(padded)])
+    return cumulative[ends] - cumulative[starts]
+
+
+def rolling_metrics(series: dict, window: float = 10.0, step: float = 5.0, max_windows: int = 120) -> dict:
+    """
+    Windowed metrics of a series
+
+    The step is widened when needed so a long video still gives at most
+    max_windows windows.
+
+    Returns:
+        dict of arrays: start, end (seconds), and one value per metric and
+        window (NaN with too few samples, or before the first / after the last
+        occurrence for a rate)
+    """
+    resolution, metrics = series["resolution"], series["metrics"]
+    n_bins = max((len(metric["sum"]) for metric in metrics.values()), default=0)
+    window_bins = max(1, round(window / resolution))
+    step_bins = max(1, round(step / resolution))
+
+    span = max(n_bins - window_bins, 0)
+    if max_windows > 1 and math.ceil(span / step_bins) + 1 > max_windows:
+        step_bins = math.ceil(span / (max_windows - 1))
+    starts = np.arange(0, span + 1, step_bins) if n_bins else np.zeros(0, dtype=np.int64)
+    ends = np.minimum(starts + window_bins, n_bins)
+
+    result = {"window": window_bins * resolution, "step": step_bins * resolution,
+              "start": starts * resolution, "end": ends * resolution}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for name, metric in metrics.items():
+            sums = _window_sums(metric["sum"], n_bins, starts, ends)
+            if "count" not in metric:
+                # The rate is measured between the first and the last occurrence only: a
+                # window without any in between is a silence (rate 0), the time before
+                # and after them is not counted
+                occurring = np.flatnonzero(np.asarray(metric["sum"]) > 0)
+                if len(occurring):
+                    measured_starts = np.maximum(starts, occurring[0])
+                    measured_ends = np.minimum(ends, occurring[-1] + 1)
+                else:
+                    measured_starts = measured_ends = starts
+                minutes = (measured_ends - measured_starts) * resolution / 60
+                result[name] = np.where(measured_ends > measured_starts, sums / minutes, np.nan)
+                continue
+            counts = _window_sums(metric["count"], n_bins, starts, ends)
+            sampled = counts[counts > 0]
+            min_count = max(MIN_COVERAGE * np.median(sampled), 1) if len(sampled) else 1
+            mean = np.where(counts >= min_count, sums / counts, np.nan)
+            result[name] = mean
+            if "sum_sq" in metric:
+                squares = _window_sums(metric["sum_sq"], n_bins, starts, ends)
+                result[f"{name}_std"] = np.sqrt(np.maximum(squares / counts - mean ** 2, 0))
+    return result
+
+
+def detect_events(windows: dict, rules=TIMELINE_RULES, max_events: int = 20) -> list:
+    """
+    Timeline events: consecutive windows breaking the same rule form one event
+
+    When there are more than max_events, the events furthest from their
+    threshold are kept.
+
+    Returns:
+        Events {"time", "end", "event", "metric", "value"} sorted by time
+    """
+    events = []
+    for metric, comparison, threshold, label in rules:
+        values = windows.get(metric)
+        if values is None or not len(values):
+            continue
+        with np.errstate(invalid="ignore"):
+            flagged = values < threshold if comparison == "<" else values > threshold
+
+        # Runs of flagged windows, as in audio_features.silent_runs
+        edges = np.diff(flagged.astype(np.int8), prepend=0, append=0)
+        for first, last in zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1) - 1):
+            run = values[first:last + 1]
+            worst = float(run.min() if comparison == "<" else run.max())
+            events.append({
+                "time": float(windows["start"][first]),
+                "end": float(windows["end"][last]),
+                "event": label,
+                "metric": metric,
+                "value": round(worst, 3),
+                "_severity": abs(worst - threshold) / abs(threshold)
+            })
+
+    if len(events) > max_events:
+        events = sorted(events, key=lambda event: -event["_severity"])[:max_events]
+    events.sort(key=lambda event: (event["time"], event["event"]))
+    for event in events:
+        del event["_severity"]
+    return events
+
+
+def compact_windows(windows: dict) -> dict:
+    """Rounded lists for the API response (NaN -> None)"""
+    def column(values, digits):
+        return [None if np.isnan(value) else round(float(value), digits) for value in values]
+
+    compact = {"window": windows["window"], "step": windows["step"],
+               "start": column(windows["start"], 2), "end": column(windows["end"], 2), "metrics": {}}
+    for name, values in windows.items():
+        if name not in ("window", "step", "start", "end"):
+            compact["metrics"][name] = column(values, 4)
+    return compact
+
+
+def build_timeline(series: dict, window: float = 10.0, step: float = 5.0,
+                   max_windows: int = 120, max_events: int = 20) -> tuple:
+    """
+    Returns:
+        (events, compact windowed metrics) of a series
+    """
+    windows = rolling_metrics(series, window, step, max_windows)
+    return detect_events(windows, max_events=max_events), compact_windows(windows)
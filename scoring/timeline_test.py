@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+from scoring.timeline import (TIMELINE_RULES, build_timeline, detect_events, merge_series, rolling_metrics,
+                              series_from_samples)
+
+
+def speech_series(word_times):
+    return series_from_samples(word_times, {"speech_rate": [1] * len(word_times)}, rates=("speech_rate",))
+
+
+def posture_series(values):
+    """One posture sample per second"""
+    return series_from_samples(np.arange(len(values)) + 0.5, {"posture": values})
+
+
+def test_a_silent_window_during_the_talk_is_a_slow_speech_rate():
+    # Words every 0.4 s (150 words/minute) from 5 s to 120 s, except 40 s to 70 s
+    times = np.arange(5.0, 120.0, 0.4)
+    times = times[(times < 40) | (times >= 70)]
+    series = merge_series(speech_series(times), posture_series([0.9] * 150))
+
+    windows = rolling_metrics(series, window=10.0, step=5.0)
+    rate = dict(zip(windows["start"], windows["speech_rate"]))
+
+    assert rate[45.0] == rate[55.0] == 0.0
+    assert rate[20.0] == pytest.approx(150.0)
+    # Before the first word and after the last one: not measured
+    assert np.isnan(rate[140.0])
+    assert rate[0.0] == pytest.approx(150.0, rel=0.05)  # Measured from 5 s
+
+    events, _ = build_timeline(series)
+    slow = [event for event in events if event["event"] == "Slow speech rate"]
+    assert len(slow) == 1
+    assert slow[0]["time"] <= 40.0 and slow[0]["end"] >= 70.0 and slow[0]["value"] == 0.0
+
+
+def test_no_speech_rate_without_words():
+    windows = rolling_metrics(merge_series(speech_series([]), posture_series([0.9] * 30)))
+
+    assert np.isnan(windows["speech_rate"]).all()
+    assert detect_events(windows) == []
+
+
+def test_step_is_widened_past_max_windows():
+    series = posture_series([0.9] * 3600)
+
+    windows = rolling_metrics(series, window=10.0, step=5.0, max_windows=120)
+
+    assert len(windows["start"]) <= 120
+    assert windows["step"] == 31.0  # ceil((3600 - 10) / 119)
+    assert np.all(np.diff(windows["start"]) == windows["step"])
+    assert np.all(windows["end"] - windows["start"] == 10.0)
+
+    # Short enough: the requested step is kept
+    windows = rolling_metrics(posture_series([0.9] * 300), window=10.0, step=5.0, max_windows=120)
+    assert windows["step"] == 5.0 and len(windows["start"]) == 59
+
+
+def test_consecutive_flagged_windows_make_one_event():
+    # Slouched (posture < 0.4) from 30 s to 60 s, worst value 0.1; the windows
+    # straddling 30 s and 60 s average to 0.6
+    values = [0.9] * 30 + [0.3] * 10 + [0.1] * 10 + [0.3] * 10 + [0.9] * 30
+    windows = rolling_metrics(posture_series(values), window=10.0, step=5.0)
+
+    events = detect_events(windows)
+
+    assert events == [{"time": 30.0, "end": 60.0, "event": "Slouched posture", "metric": "posture",
+                       "value": 0.1}]
+
+
+def test_events_are_capped_to_the_furthest_from_their_threshold():
+    # Six slouched periods separated by good posture, worse and worse
+    values = []
+    for level in (0.35, 0.3, 0.25, 0.2, 0.15, 0.1):
+        values += [0.9] * 20 + [level] * 10
+    windows = rolling_metrics(posture_series(values + [0.9] * 20), window=10.0, step=10.0)
+
+    all_events = detect_events(windows, max_events=20)
+    capped = detect_events(windows, max_events=3)
+    _, compact = build_timeline(posture_series(values + [0.9] * 20), window=10.0, step=10.0, max_events=3)
+
+    assert [event["value"] for event in all_events] == [0.35, 0.3, 0.25, 0.2, 0.15, 0.1]
+    # The three worst, still sorted by time
+    assert [event["value"] for event in capped] == [0.2, 0.15, 0.1]
+    assert capped == sorted(capped, key=lambda event: event["time"])
+    assert len(build_timeline(posture_series(values), window=10.0, step=10.0, max_events=3)[0]) == 3
+    assert compact["start"][:3] == [0.0, 10.0, 20.0]
+
+
+def test_every_rule_metric_gives_an_event():
+    low = {"posture": 0.1, "gesture": 0.1, "eye_contact": 0.1, "speech_rate": 50.0, "volume": 0.001,
+           "pitch_std": 5.0}
+    windows = {"start": np.array([0.0]), "end": np.array([10.0]),
+               **{metric: np.array([value]) for metric, value in low.items()}}
+
+    labels = {event["event"] for event in detect_events(windows)}
+
+    assert labels == {label for metric, comparison, _, label in TIMELINE_RULES if comparison == "<"}
@@ -38,22 +38,18 @@ def test_audio_extraction():
 
         # Tester seulement l'extraction audio (pas toute la pipeline)
         print("🎵 Test extraction audio seule...")
-        audio_path = extractor.extract_audio_from_video(str(video_path))
-
-        if audio_path and os.path.exists(audio_path):
-            # Vérifier la taille du fichier audio
-            audio_size = os.path.getsize(audio_path)
-            print(f"✅ Audio extrait avec succès : {audio_path}")
-            print(f"📊 Taille du fichier : {audio_size} bytes")
-
-            # Nettoyer le fichier de test
-            os.remove(audio_path)
-            print("🧹 Fichier de test nettoyé")
-
-            print("\n🎉 EXTRACTION AUDIO RÉUSSIE !")
-            print("🚀 Le système complet devrait maintenant fonctionner")
-        else:
-            print("❌ Échec de l'extraction audio")
+        # Fichier temporaire unique, supprimé à la sortie du bloc
+        with extractor.temporary_audio(str(video_path)) as audio_path:
+            if audio_path and os.path.exists(audio_path):
+                # Vérifier la taille du fichier audio
+                audio_size = os.path.getsize(audio_path)
+                print(f"✅ Audio extrait avec succès : {audio_path}")
+                print(f"📊 Taille du fichier : {audio_size} bytes")
+
+                print("\n🎉 EXTRACTION AUDIO RÉUSSIE !")
+                print("🚀 Le système complet devrait maintenant fonctionner")
+            else:
+                print("❌ Échec de l'extraction audio")
 
     except Exception as e:
         print(f"❌ Erreur lors du test : {e}")